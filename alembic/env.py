@@ -16,7 +16,8 @@ if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
 # Override the sqlalchemy.url from the .ini with your app's database URL
-config.set_main_option('sqlalchemy.url', settings.database_url)
+# (or the one app.migrate was called with)
+config.set_main_option('sqlalchemy.url', config.attributes.get('database_url', settings.database_url))
 
 # add your model's MetaData object here
 # for 'autogenerate' support
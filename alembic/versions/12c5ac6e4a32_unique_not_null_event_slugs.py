@@ -0,0 +1,54 @@
+"""unique not null event slugs
+
+Revision ID: 12c5ac6e4a32
+Revises: a005f718614a
+Create Date: 2026-10-18 13:41:09.502316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from slugify import slugify
+
+
+# revision identifiers, used by Alembic.
+revision: str = '12c5ac6e4a32'
+down_revision: Union[str, None] = 'a005f718614a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    events = sa.table('events', sa.column('id', sa.Integer), sa.column('title', sa.String), sa.column('slug', sa.String))
+
+    # give every event a slug and suffix repeats in id order, the same
+    # "slug", "slug-2", "slug-3" scheme app.crud.allocate_slugs uses
+    rows = conn.execute(sa.select(events.c.id, events.c.title, events.c.slug).order_by(events.c.id)).all()
+    existing = {slug for _, _, slug in rows if slug}
+    seen = set()
+    for event_id, title, slug in rows:
+        new_slug = slug or slugify(title or "", max_length=240) or "event"
+        if new_slug in seen:
+            base, n = new_slug, 2
+            while f"{base}-{n}" in seen or f"{base}-{n}" in existing:
+                n += 1
+            new_slug = f"{base}-{n}"
+        seen.add(new_slug)
+        if new_slug != slug:
+            conn.execute(events.update().where(events.c.id == event_id).values(slug=new_slug))
+
+    if 'ix_events_slug' in {index['name'] for index in sa.inspect(conn).get_indexes('events')}:
+        op.drop_index('ix_events_slug', table_name='events')
+    # batch mode: SQLite can only change nullability by rebuilding the table
+    with op.batch_alter_table('events') as batch_op:
+        batch_op.alter_column('slug', existing_type=sa.String(length=255), nullable=False)
+    op.create_index(op.f('ix_events_slug'), 'events', ['slug'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_events_slug'), table_name='events')
+    with op.batch_alter_table('events') as batch_op:
+        batch_op.alter_column('slug', existing_type=sa.String(length=255), nullable=True)
+    op.create_index(op.f('ix_events_slug'), 'events', ['slug'], unique=False)
@@ -0,0 +1,26 @@
+"""add events (start_date_time, id) index for keyset pagination
+
+Revision ID: 28f8225324cf
+Revises: 2391c1761276
+Create Date: 2026-10-18 10:05:12.418233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '28f8225324cf'
+down_revision: Union[str, None] = '2391c1761276'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_events_start_date_time_id', 'events', ['start_date_time', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_events_start_date_time_id', table_name='events')
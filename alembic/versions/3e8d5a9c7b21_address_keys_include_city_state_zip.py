@@ -0,0 +1,50 @@
+"""address keys include city, state and zip
+
+Revision ID: 3e8d5a9c7b21
+Revises: 7f2b8e61c0d4
+Create Date: 2026-10-18 22:31:06.184529
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8d5a9c7b21'
+down_revision: Union[str, None] = '7f2b8e61c0d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _address_key(address_1, city, state, zip):
+    # keep in step with app.models.normalize_address
+    key = "|".join(" ".join((part or "").split()).lower() for part in (address_1, city, state, zip))
+    return key if len(key) <= 255 else hashlib.sha256(key.encode()).hexdigest()
+
+
+def upgrade() -> None:
+    # keys used to be the street alone, so the same street in another city
+    # resolved to the existing venue; the longer keys are still unique
+    conn = op.get_bind()
+    locations = sa.table(
+        'locations',
+        sa.column('id', sa.Integer), sa.column('address_1', sa.String), sa.column('city', sa.String),
+        sa.column('state', sa.String), sa.column('zip', sa.String), sa.column('address_key', sa.String),
+    )
+    rows = conn.execute(
+        sa.select(locations.c.id, locations.c.address_1, locations.c.city, locations.c.state, locations.c.zip)
+    ).all()
+    for location_id, address_1, city, state, zip in rows:
+        conn.execute(
+            locations.update().where(locations.c.id == location_id)
+            .values(address_key=_address_key(address_1, city, state, zip))
+        )
+
+
+def downgrade() -> None:
+    # street-only keys could collide now that one street can hold several
+    # venues; the longer keys are left alone and stay unique
+    pass
@@ -0,0 +1,45 @@
+"""full-text search on events title/description
+
+Revision ID: 44c5c41b318c
+Revises: 28f8225324cf
+Create Date: 2026-10-18 11:02:47.905116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models import EVENTS_FTS_SQLITE
+
+
+# revision identifiers, used by Alembic.
+revision: str = '44c5c41b318c'
+down_revision: Union[str, None] = '28f8225324cf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # the b-tree on a 500-char column never served substring search and slowed every insert
+    op.drop_index('ix_events_description', table_name='events')
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.create_index('ft_events_title_description', 'events', ['title', 'description'], mysql_prefix='FULLTEXT')
+    elif dialect == 'sqlite':
+        for statement in EVENTS_FTS_SQLITE:
+            op.execute(statement)
+        op.execute("INSERT INTO events_fts(events_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.drop_index('ft_events_title_description', table_name='events')
+    elif dialect == 'sqlite':
+        for trigger in ('events_fts_ai', 'events_fts_ad', 'events_fts_au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS events_fts")
+
+    op.create_index('ix_events_description', 'events', ['description'], unique=False)
@@ -0,0 +1,48 @@
+"""q&a counters on events
+
+Revision ID: 5b9e07c3d1a4
+Revises: e3aee5df2216
+Create Date: 2026-10-18 16:02:37.418205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b9e07c3d1a4'
+down_revision: Union[str, None] = 'e3aee5df2216'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('events', sa.Column('question_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('events', sa.Column('answer_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('events', sa.Column('last_activity_at', sa.DateTime(timezone=True), nullable=True))
+
+    # backfill from the Q&A tables; last activity is the newest question or
+    # answer, whichever is later (a question can come after the last answer)
+    newest_answer = (
+        "(SELECT MAX(answers.created_at) FROM answers JOIN questions ON questions.id = answers.question_id "
+        "WHERE questions.event_id = events.id)"
+    )
+    op.execute(
+        "UPDATE events SET "
+        "question_count = (SELECT COUNT(*) FROM questions WHERE questions.event_id = events.id), "
+        "answer_count = (SELECT COUNT(*) FROM answers JOIN questions ON questions.id = answers.question_id "
+        "WHERE questions.event_id = events.id), "
+        "last_activity_at = (SELECT MAX(questions.created_at) FROM questions WHERE questions.event_id = events.id)"
+    )
+    op.execute(
+        f"UPDATE events SET last_activity_at = {newest_answer} "
+        f"WHERE {newest_answer} > last_activity_at"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('events', 'last_activity_at')
+    op.drop_column('events', 'answer_count')
+    op.drop_column('events', 'question_count')
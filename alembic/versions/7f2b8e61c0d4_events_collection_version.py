@@ -0,0 +1,31 @@
+"""events collection version
+
+Revision ID: 7f2b8e61c0d4
+Revises: 9c41d2e07a58
+Create Date: 2026-10-18 20:12:44.503917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f2b8e61c0d4'
+down_revision: Union[str, None] = '9c41d2e07a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('collection_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.execute("INSERT INTO collection_versions (name, version) VALUES ('events', 0)")
+
+
+def downgrade() -> None:
+    op.drop_table('collection_versions')
@@ -0,0 +1,34 @@
+"""archived events index
+
+Revision ID: 9c41d2e07a58
+Revises: 5b9e07c3d1a4
+Create Date: 2026-10-18 18:41:09.275316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c41d2e07a58'
+down_revision: Union[str, None] = '5b9e07c3d1a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('archived_events',
+    sa.Column('event_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('slug', sa.String(length=255), nullable=False),
+    sa.Column('segment', sa.String(length=255), nullable=False),
+    sa.Column('segment_offset', sa.BigInteger(), nullable=False),
+    sa.Column('segment_length', sa.Integer(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('event_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('archived_events')
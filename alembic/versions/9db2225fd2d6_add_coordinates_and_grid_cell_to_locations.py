@@ -0,0 +1,32 @@
+"""add coordinates and grid_cell to locations
+
+Revision ID: 9db2225fd2d6
+Revises: 44c5c41b318c
+Create Date: 2026-10-18 11:41:09.512804
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9db2225fd2d6'
+down_revision: Union[str, None] = '44c5c41b318c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('locations', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('locations', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('locations', sa.Column('grid_cell', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_locations_grid_cell'), 'locations', ['grid_cell'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_locations_grid_cell'), table_name='locations')
+    op.drop_column('locations', 'grid_cell')
+    op.drop_column('locations', 'longitude')
+    op.drop_column('locations', 'latitude')
@@ -0,0 +1,72 @@
+"""unique place_id and address_key on locations
+
+Revision ID: a005f718614a
+Revises: aa1216fdffc6
+Create Date: 2026-10-18 13:02:47.318205
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a005f718614a'
+down_revision: Union[str, None] = 'aa1216fdffc6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _normalize_address(address_1, city, state, zip):
+    # keep in step with app.models.normalize_address
+    key = "|".join(" ".join((part or "").split()).lower() for part in (address_1, city, state, zip))
+    return key if len(key) <= 255 else hashlib.sha256(key.encode()).hexdigest()
+
+
+def upgrade() -> None:
+    op.add_column('locations', sa.Column('address_key', sa.String(length=255), nullable=True))
+
+    conn = op.get_bind()
+    locations = sa.table(
+        'locations',
+        sa.column('id', sa.Integer), sa.column('place_id', sa.String), sa.column('address_1', sa.String),
+        sa.column('city', sa.String), sa.column('state', sa.String), sa.column('zip', sa.String),
+        sa.column('address_key', sa.String),
+    )
+    events = sa.table('events', sa.column('location_id', sa.Integer))
+
+    # concurrent posts created duplicate venues; fold each one into the oldest
+    # row sharing its place_id or normalized address and repoint its events
+    by_place, by_address = {}, {}
+    for location_id, place_id, address_1, city, state, zip in conn.execute(
+        sa.select(
+            locations.c.id, locations.c.place_id, locations.c.address_1, locations.c.city, locations.c.state, locations.c.zip
+        ).order_by(locations.c.id)
+    ):
+        address_key = _normalize_address(address_1, city, state, zip)
+        keeper = by_place.get(place_id) if place_id else None
+        if keeper is None:
+            keeper = by_address.get(address_key)
+        if keeper is not None:
+            conn.execute(events.update().where(events.c.location_id == location_id).values(location_id=keeper))
+            conn.execute(locations.delete().where(locations.c.id == location_id))
+            continue
+        if place_id:
+            by_place[place_id] = location_id
+        by_address[address_key] = location_id
+        conn.execute(locations.update().where(locations.c.id == location_id).values(address_key=address_key))
+
+    conn.execute(locations.update().where(locations.c.place_id == '').values(place_id=None))
+    # SQLite can't ALTER a column's nullability in place; batch mode rebuilds the table there
+    with op.batch_alter_table('locations') as batch_op:
+        batch_op.alter_column('address_key', existing_type=sa.String(length=255), nullable=False)
+    op.create_index(op.f('ix_locations_place_id'), 'locations', ['place_id'], unique=True)
+    op.create_index(op.f('ix_locations_address_key'), 'locations', ['address_key'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_locations_address_key'), table_name='locations')
+    op.drop_index(op.f('ix_locations_place_id'), table_name='locations')
+    op.drop_column('locations', 'address_key')
@@ -0,0 +1,26 @@
+"""add version to events
+
+Revision ID: aa1216fdffc6
+Revises: 9db2225fd2d6
+Create Date: 2026-10-18 12:20:31.774610
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'aa1216fdffc6'
+down_revision: Union[str, None] = '9db2225fd2d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('events', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('events', 'version')
@@ -0,0 +1,28 @@
+"""composite q&a indexes for paging
+
+Revision ID: e3aee5df2216
+Revises: 12c5ac6e4a32
+Create Date: 2026-10-18 14:10:52.846113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3aee5df2216'
+down_revision: Union[str, None] = '12c5ac6e4a32'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_questions_event_id_created_at_id', 'questions', ['event_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_answers_question_id_created_at_id', 'answers', ['question_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_answers_question_id_created_at_id', table_name='answers')
+    op.drop_index('ix_questions_event_id_created_at_id', table_name='questions')
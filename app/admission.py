@@ -0,0 +1,148 @@
+"""Admission control for write endpoints.
+
+Writes are split into route classes ("qa_write", "event_write"). Each class
+has a concurrency limit below the DB pool size, so a burst of writes queues
+here instead of taking every pooled connection and stalling reads. A request
+that cannot get a slot within the wait deadline, or finds the wait queue
+full, is shed at once with 503. Token buckets keyed by client and, for Q&A,
+by event turn sustained floods away with 429 before they queue at all. Both
+rejections carry Retry-After.
+
+Reads are never admission-controlled.
+"""
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+from fastapi import Request
+
+from app.config import settings
+
+
+class Rejected(Exception):
+    def __init__(self, status_code: int, message: str, retry_after: float):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class TokenBuckets:
+    """One token bucket per key; the least recently used keys are forgotten past `max_keys`."""
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 10000, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets = OrderedDict()
+        self.limited = 0
+
+    def take(self, key) -> float:
+        """Spend a token for `key`: 0 if allowed, else seconds until one is available."""
+        now = self.clock()
+        tokens, updated = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0.0
+        else:
+            wait = (1 - tokens) / self.rate
+            self.limited += 1
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        self._buckets.clear()
+        self.limited = 0
+
+
+class ConcurrencyLimiter:
+    def __init__(self, limit: int, max_wait: float, max_queue: int):
+        self.limit = limit
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(limit)
+        self.active = 0
+        self.waiting = 0
+        self.shed = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            self.shed += 1
+            raise Rejected(503, "Server busy, try again shortly", self.max_wait)
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.max_wait)
+        except asyncio.TimeoutError:
+            self.shed += 1
+            raise Rejected(503, "Server busy, try again shortly", self.max_wait)
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {"limit": self.limit, "active": self.active, "waiting": self.waiting, "shed": self.shed}
+
+
+def client_key(request: Request) -> str:
+    # the Heroku router appends the address it saw, so only the last
+    # X-Forwarded-For hop is trusted; anything before it is client-supplied
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded:
+        return forwarded.split(",")[-1].strip()
+    return request.client.host if request.client else "unknown"
+
+
+limiters = {
+    "qa_write": ConcurrencyLimiter(settings.qa_write_concurrency, settings.admission_max_wait_seconds, settings.admission_max_queue),
+    "event_write": ConcurrencyLimiter(settings.event_write_concurrency, settings.admission_max_wait_seconds, settings.admission_max_queue),
+}
+client_buckets = {
+    "qa_write": TokenBuckets(settings.qa_client_rate, settings.qa_client_burst),
+    "event_write": TokenBuckets(settings.event_write_client_rate, settings.event_write_client_burst),
+}
+event_buckets = TokenBuckets(settings.qa_event_rate, settings.qa_event_burst)
+
+
+def _check_rate(buckets: TokenBuckets, key, message: str):
+    wait = buckets.take(key)
+    if wait:
+        raise Rejected(429, message, wait)
+
+
+async def admit_qa_write(request: Request):
+    _check_rate(client_buckets["qa_write"], client_key(request), "Too many questions and answers, slow down")
+    _check_rate(event_buckets, request.path_params.get("event_id"), "This event is receiving too many posts, try again shortly")
+    async with limiters["qa_write"].slot():
+        yield
+
+
+async def admit_event_write(request: Request):
+    _check_rate(client_buckets["event_write"], client_key(request), "Too many requests, slow down")
+    async with limiters["event_write"].slot():
+        yield
+
+
+def clear_rate_limits():
+    for buckets in (*client_buckets.values(), event_buckets):
+        buckets.clear()
+
+
+def admission_stats() -> dict:
+    return {
+        route_class: {**limiter.stats(), "rate_limited": client_buckets[route_class].limited}
+        for route_class, limiter in limiters.items()
+    } | {"qa_event_rate_limited": event_buckets.limited}
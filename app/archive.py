@@ -0,0 +1,83 @@
+"""Cold storage for expired events: gzip-compressed, append-only JSONL segments.
+
+crud.delete_old_events(db, archive=SegmentWriter()) hands each batch of
+expired events to crud._archive_events, which writes them (with their
+location, questions and answers) as one gzip member appended to the current
+segment file and fsyncs it. Only then are the events recorded in the
+`archived_events` index and deleted from the hot tables, in one transaction. A crash in between leaves an unreferenced member behind, never
+a lost event; the next run archives those events again.
+
+Every archiving run opens its own segment (named by time and a random
+suffix), so several processes never append to the same file. Segments roll
+over at `archive_segment_max_bytes`. An archived event is read back by
+decompressing just its batch's member (offset and length from the index)
+and picking its line.
+"""
+import gzip
+import os
+import uuid
+from datetime import datetime, timezone
+
+import orjson
+
+from app.config import settings
+
+
+def _row(obj) -> dict:
+    return {column.key: getattr(obj, column.key) for column in obj.__mapper__.column_attrs}
+
+
+def event_record(event) -> dict:
+    """Everything stored about an event, as one JSON-ready dict (the loaded ORM graph)."""
+    record = _row(event)
+    record["location"] = _row(event.location) if event.location is not None else None
+    record["questions"] = [
+        {**_row(question), "answers": [_row(answer) for answer in question.answers]}
+        for question in event.questions
+    ]
+    return record
+
+
+class SegmentWriter:
+    def __init__(self, directory: str = None, max_bytes: int = None):
+        self.directory = directory or settings.archive_dir
+        self.max_bytes = max_bytes or settings.archive_segment_max_bytes
+        self._segment = None
+        self._size = 0
+
+    def _next_segment(self) -> str:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        return f"events-{stamp}-{uuid.uuid4().hex[:8]}.jsonl.gz"
+
+    def append(self, records) -> tuple:
+        """Append `records` as one gzip member; returns (segment, offset, length) once it is on disk."""
+        os.makedirs(self.directory, exist_ok=True)
+        if self._segment is None or self._size >= self.max_bytes:
+            self._segment, self._size = self._next_segment(), 0
+
+        lines = b"".join(orjson.dumps(record, option=orjson.OPT_NAIVE_UTC) + b"\n" for record in records)
+        member = gzip.compress(lines)
+        with open(os.path.join(self.directory, self._segment), "ab") as f:
+            offset = f.tell()
+            f.write(member)
+            f.flush()
+            os.fsync(f.fileno())
+        self._size = offset + len(member)
+        return self._segment, offset, len(member)
+
+
+def read_record(segment: str, offset: int, length: int, event_id: int, directory: str = None):
+    """The archived record of `event_id` from the member at `offset`, or None."""
+    # index rows only ever hold names this module generated; never follow a path
+    path = os.path.join(directory or settings.archive_dir, os.path.basename(segment))
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            member = f.read(length)
+    except FileNotFoundError:
+        return None
+    for line in gzip.decompress(member).splitlines():
+        record = orjson.loads(line)
+        if record["id"] == event_id:
+            return record
+    return None
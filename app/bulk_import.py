@@ -0,0 +1,161 @@
+"""Streaming bulk import of events from NDJSON or a JSON array.
+
+The request body is consumed chunk by chunk: complete rows are split off as
+they arrive, validated, and written `batch_size` rows at a time, so memory
+stays proportional to one batch no matter how large the upload is.
+
+Batches are committed as they fill, so a framing error found later (a
+truncated array, trailing garbage) comes after rows are already written.
+It raises ImportAborted, which carries the per-row results up to that point
+(every complete row before the error is imported), so the client can tell
+exactly what was written and resume from there.
+"""
+import logging
+from typing import AsyncIterator, Iterator, List
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.crud as crud, app.schemas as schemas
+
+logger = logging.getLogger("app.main")
+
+WHITESPACE = b" \t\r\n"
+QUOTE, BACKSLASH, COMMA = ord('"'), ord("\\"), ord(",")
+LBRACE, RBRACE, LBRACKET, RBRACKET = ord("{"), ord("}"), ord("["), ord("]")
+
+
+class ImportAborted(ValueError):
+    """The body's framing broke off; `results` covers every row before that point."""
+
+    def __init__(self, message: str, results: List[schemas.ImportRowResult]):
+        super().__init__(message)
+        self.results = results
+
+
+class NDJSONSplitter:
+    def __init__(self):
+        self._buffer = b""
+
+    def feed(self, chunk: bytes) -> Iterator[bytes]:
+        *lines, self._buffer = (self._buffer + chunk).split(b"\n")
+        yield from (line for line in lines if line.strip())
+
+    def close(self) -> Iterator[bytes]:
+        if self._buffer.strip():
+            yield self._buffer
+        self._buffer = b""
+
+
+class JSONArraySplitter:
+    """Yields the raw bytes of each top-level element of a JSON array as it completes."""
+
+    def __init__(self):
+        self._item = bytearray()
+        self._started = False
+        self._finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: bytes) -> Iterator[bytes]:
+        start = 0  # where the unconsumed part of the current element begins in this chunk
+        for i, byte in enumerate(chunk):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif byte == BACKSLASH:
+                    self._escaped = True
+                elif byte == QUOTE:
+                    self._in_string = False
+            elif not self._started or self._finished:
+                if byte == LBRACKET and not self._started:
+                    self._started = True
+                    start = i + 1
+                elif byte not in WHITESPACE:
+                    raise ValueError("Expected a single JSON array")
+            elif byte == QUOTE:
+                self._in_string = True
+            elif self._depth == 0 and byte in (COMMA, RBRACKET):
+                self._item += chunk[start:i]
+                item = bytes(self._item).strip()
+                self._item.clear()
+                if item:
+                    yield item
+                start = i + 1
+                self._finished = byte == RBRACKET
+            elif byte in (LBRACE, LBRACKET):
+                self._depth += 1
+            elif byte in (RBRACE, RBRACKET):
+                self._depth -= 1
+        if self._started and not self._finished:
+            self._item += chunk[start:]
+
+    def close(self) -> Iterator[bytes]:
+        if not self._finished:
+            raise ValueError("Unterminated JSON array")
+        return iter(())
+
+
+async def import_events(db: AsyncSession, chunks: AsyncIterator[bytes], batch_size: int) -> List[schemas.ImportRowResult]:
+    results: List[schemas.ImportRowResult] = []
+    batch: List[tuple] = []
+    splitter = None
+    index = 0
+
+    async def flush():
+        if not batch:
+            return
+        try:
+            created = await crud.bulk_create_events(db, [event for _, event in batch])
+        except SQLAlchemyError as e:
+            await db.rollback()
+            logger.exception("[Import] Batch failed")
+            results.extend(
+                schemas.ImportRowResult(index=row, status="error", message=f"Batch insert failed: {e.__class__.__name__}")
+                for row, _ in batch
+            )
+        else:
+            results.extend(
+                schemas.ImportRowResult(index=row, status="created", event_id=event_id, slug=slug)
+                for (row, _), (event_id, slug) in zip(batch, created)
+            )
+        batch.clear()
+
+    async def handle(raw: bytes):
+        nonlocal index
+        row, index = index, index + 1
+        try:
+            batch.append((row, schemas.EventImport.model_validate(orjson.loads(raw))))
+        except orjson.JSONDecodeError:
+            results.append(schemas.ImportRowResult(index=row, status="error", message="Invalid JSON"))
+        except ValidationError as e:
+            errors = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+            results.append(schemas.ImportRowResult(index=row, status="error", message=errors))
+        if len(batch) >= batch_size:
+            await flush()
+
+    try:
+        async for chunk in chunks:
+            if splitter is None:
+                head = chunk.lstrip(WHITESPACE)
+                if not head:
+                    continue
+                # a leading "[" means a JSON array, anything else is NDJSON
+                splitter = JSONArraySplitter() if head[:1] == b"[" else NDJSONSplitter()
+            for raw in splitter.feed(chunk):
+                await handle(raw)
+
+        if splitter is not None:
+            for raw in splitter.close():
+                await handle(raw)
+    except ValueError as e:
+        await flush()
+        results.sort(key=lambda result: result.index)
+        raise ImportAborted(str(e), results) from e
+    await flush()
+
+    results.sort(key=lambda result: result.index)
+    return results
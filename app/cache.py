@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """A bounded LRU map whose entries also expire after `ttl` seconds.
+
+    Sync routes run in the threadpool, so every operation takes a lock.
+
+    A value built from a read that raced with an invalidation of its key must
+    not be stored: take generation() before reading and pass it to set(),
+    which then drops the value if the key was invalidated in between.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale_sets = 0
+        self._sequence = 0  # bumped by every invalidation
+        self._invalidated_at = OrderedDict()  # key -> sequence of its last invalidation, oldest first
+        self._forgotten_until = 0  # keys dropped from _invalidated_at were invalidated at or before this
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._sequence
+
+    def set(self, key, value, generation: int = None):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation is not None and self._invalidated_at.get(key, self._forgotten_until) > generation:
+                self.stale_sets += 1
+                return
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._sequence += 1
+                self._invalidated_at.pop(key, None)
+                self._invalidated_at[key] = self._sequence
+                if self._data.pop(key, None) is not None:
+                    self.invalidations += 1
+            # remember as many keys as the cache holds; older ones count as just invalidated
+            while len(self._invalidated_at) > max(self.maxsize, 1):
+                _, self._forgotten_until = self._invalidated_at.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sequence += 1
+            self._invalidated_at.clear()
+            self._forgotten_until = self._sequence
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "stale_sets": self.stale_sets,
+            }
@@ -1,9 +1,102 @@
 import os
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
 
 class Settings(BaseSettings):
     database_url: str
+    # defaults to database_url with its async driver (aiomysql / aiosqlite)
+    async_database_url: Optional[str] = None
+
+    # connection pool; sizing applies per engine (sync and async each get one)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_echo: bool = False
+
+    # read replicas for the read-only routes, given like database_url; none: reads use the primary
+    replica_database_urls: List[str] = []
+    # with every replica down, serve reads from the primary instead of failing with 503
+    replica_fallback_to_primary: bool = True
+    # seconds a replica that failed to connect is skipped
+    replica_retry_seconds: float = 30.0
+    # after a write, that client reads from the primary for this long; keep it above replica lag
+    read_your_writes_seconds: float = 10.0
+
+    # in-process cache of built event detail responses
+    event_cache_size: int = 1024
+    event_cache_ttl_seconds: float = 30.0
+
+    # in-process hot set of upcoming events behind ?upcoming=true listings;
+    # reloaded in full every refresh to pick up other processes' writes
+    upcoming_max_events: int = 5000
+    upcoming_refresh_seconds: float = 30.0
+
+    # in-process map of place_id/address to location id (locations are never deleted)
+    location_cache_size: int = 4096
+    location_cache_ttl_seconds: float = 3600.0
+
+    # questions embedded in event detail / default page size of the questions endpoint
+    questions_page_size: int = 20
+
+    # live Q&A streams: messages buffered per subscriber before it is dropped
+    live_queue_size: int = 64
+    live_keepalive_seconds: float = 15.0
+
+    # expired event cleanup
+    cleanup_batch_size: int = 500
+    cleanup_time_budget_seconds: float = 10.0
+    # seconds after startup before the cleanup runs in the background
+    cleanup_start_delay_seconds: float = 5.0
+    # move expired events to gzip JSONL segments in archive_dir (see app.archive)
+    # instead of dropping them. Off by default: every dyno must see the same,
+    # persistent archive_dir, which a dyno's own disk is not
+    archive_expired_events: bool = False
+    archive_dir: str = "archive"
+    archive_segment_max_bytes: int = 64 * 1024 * 1024
+
+    # how often the Q&A counters on events are checked against the Q&A tables
+    counter_reconcile_interval_seconds: float = 3600.0
+
+    # /readyz database ping timeout
+    readiness_timeout_seconds: float = 2.0
+
+    # admission control for writes: concurrent requests per route class, kept
+    # below the pool size so reads always find a connection
+    qa_write_concurrency: int = 4
+    event_write_concurrency: int = 2
+    # a write waits this long for a slot before being shed with 503; at most
+    # admission_max_queue wait at once
+    admission_max_wait_seconds: float = 1.0
+    admission_max_queue: int = 50
+    # token buckets (requests/second, burst); over the limit is a 429
+    qa_client_rate: float = 0.5
+    qa_client_burst: int = 5
+    qa_event_rate: float = 20.0
+    qa_event_burst: int = 50
+    event_write_client_rate: float = 0.2
+    event_write_client_burst: int = 10
+
+    # group commit for Q&A posts: collect posts for up to the window (or max
+    # items) and commit them together; raise qa_write_concurrency with it, since
+    # the batch only needs one connection
+    qa_group_commit: bool = False
+    qa_group_commit_window_seconds: float = 0.005
+    qa_group_commit_max_items: int = 100
+
+    # bulk import: rows validated and inserted per batch
+    import_batch_size: int = 500
+
+    # logging: JSON lines through a background writer, rotated by size
+    log_level: str = "INFO"
+    log_file: str = "logs/app.log"
+    log_max_bytes: int = 10 * 1024 * 1024
+    log_backup_count: int = 5
+    log_queue_size: int = 10000
+    # logger name -> fraction of INFO/DEBUG records kept, e.g. {"sqlalchemy.engine": 0.01}
+    log_sample_rates: Dict[str, float] = {}
 
     model_config = ConfigDict(env_file=".env")
 
@@ -1,102 +1,527 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager, joinedload, selectinload
+from sqlalchemy import Float, Integer, and_, case, delete, func, insert, or_, select, text, update
+from sqlalchemy import event as sa_event
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.exc import IntegrityError
 from slugify import slugify
 from typing import List
 from datetime import datetime, timedelta, timezone
+import asyncio
 import logging
+import re
+import time
 
 import app.models as models, app.schemas as schemas
+from app import archive as archive_records, geo, live, serialization
+from app.fieldsets import FieldSet, event_load_options
+from app.hot_events import UpcomingEvents, now_utc, utc_naive
+from app.cache import TTLCache
+from app.config import settings
+from app.pagination import encode_cursor, decode_datetime_id_cursor, decode_id_cursor
 
 logger = logging.getLogger("app.main")
 
-def get_events(db: Session, skip:int=0, limit: int=100) -> List[schemas.EventResponse]:
-    events = (
-        db.query(models.Event)
-        .options(joinedload(models.Event.location))
+event_cache = TTLCache(maxsize=settings.event_cache_size, ttl=settings.event_cache_ttl_seconds)
+upcoming_events = UpcomingEvents(settings.upcoming_max_events, settings.upcoming_refresh_seconds)
+# (place_id, address_key) -> location id; only filled after the row is committed
+location_cache = TTLCache(maxsize=settings.location_cache_size, ttl=settings.location_cache_ttl_seconds)
+
+SLUG_BASE_LENGTH = 240  # leaves room for a "-N" suffix in the 255-char column
+SLUG_ATTEMPTS = 3
+
+async def get_events(db: AsyncSession, skip:int=0, limit: int=100, fields: FieldSet = None) -> List[schemas.EventResponse]:
+    """With `fields`, only those columns are loaded and the items are trimmed to match."""
+    options = event_load_options(fields) if fields else [joinedload(models.Event.location)]
+    result = await db.execute(
+        select(models.Event)
+        .options(*options)
         .offset(skip)
         .limit(limit)
-        .all()
     )
+    events = result.scalars().all()
+
+    if fields:
+        return serialization.sparse_event_list_from_orm(events, fields)
+    return serialization.event_list_from_orm(events)
 
-    return [schemas.EventResponse(
-            event=schemas.EventData.model_validate(event, from_attributes=True),
-            location=schemas.Location.model_validate(event.location, from_attributes=True) if event.location else None
+async def get_events_page(db: AsyncSession, cursor: str = None, limit: int = 100, fields: FieldSet = None, upcoming: bool = False):
+    """Keyset pagination over (start_date_time, id); returns (events, next_cursor).
+
+    `upcoming` leaves out events that have already started.
+    """
+    # the sort key is loaded even when not requested, to build the next cursor
+    options = event_load_options(fields, models.Event.start_date_time) if fields else [joinedload(models.Event.location)]
+    query = (
+        select(models.Event)
+        .options(*options)
+        .where(models.Event.start_date_time != None)
+    )
+    if upcoming:
+        query = query.where(models.Event.start_date_time >= now_utc())
+    if cursor:
+        start, event_id = decode_datetime_id_cursor(cursor)
+        start = utc_naive(start)  # start_date_time is stored naive UTC
+        query = query.where(
+            or_(
+                models.Event.start_date_time > start,
+                and_(models.Event.start_date_time == start, models.Event.id > event_id)
+            )
         )
-        for event in events
-    ]
 
-def get_event_by_id(db: Session, event_id: int) -> schemas.EventResponse:
-    event = (
-        db.query(models.Event)
-        .options(
-            joinedload(models.Event.location),
-            joinedload(models.Event.questions).joinedload(models.Question.answers))
-        .filter(models.Event.id == event_id)
-        .first()
+    # one extra row tells us whether another page exists without a COUNT
+    result = await db.execute(
+        query
+        .order_by(models.Event.start_date_time, models.Event.id)
+        .limit(limit + 1)
+    )
+    events = result.scalars().all()
+
+    next_cursor = None
+    if len(events) > limit:
+        events = events[:limit]
+        next_cursor = encode_cursor(events[-1].start_date_time, events[-1].id)
+
+    if fields:
+        return serialization.sparse_event_list_from_orm(events, fields), next_cursor
+    return serialization.event_list_from_orm(events), next_cursor
+
+async def _upcoming_entries(db: AsyncSession, now: datetime, limit: int = None, covered_until: tuple = None) -> list:
+    """(key, dumped list item) for events starting at or after `now`, in key order."""
+    query = (
+        select(models.Event)
+        .options(joinedload(models.Event.location))
+        .where(models.Event.start_date_time >= now)
+        .order_by(models.Event.start_date_time, models.Event.id)
+    )
+    if covered_until is not None:
+        start, event_id = covered_until
+        query = query.where(or_(
+            models.Event.start_date_time < start,
+            and_(models.Event.start_date_time == start, models.Event.id <= event_id)
+        ))
+    if limit is not None:
+        query = query.limit(limit)
+    events = (await db.execute(query)).scalars().all()
+    items = serialization.event_list_adapter.dump_python(serialization.event_list_from_orm(events), by_alias=True)
+    return [((utc_naive(event.start_date_time), event.id), item) for event, item in zip(events, items)]
+
+async def load_upcoming_events(db: AsyncSession) -> bool:
+    """(Re)fill the upcoming events hot set; False if a concurrent change made the load stale."""
+    generation = upcoming_events.generation
+    entries = await _upcoming_entries(db, now_utc(), limit=upcoming_events.max_events + 1)
+    complete = len(entries) <= upcoming_events.max_events
+    return upcoming_events.install(entries[:upcoming_events.max_events], complete, generation)
+
+async def get_upcoming_events_page(db: AsyncSession, cursor: str = None, limit: int = 100, fields: FieldSet = None):
+    """A page of events that haven't started yet, already dumped: ({"data", "next_cursor"}, hot set version).
+
+    The version is None when the page came from the database.
+
+    Served from the upcoming events hot set when it covers the page,
+    otherwise by get_events_page(upcoming=True); both use the same cursors.
+    """
+    after = None
+    if cursor:
+        # the hot set's keys are naive UTC; a cursor may carry an offset
+        start, event_id = decode_datetime_id_cursor(cursor)
+        after = (utc_naive(start), event_id)
+    if upcoming_events.claim_reload():
+        try:
+            await load_upcoming_events(db)
+        finally:
+            upcoming_events.reload_done()
+
+    page = upcoming_events.page(after, limit)
+    if page is not None:
+        items, has_more, version = page
+        next_cursor = encode_cursor(items[-1]["event"]["start_date_time"], items[-1]["event"]["id"]) if has_more else None
+        if fields:
+            items = [serialization.trim_list_item(item, fields) for item in items]
+        return {"data": items, "next_cursor": next_cursor}, version
+
+    events, next_cursor = await get_events_page(db, cursor=cursor, limit=limit, fields=fields, upcoming=True)
+    adapter = serialization.sparse_event_list_adapter(fields) if fields else serialization.event_list_adapter
+    return {"data": adapter.dump_python(events, by_alias=True), "next_cursor": next_cursor}, None
+
+async def verify_upcoming_events(db: AsyncSession) -> List[str]:
+    """Differences between the upcoming events hot set and the database; empty when consistent."""
+    now = now_utc()
+    loaded, covered_until, items = upcoming_events.snapshot(now)
+    if not loaded:
+        return []
+    expected = await _upcoming_entries(db, now, covered_until=covered_until)
+
+    held_ids = [item["event"]["id"] for item in items]
+    expected_ids = [event_id for (_, event_id), _ in expected]
+    held = dict(zip(held_ids, items))
+    problems = []
+    for (_, event_id), item in expected:
+        if event_id not in held:
+            problems.append(f"event {event_id} missing")
+        elif held[event_id] != item:
+            problems.append(f"event {event_id} differs")
+    problems.extend(f"event {event_id} should not be there" for event_id in set(held_ids) - set(expected_ids))
+    if not problems and held_ids != expected_ids:
+        problems.append("order differs")
+    return problems
+
+async def search_events(db: AsyncSession, q: str, skip: int = 0, limit: int = 20) -> List[schemas.EventResponse]:
+    """Full-text search over title and description, best matches first."""
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        return []
+
+    dialect = db.get_bind().dialect.name
+    query = select(models.Event).options(joinedload(models.Event.location))
+
+    if dialect == "sqlite":
+        ranked = (
+            text(
+                "SELECT rowid AS id, bm25(events_fts) AS rank FROM events_fts "
+                "WHERE events_fts MATCH :match ORDER BY rank LIMIT :limit OFFSET :skip"
+            )
+            .bindparams(match=_fts5_query(terms), limit=limit, skip=skip)
+            .columns(id=Integer, rank=Float)
+            .subquery()
+        )
+        query = query.join(ranked, models.Event.id == ranked.c.id).order_by(ranked.c.rank, models.Event.id)
+    elif dialect == "mysql":
+        relevance = mysql.match(models.Event.title, models.Event.description, against=" ".join(terms)).in_natural_language_mode()
+        query = query.where(relevance).order_by(relevance.desc(), models.Event.id).offset(skip).limit(limit)
+    else:
+        pattern = f"%{q.strip()}%"
+        query = (
+            query
+            .where(or_(models.Event.title.ilike(pattern), models.Event.description.ilike(pattern)))
+            .order_by(models.Event.start_date_time, models.Event.id)
+            .offset(skip)
+            .limit(limit)
+        )
+
+    result = await db.execute(query)
+    return serialization.event_list_from_orm(result.scalars().all())
+
+async def get_events_nearby(db: AsyncSession, lat: float, lng: float, radius_km: float, limit: int = 50) -> List[schemas.NearbyEventResponse]:
+    """Events whose location is within radius_km of (lat, lng), nearest first.
+
+    The indexed grid_cell ranges narrow the scan to candidates in nearby cells;
+    the exact great-circle distance is only computed for those.
+    """
+    cells = geo.cell_ranges(lat, lng, radius_km)
+    dlat = radius_km / geo.KM_PER_DEGREE
+    result = await db.execute(
+        select(models.Event)
+        .join(models.Event.location)
+        .options(contains_eager(models.Event.location))
+        .where(or_(*(models.Location.grid_cell.between(first, last) for first, last in cells)))
+        .where(models.Location.latitude.between(lat - dlat, lat + dlat))
+    )
+
+    matches = []
+    for event in result.scalars().all():
+        distance = geo.haversine_km(lat, lng, event.location.latitude, event.location.longitude)
+        if distance <= radius_km:
+            matches.append((distance, event.start_date_time or datetime.max, event.id, event))
+    matches.sort(key=lambda match: match[:3])
+
+    return serialization.nearby_event_list_from_orm(
+        [(distance, event) for distance, _, _, event in matches[:limit]]
+    )
+
+def _fts5_query(terms: List[str]) -> str:
+    # quote every term so user input can't use FTS5 operators; the last one
+    # is a prefix match so partially typed words still find results
+    quoted = ['"' + term.replace('"', '""') + '"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+async def get_event_by_id(db: AsyncSession, event_id: int) -> schemas.EventDetailResponse:
+    """The event with its newest page of questions (see get_event_questions_page for the rest)."""
+    # a client that just wrote must not get an entry a lagging replica refilled
+    cached = None if db.info.get("read_your_writes") else event_cache.get(event_id)
+    if cached is not None:
+        return cached
+    # a Q&A write committing while we read must not leave this copy behind for the TTL
+    generation = event_cache.generation()
+
+    result = await db.execute(
+        select(models.Event)
+        .options(joinedload(models.Event.location))
+        .where(models.Event.id == event_id)
     )
+    event = result.scalars().first()
     if not event:
         return None
-    
-    event_data = schemas.EventData.model_validate(event, from_attributes=True)
-    location_data = schemas.Location.model_validate(event.location, from_attributes=True) if event.location else None
-    
-    questions_data = None
+
+    questions, next_cursor = None, None
     if event.allow_qa:
-        questions_data = [
-            schemas.QuestionResponse(
-                id=q.id,
-                question_text=q.question_text,
-                created_at=q.created_at,
-                answers=[
-                    schemas.AnswerResponse(
-                        id=a.id,
-                        answer_text=a.answer_text,
-                        created_at=a.created_at
-                    ) for a in sorted(q.answers, key=lambda x: x.created_at, reverse=True)
-                ] if q.answers else None
-            ) for q in sorted(event.questions, key=lambda x: x.created_at, reverse=True)
-        ]
-
-    response = schemas.EventResponse(
-        event=event_data,
-        location=location_data,
-        questions=questions_data
+        questions, next_cursor = await _questions_page(db, event_id, None, settings.questions_page_size)
+
+    response = serialization.event_from_orm(event, questions=questions, questions_next_cursor=next_cursor)
+
+    event_cache.set(event_id, response, generation)
+    return response
+
+async def get_event_questions_page(db: AsyncSession, event_id: int, cursor: str = None, limit: int = 20):
+    """A QuestionPage of an event's questions, newest first; None if the event doesn't exist.
+
+    Empty for events with Q&A turned off, which get_event_by_id shows without questions.
+    """
+    cached = event_cache.get(event_id)
+    if cached is not None:
+        allow_qa = cached.event.allow_qa
+    else:
+        row = (await db.execute(select(models.Event.allow_qa).where(models.Event.id == event_id))).first()
+        if row is None:
+            return None
+        allow_qa = row.allow_qa
+    if not allow_qa:
+        return schemas.QuestionPage(data=[])
+    questions, next_cursor = await _questions_page(db, event_id, cursor, limit)
+    return serialization.question_page_from_orm(questions, next_cursor)
+
+async def _questions_page(db: AsyncSession, event_id: int, cursor: str, limit: int):
+    # ordered and cut in SQL on (event_id, created_at, id); answers for the
+    # whole page come from one selectin query, already ordered by the relationship
+    query = (
+        select(models.Question)
+        .options(selectinload(models.Question.answers))
+        .where(models.Question.event_id == event_id)
     )
+    if cursor:
+        # the cursor is the last question's id; comparing against its stored
+        # created_at avoids round-tripping timestamps through the cursor
+        question_id = decode_id_cursor(cursor)
+        created_at = select(models.Question.created_at).where(models.Question.id == question_id).scalar_subquery()
+        query = query.where(
+            or_(
+                models.Question.created_at < created_at,
+                and_(models.Question.created_at == created_at, models.Question.id < question_id)
+            )
+        )
+
+    questions = (await db.scalars(
+        query
+        .order_by(models.Question.created_at.desc(), models.Question.id.desc())
+        .limit(limit + 1)
+    )).all()
+
+    next_cursor = None
+    if len(questions) > limit:
+        questions = questions[:limit]
+        next_cursor = encode_cursor(questions[-1].id)
+    return questions, next_cursor
+
+async def get_event_version(db: AsyncSession, event_id: int):
+    """(version, slug) of an event without loading its Q&A; None if it doesn't exist."""
+    # like get_event_by_id: a client that just wrote must not be told its stale copy is current
+    cached = None if db.info.get("read_your_writes") else event_cache.get(event_id)
+    if cached is not None:
+        return cached.event.version, cached.event.slug
+
+    row = (await db.execute(
+        select(models.Event.version, models.Event.slug).where(models.Event.id == event_id)
+    )).first()
+    return tuple(row) if row else None
+
+def _bump_events_collection():
+    """Statement marking the event list changed; run it in the transaction that adds, deletes or repairs events."""
+    return (
+        update(models.CollectionVersion)
+        .where(models.CollectionVersion.name == "events")
+        .values(version=models.CollectionVersion.version + 1)
+    )
+
+async def get_events_collection_version(db: AsyncSession) -> str:
+    # primary-key lookups, not a scan: adds, deletes and counter repairs bump
+    # the collection row, and every Q&A write (which moves the counters in list
+    # items) inserts a new, higher question or answer id
+    collection, newest_question, newest_answer = (await db.execute(
+        select(
+            select(models.CollectionVersion.version)
+            .where(models.CollectionVersion.name == "events")
+            .scalar_subquery(),
+            select(func.max(models.Question.id)).scalar_subquery(),
+            select(func.max(models.Answer.id)).scalar_subquery()
+        )
+    )).one()
+    return f"{collection or 0}-{newest_question or 0}-{newest_answer or 0}"
+
+async def allocate_slugs(db: AsyncSession, titles: List[str]) -> List[str]:
+    """Unique slugs for `titles`, in order: "title", then "title-2", "title-3", ...
+
+    Taken slugs for every distinct base are read with one SELECT of index
+    ranges (base itself plus everything between "base-" and "base."), and
+    each new slug takes the next suffix after the highest one in use.
+    """
+    bases = [slugify(title or "", max_length=SLUG_BASE_LENGTH) or "event" for title in titles]
+    unique_bases = set(bases)
+    rows = await db.scalars(select(models.Event.slug).where(or_(*(
+        or_(models.Event.slug == base, and_(models.Event.slug >= f"{base}-", models.Event.slug < f"{base}."))
+        for base in unique_bases
+    ))))
+
+    highest = {}
+    for slug in rows:
+        if slug in unique_bases:
+            highest[slug] = max(highest.get(slug, 1), 1)
+        prefix, _, suffix = slug.rpartition("-")
+        if prefix in unique_bases and suffix.isdigit():
+            highest[prefix] = max(highest.get(prefix, 1), int(suffix))
+
+    slugs = []
+    for base in bases:
+        n = highest.get(base)
+        slugs.append(base if n is None else f"{base}-{n + 1}")
+        highest[base] = 1 if n is None else n + 1
+    return slugs
+
+async def _retry_on_slug_conflict(db: AsyncSession, create):
+    # a concurrent create can take a slug between allocate_slugs and the
+    # insert; the unique index rejects it and the whole transaction reruns
+    for attempt in range(SLUG_ATTEMPTS):
+        try:
+            return await create()
+        except IntegrityError:
+            await db.rollback()
+            if attempt == SLUG_ATTEMPTS - 1:
+                raise
+
+async def create_event(db: AsyncSession, event:schemas.EventCreate):
+    """Create an event (and its location, if new) in a single transaction."""
+    async def create():
+        location_id = await get_or_create_location(db, event.location) if event.location else event.location_id
+        slug, = await allocate_slugs(db, [event.title])
+
+        event_data = event.model_dump(exclude={"location", "location_id"})
+        db_event = models.Event(**event_data, location_id=location_id, slug=slug)
+        db.add(db_event)
+        await db.flush()
+
+        # no lazy loading on an AsyncSession, so fetch the location explicitly
+        location = await db.get(models.Location, location_id) if location_id else None
+        await db.execute(_bump_events_collection())
+        await db.commit()
+        return db_event, location
 
+    db_event, location = await _retry_on_slug_conflict(db, create)
+    response = serialization.event_response_adapter.validate_python(
+        {"event": db_event, "location": location},
+        from_attributes=True
+    )
+    upcoming_events.add(
+        (response.event.start_date_time, response.event.event_id),
+        serialization.event_response_adapter.dump_python(response, by_alias=True)
+    )
     return response
 
-def create_event(db:Session, event:schemas.EventCreate):
-    location_id = get_or_create_location(db, event.location) if event.location else event.location_id
+async def bulk_create_events(db: AsyncSession, events: List[schemas.EventCreate]) -> List[tuple]:
+    """Insert a batch of events in one transaction; returns (id, slug) per event, in order.
 
-    event_data = event.model_dump(exclude={"location", "location_id"})
- 
-    db_event = models.Event(**event_data, location_id=location_id, slug=None)
+    Locations are deduplicated within the batch and resolved from the
+    location cache, then against the table with one SELECT; only unknown ones
+    are inserted.
+    """
+    async def create():
+        location_ids = await _resolve_locations_bulk(db, [event.location for event in events if event.location])
+        slugs = await allocate_slugs(db, [event.title for event in events])
 
-    db.add(db_event)
-    db.commit()
-    db.refresh(db_event)
+        rows = []
+        for event, slug in zip(events, slugs):
+            row = event.model_dump(exclude={"location", "location_id"})
+            row["slug"] = slug
+            row["location_id"] = location_ids[_location_key(event.location)] if event.location else event.location_id
+            rows.append(row)
 
-    slug = f"{slugify(event.title)}"
+        event_ids = await _insert_events(db, rows)
+        await db.execute(_bump_events_collection())
+        await db.commit()
+        return list(zip(event_ids, slugs))
 
-    db_event.slug = slug
-    db.commit()
+    created = await _retry_on_slug_conflict(db, create)
+    # rare enough that a reload beats building every list item here
+    upcoming_events.invalidate()
+    return created
 
-    return schemas.EventResponse(
-        event_id=db_event.id,
-        event=schemas.EventData.model_validate(db_event),
-        location=schemas.Location.model_validate(db_event.location) if db_event.location else None
+def _location_key(location: schemas.LocationBase):
+    return (location.place_id or None, models.normalize_address(location.address_1, location.city, location.state, location.zip))
+
+async def _lookup_locations(db: AsyncSession, keys) -> tuple:
+    """Existing location ids for the given keys as ({place_id: id}, {address_key: id}), in one SELECT."""
+    place_ids = {place_id for place_id, _ in keys if place_id}
+    address_keys = {address_key for _, address_key in keys}
+    condition = models.Location.address_key.in_(address_keys)
+    if place_ids:
+        condition = or_(models.Location.place_id.in_(place_ids), condition)
+    rows = await db.execute(
+        select(models.Location.id, models.Location.place_id, models.Location.address_key).where(condition)
     )
+    by_place, by_address = {}, {}
+    for location_id, place_id, address_key in rows:
+        if place_id in place_ids:
+            by_place[place_id] = location_id
+        by_address[address_key] = location_id
+    return by_place, by_address
+
+def _pick_location(key, by_place: dict, by_address: dict):
+    # place_id wins over the address, as it always has
+    place_id, address_key = key
+    if place_id and place_id in by_place:
+        return by_place[place_id]
+    return by_address.get(address_key)
+
+def _insert_ignoring_duplicates(db: AsyncSession, model):
+    if db.get_bind().dialect.name == "mysql":
+        # a no-op update of the primary key, so a duplicate key leaves the existing row alone
+        key = model.__table__.primary_key.columns.values()[0]
+        return mysql.insert(model).on_duplicate_key_update({key.name: key})
+    return sqlite.insert(model).on_conflict_do_nothing()
+
+async def _resolve_locations_bulk(db: AsyncSession, locations: List[schemas.LocationBase]) -> dict:
+    unique = {}
+    for location in locations:
+        unique.setdefault(_location_key(location), location)
+
+    resolved = {key: location_cache.get(key) for key in unique}
+    missing = [key for key, location_id in resolved.items() if location_id is None]
+    if not missing:
+        return resolved
+
+    by_place, by_address = await _lookup_locations(db, missing)
+    for key in missing:
+        resolved[key] = _pick_location(key, by_place, by_address)
+        if resolved[key] is not None:
+            location_cache.set(key, resolved[key])
 
-def get_or_create_location(db: Session, location_data: schemas.LocationBase):
-    if location_data.place_id:
-        existing_location = db.query(models.Location).filter(models.Location.place_id == location_data.place_id).first()
-        if existing_location:
-            return existing_location.id
+    pending = [key for key in missing if resolved[key] is None]
+    if pending:
+        # rows colliding with each other or with a concurrent import are skipped
+        # by the database and picked up by the second lookup instead
+        await db.execute(_insert_ignoring_duplicates(db, models.Location), [_new_location_row(unique[key]) for key in pending])
+        by_place, by_address = await _lookup_locations(db, pending)
+        for key in pending:
+            resolved[key] = _pick_location(key, by_place, by_address)
+        _remember_on_commit(db, {key: resolved[key] for key in pending})
+    return resolved
 
-    existing_location = db.query(models.Location).filter(models.Location.address_1 == location_data.address_1).first()
-    if existing_location:
-        return existing_location.id
-    
+async def _insert_events(db: AsyncSession, rows: List[dict]) -> List[int]:
+    if not rows:
+        return []
+    if db.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+        # batched multi-row INSERT ... RETURNING, ids in parameter order
+        result = await db.execute(insert(models.Event).returning(models.Event.id, sort_by_parameter_order=True), rows)
+        return list(result.scalars())
+
+    # no RETURNING (MySQL): one executemany, then map the unique slugs back to ids
+    await db.execute(insert(models.Event), rows)
+    slugs = [row["slug"] for row in rows]
+    ids = dict((await db.execute(
+        select(models.Event.slug, models.Event.id).where(models.Event.slug.in_(slugs))
+    )).all())
+    return [ids[slug] for slug in slugs]
+
+def _new_location_row(location_data: schemas.LocationBase) -> dict:
     new_location_data = location_data.model_dump(by_alias=False)
 
     #placeholders for missing fields
@@ -109,46 +534,385 @@ def get_or_create_location(db: Session, location_data: schemas.LocationBase):
     for field, default in default_values.items():
         new_location_data[field] = new_location_data.get(field) or default
 
-    new_location = models.Location(**new_location_data)
+    new_location_data["place_id"] = location_data.place_id or None
+    new_location_data["address_key"] = _location_key(location_data)[1]
+    if location_data.latitude is not None and location_data.longitude is not None:
+        new_location_data["grid_cell"] = geo.grid_cell(location_data.latitude, location_data.longitude)
+    return new_location_data
+
+async def _upsert_location(db: AsyncSession, location_data: schemas.LocationBase) -> int:
+    row = _new_location_row(location_data)
+    if db.get_bind().dialect.name == "mysql":
+        # on a duplicate, LAST_INSERT_ID(id) makes lastrowid the existing row's id
+        result = await db.execute(
+            mysql.insert(models.Location).values(**row)
+            .on_duplicate_key_update(id=func.last_insert_id(models.Location.id))
+        )
+        return result.lastrowid
+
+    location_id = await db.scalar(
+        sqlite.insert(models.Location).values(**row).on_conflict_do_nothing().returning(models.Location.id)
+    )
+    if location_id is None:
+        # a concurrent request inserted the same venue first
+        key = _location_key(location_data)
+        location_id = _pick_location(key, *await _lookup_locations(db, [key]))
+    return location_id
+
+async def get_or_create_location(db: AsyncSession, location_data: schemas.LocationBase):
+    key = _location_key(location_data)
+    location_id = location_cache.get(key)
+    if location_id is not None:
+        return location_id
+
+    location_id = _pick_location(key, *await _lookup_locations(db, [key]))
+    if location_id is None:
+        location_id = await _upsert_location(db, location_data)
+        _remember_on_commit(db, {key: location_id})
+    else:
+        location_cache.set(key, location_id)
+    return location_id
+
+def _remember_on_commit(db: AsyncSession, locations: dict):
+    db.info.setdefault("new_locations", {}).update(locations)
+
+@sa_event.listens_for(Session, "after_commit")
+def _cache_committed_locations(session):
+    for key, location_id in session.info.pop("new_locations", {}).items():
+        location_cache.set(key, location_id)
+
+@sa_event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_locations(session):
+    session.info.pop("new_locations", None)
+
+def _check_qa(qa_data: schemas.QACreate):
+    if qa_data.question_text and qa_data.answer_text:
+        raise ValueError("Cannot have both question_text and answer_text.")
+    if not qa_data.question_text and not qa_data.answer_text:
+        raise ValueError("Either question_text or answer_text must be provided.")
+    if qa_data.answer_text and not qa_data.id:
+        raise ValueError("id is required for answers.")
+
+def _activity_values(questions: int, answers: int, latest: datetime) -> dict:
+    """UPDATE values for an event that just got new questions/answers, the newest created at `latest`."""
+    return {
+        "version": models.Event.version + questions + answers,
+        "question_count": models.Event.question_count + questions,
+        "answer_count": models.Event.answer_count + answers,
+        "last_activity_at": case(
+            (or_(models.Event.last_activity_at == None, models.Event.last_activity_at < latest), latest),
+            else_=models.Event.last_activity_at,
+        ),
+    }
+
+def _published_qa(db_post, affected_event_id: int):
+    """The response for a committed question/answer, also pushed to live subscribers."""
+    if isinstance(db_post, models.Question):
+        # a brand new question has no answers; don't lazy-load the relationship
+        post = schemas.QuestionResponse(
+            id=db_post.id,
+            question_text=db_post.question_text,
+            created_at=db_post.created_at,
+            answers=[]
+        )
+        live.broker.publish(affected_event_id, "question", post.model_dump())
+    else:
+        post = schemas.AnswerResponse.model_validate(db_post)
+        live.broker.publish(affected_event_id, "answer", post.model_dump(), question_id=db_post.question_id)
+    return post
+
+async def create_qa(db: AsyncSession, event_id: int, qa_data: schemas.QACreate):
+    event = await db.get(models.Event, event_id)
+    if event is None:
+        raise ValueError("Event not found.")
+
+    _check_qa(qa_data)
+    if qa_data.question_text:
+        db_post = models.Question(event_id=event_id, question_text=qa_data.question_text)
+        affected_event_id = event_id
+    else:
+        question = await db.get(models.Question, qa_data.id)
+        if not question:
+            raise ValueError("Question not found")
+
+        db_post = models.Answer(
+            question_id=qa_data.id,
+            answer_text=qa_data.answer_text
+        )
+        affected_event_id = question.event_id
+
+    db.add(db_post)
+    await db.flush()
+    await db.refresh(db_post)
+    is_question = isinstance(db_post, models.Question)
+    await db.execute(
+        update(models.Event)
+        .where(models.Event.id == affected_event_id)
+        .values(**_activity_values(int(is_question), int(not is_question), db_post.created_at))
+    )
+    await db.commit()
+    event_cache.invalidate(affected_event_id)
+    upcoming_events.record_activity(affected_event_id, int(is_question), int(not is_question), db_post.created_at)
+
+    return _published_qa(db_post, affected_event_id)
+
+async def create_qa_batch(db: AsyncSession, items) -> list:
+    """create_qa for many (event_id, qa_data) items in a single transaction.
+
+    Returns one entry per item, in order: the response, or the ValueError
+    create_qa would have raised for it. Valid items are committed together;
+    any other error aborts the whole batch and is raised.
+    """
+    event_ids = {event_id for event_id, _ in items}
+    answered = {qa_data.id for _, qa_data in items if qa_data.answer_text and qa_data.id}
+    existing_events = set((await db.scalars(select(models.Event.id).where(models.Event.id.in_(event_ids)))).all())
+    question_events = dict((await db.execute(
+        select(models.Question.id, models.Question.event_id).where(models.Question.id.in_(answered))
+    )).all()) if answered else {}
+
+    results = [None] * len(items)
+    pending = []  # (index, row, affected event id)
+    for index, (event_id, qa_data) in enumerate(items):
+        try:
+            if event_id not in existing_events:
+                raise ValueError("Event not found.")
+            _check_qa(qa_data)
+            if qa_data.question_text:
+                pending.append((index, models.Question(event_id=event_id, question_text=qa_data.question_text), event_id))
+            elif qa_data.id not in question_events:
+                raise ValueError("Question not found")
+            else:
+                row = models.Answer(question_id=qa_data.id, answer_text=qa_data.answer_text)
+                pending.append((index, row, question_events[qa_data.id]))
+        except ValueError as e:
+            results[index] = e
+
+    if not pending:
+        return results
+
+    db.add_all([row for _, row, _ in pending])
+    await db.flush()
+
+    # load the server-side created_at of every new row, one SELECT per table
+    for model in (models.Question, models.Answer):
+        ids = [row.id for _, row, _ in pending if isinstance(row, model)]
+        if ids:
+            await db.execute(
+                select(model).where(model.id.in_(ids)).execution_options(populate_existing=True)
+            )
+
+    activity = {}  # event id -> [questions, answers, newest created_at]
+    for _, row, affected_event_id in pending:
+        stats = activity.setdefault(affected_event_id, [0, 0, row.created_at])
+        stats[0 if isinstance(row, models.Question) else 1] += 1
+        stats[2] = max(stats[2], row.created_at)
+    for affected_event_id, (questions, answers, latest) in activity.items():
+        await db.execute(
+            update(models.Event)
+            .where(models.Event.id == affected_event_id)
+            .values(**_activity_values(questions, answers, latest))
+        )
+    await db.commit()
+    event_cache.invalidate(*activity)
+    for affected_event_id, (questions, answers, latest) in activity.items():
+        upcoming_events.record_activity(affected_event_id, questions, answers, latest)
 
-    db.add(new_location)
-    db.commit()
-    db.refresh(new_location)
-    return new_location.id
+    for index, row, affected_event_id in pending:
+        results[index] = _published_qa(row, affected_event_id)
+    return results
 
-def delete_event(db: Session, event_id: int):
-    event = db.query(models.Event).filter(models.Event.id == event_id).first()
+async def delete_event(db: AsyncSession, event_id: int):
+    event = await db.get(models.Event, event_id)
     if event is None:
         logger.warning(f"[CRUD] Event {event_id} not found for deletion")
         return None
 
     logger.info(f"[CRUD] Deleting event {event.id} — {event.title}")
-    db.delete(event)
-    db.commit()
+    await db.delete(event)
+    await db.execute(_bump_events_collection())
+    await db.commit()
+    event_cache.invalidate(event_id)
+    upcoming_events.discard(event_id)
     return event
 
-def delete_old_events(db: Session):
+def delete_old_events(db: Session, batch_size: int = None, time_budget: float = None, archive=None) -> dict:
+    """Delete expired events and their Q&A in short, bounded transactions.
+
+    Each batch removes answers, then questions, then events with set-based
+    DELETEs and commits. Stops when nothing is left or the time budget is
+    spent; whatever remains is picked up by the next run.
+
+    With an `archive` (app.archive.SegmentWriter), each batch is first written
+    to cold storage and indexed in archived_events, in the same transaction
+    as the deletes, so get_archived_event can still serve it.
+    """
+    batch_size = batch_size or settings.cleanup_batch_size
+    time_budget = settings.cleanup_time_budget_seconds if time_budget is None else time_budget
+
     now = datetime.now(timezone.utc)
     threshold = now - timedelta(weeks=2)
+    expired = or_(
+        models.Event.end_date_time <= threshold,
+        models.Event.end_date_time == None,
+        models.Event.start_date_time <= threshold
+    )
 
-    old_events = db.query(models.Event).filter(
-        or_(
-            models.Event.end_date_time != None,
-            models.Event.end_date_time == None
-        )
-    ).filter(
-        or_(
-            models.Event.end_date_time <= threshold,
-            models.Event.end_date_time == None,
-            models.Event.start_date_time <= threshold
-        )
-    ).all()
+    counts = {"events": 0, "questions": 0, "answers": 0}
+    if archive is not None:
+        counts["archived"] = 0
+    deadline = time.monotonic() + time_budget
+    while True:
+        event_ids = db.scalars(
+            select(models.Event.id).where(expired).order_by(models.Event.id).limit(batch_size)
+        ).all()
+        if not event_ids:
+            break
+        if archive is not None:
+            counts["archived"] += _archive_events(db, archive, event_ids)
+
+        question_ids = select(models.Question.id).where(models.Question.event_id.in_(event_ids))
+        counts["answers"] += db.execute(
+            delete(models.Answer).where(models.Answer.question_id.in_(question_ids)),
+            execution_options={"synchronize_session": False}
+        ).rowcount
+        counts["questions"] += db.execute(
+            delete(models.Question).where(models.Question.event_id.in_(event_ids)),
+            execution_options={"synchronize_session": False}
+        ).rowcount
+        counts["events"] += db.execute(
+            delete(models.Event).where(models.Event.id.in_(event_ids)),
+            execution_options={"synchronize_session": False}
+        ).rowcount
+        db.execute(_bump_events_collection())
+        db.commit()
+        event_cache.invalidate(*event_ids)
+        upcoming_events.discard(*event_ids)
+        logger.info(f"[Cleanup] {'Archived' if archive is not None else 'Deleted'} batch of {len(event_ids)} events (ids {event_ids[0]}..{event_ids[-1]})")
+
+        if len(event_ids) < batch_size:
+            break
+        if time.monotonic() >= deadline:
+            logger.warning(f"[Cleanup] Time budget of {time_budget}s spent, resuming on next run")
+            break
+
+    return counts
+
+def _archive_events(db: Session, archive, event_ids: List[int]) -> int:
+    events = db.scalars(
+        select(models.Event).where(models.Event.id.in_(event_ids)).order_by(models.Event.id)
+        .options(joinedload(models.Event.location), selectinload(models.Event.questions).selectinload(models.Question.answers))
+    ).unique().all()
+    # on disk before the index row that points at it
+    segment, offset, length = archive.append([archive_records.event_record(event) for event in events])
+    rows = [
+        {"event_id": event.id, "slug": event.slug, "segment": segment, "segment_offset": offset, "segment_length": length}
+        for event in events
+    ]
+    # an event a crashed run already indexed keeps its first copy
+    db.execute(_insert_ignoring_duplicates(db, models.ArchivedEvent), rows)
+    db.expunge_all()  # the rows are about to be deleted behind the session's back
+    return len(rows)
+
+async def get_archived_event(db: AsyncSession, event_id: int):
+    """An expired event from cold storage as an EventDetailResponse, or None if it was never archived."""
+    row = await db.get(models.ArchivedEvent, event_id)
+    if row is None:
+        return None
+    record = await asyncio.to_thread(archive_records.read_record, row.segment, row.segment_offset, row.segment_length, event_id)
+    if record is None:
+        logger.error(f"[CRUD] Archived event {event_id} missing from segment {row.segment}")
+        return None
+
+    # all of it, newest first: there is no /questions paging over the archive
+    questions = sorted(record.pop("questions"), key=lambda question: (question["created_at"] or "", question["id"]), reverse=True)
+    return serialization.event_detail_adapter.validate_python({
+        "event": record,
+        "location": record["location"],
+        "questions": questions if record["allow_qa"] else None,
+        "archived": True,
+    })
+
+def reconcile_event_counters(db: Session, batch_size: int = None, time_budget: float = None) -> int:
+    """Recount question_count/answer_count/last_activity_at from the Q&A tables; returns how many events were off.
+
+    Walks events in id order, one GROUP BY per table for each batch, and only
+    writes the rows that drifted (bumping their version, so ETags and caches
+    notice). Each write only applies if the counters are still the ones read
+    with the counts, so a Q&A post committed in between keeps its increment
+    (the next run looks again), and is committed on its own so live events
+    don't wait on the rest of the batch. Time-boxed like delete_old_events.
+    """
+    batch_size = batch_size or settings.cleanup_batch_size
+    time_budget = settings.cleanup_time_budget_seconds if time_budget is None else time_budget
+
+    repaired = 0
+    last_id = 0
+    deadline = time.monotonic() + time_budget
+    while True:
+        events = db.execute(
+            select(models.Event.id, models.Event.question_count, models.Event.answer_count, models.Event.last_activity_at)
+            .where(models.Event.id > last_id)
+            .order_by(models.Event.id)
+            .limit(batch_size)
+        ).all()
+        if not events:
+            break
+        event_ids = [row.id for row in events]
+        last_id = event_ids[-1]
+
+        questions = {
+            event_id: (count, newest) for event_id, count, newest in db.execute(
+                select(models.Question.event_id, func.count(models.Question.id), func.max(models.Question.created_at))
+                .where(models.Question.event_id.in_(event_ids))
+                .group_by(models.Question.event_id)
+            )
+        }
+        answers = {
+            event_id: (count, newest) for event_id, count, newest in db.execute(
+                select(models.Question.event_id, func.count(models.Answer.id), func.max(models.Answer.created_at))
+                .join(models.Answer, models.Answer.question_id == models.Question.id)
+                .where(models.Question.event_id.in_(event_ids))
+                .group_by(models.Question.event_id)
+            )
+        }
+
+        drifted = []
+        for row in events:
+            question_count, question_newest = questions.get(row.id, (0, None))
+            answer_count, answer_newest = answers.get(row.id, (0, None))
+            newest = max((moment for moment in (question_newest, answer_newest) if moment is not None), default=None)
+            if (row.question_count, row.answer_count, row.last_activity_at) == (question_count, answer_count, newest):
+                continue
+            result = db.execute(
+                update(models.Event)
+                .where(
+                    models.Event.id == row.id,
+                    models.Event.question_count == row.question_count,
+                    models.Event.answer_count == row.answer_count
+                )
+                .values(
+                    question_count=question_count,
+                    answer_count=answer_count,
+                    last_activity_at=newest,
+                    version=models.Event.version + 1
+                )
+            )
+            if result.rowcount:
+                db.execute(_bump_events_collection())
+                drifted.append(row.id)
+            db.commit()
+        db.commit()
+
+        if drifted:
+            event_cache.invalidate(*drifted)
+            upcoming_events.invalidate()
+            repaired += len(drifted)
+            logger.warning(f"[Reconcile] Repaired Q&A counters of {len(drifted)} events (ids {drifted[0]}..{drifted[-1]})")
 
-    count = 0
-    for event in old_events:
-        logger.info(f"[Cleanup] Deleting event {event.id} — {event.title}")
-        db.delete(event)
-        count += 1
+        if len(events) < batch_size:
+            break
+        if time.monotonic() >= deadline:
+            logger.warning(f"[Reconcile] Time budget of {time_budget}s spent, stopped after event {last_id}")
+            break
 
-    db.commit()
-    return count
\ No newline at end of file
+    return repaired
@@ -1,13 +1,79 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 from .config import settings
+from .metrics import track_queries
+from .pool_stats import TimedAsyncAdaptedQueuePool, TimedQueuePool, instrument
+from .replicas import ReplicaRouter
 
 load_dotenv()
 import os
+
+# async drivers used for each backend when ASYNC_DATABASE_URL is not set
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def async_database_url(url):
+    url = make_url(url)
+    if url.get_driver_name() in ("aiomysql", "asyncmy", "aiosqlite"):
+        return url
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+def engine_options(url, poolclass):
+    # db_echo is applied in logging_config, so SQL logs go through the log queue
+    options = {
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    # SQLite picks its own pool (a single connection for :memory:); sizing only applies to server databases
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            poolclass=poolclass,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+        )
+    return options
+
 DB_URL = settings.database_url
-engine = create_engine(DB_URL,echo=True)
+engine = create_engine(DB_URL, **engine_options(DB_URL, TimedQueuePool))
 SessionLocal = sessionmaker(autocommit=False,autoflush=False, bind=engine)
 
-Base = declarative_base()
\ No newline at end of file
+ASYNC_DB_URL = settings.async_database_url or async_database_url(DB_URL)
+async_engine = create_async_engine(ASYNC_DB_URL, **engine_options(ASYNC_DB_URL, TimedAsyncAdaptedQueuePool))
+# expire_on_commit=False: attributes stay readable after commit without an implicit (sync) reload
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+replica_engines = []
+for url in settings.replica_database_urls:
+    replica_url = async_database_url(url)
+    replica_engines.append(create_async_engine(replica_url, **engine_options(replica_url, TimedAsyncAdaptedQueuePool)))
+read_router = ReplicaRouter(replica_engines, settings.replica_retry_seconds)
+
+pool_stats = {
+    "sync": instrument(engine),
+    "async": instrument(async_engine.sync_engine),
+    **{f"replica{i}": instrument(replica_engine.sync_engine) for i, replica_engine in enumerate(replica_engines)},
+}
+
+track_queries(engine)
+track_queries(async_engine.sync_engine)
+for replica_engine in replica_engines:
+    track_queries(replica_engine.sync_engine)
+
+def get_pool_stats():
+    return {
+        "sync": pool_stats["sync"].snapshot(engine.pool),
+        "async": pool_stats["async"].snapshot(async_engine.sync_engine.pool),
+        **{
+            f"replica{i}": pool_stats[f"replica{i}"].snapshot(replica_engine.sync_engine.pool)
+            for i, replica_engine in enumerate(replica_engines)
+        },
+    }
+
+Base = declarative_base()
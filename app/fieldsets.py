@@ -0,0 +1,59 @@
+"""Sparse fieldsets for event listings (`?fields=id,title,slug,location.city`).
+
+Names are the keys clients see in the response: event fields by name
+(`id` or `event_id` for the event's id), location fields as
+`location.<name>`, or `location` for the whole object. The event id is
+always returned. Only the requested columns are loaded, and the locations
+join is skipped when no location field is asked for.
+"""
+from typing import NamedTuple, Optional
+
+from sqlalchemy.orm import joinedload, load_only, raiseload
+
+import app.models as models, app.schemas as schemas
+
+LOCATION_FIELDS = frozenset(schemas.Location.model_fields)
+EVENT_FIELDS = frozenset(schemas.EventData.model_fields)
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+class FieldSet(NamedTuple):
+    event: frozenset
+    location: Optional[frozenset]  # None: no location in the response
+
+
+def parse_fields(value: str) -> FieldSet:
+    event, location, unknown = {"event_id"}, None, []
+    for name in filter(None, (part.strip() for part in value.split(","))):
+        if name == "id":
+            name = "event_id"
+        if name in EVENT_FIELDS:
+            event.add(name)
+        elif name == "location":
+            location = set(LOCATION_FIELDS)
+        elif name.startswith("location.") and name[len("location."):] in LOCATION_FIELDS:
+            location = (location or set()) | {name[len("location."):]}
+        else:
+            unknown.append(name)
+    if unknown:
+        raise InvalidFields(f"Unknown field(s): {', '.join(unknown)}")
+    return FieldSet(frozenset(event), frozenset(location) if location is not None else None)
+
+
+def event_load_options(fields: FieldSet, *extra_columns) -> list:
+    """Loader options for a query over Event that fetches only `fields` (plus `extra_columns`, e.g. sort keys)."""
+    columns = {models.Event.id, *extra_columns}
+    columns.update(getattr(models.Event, name) for name in fields.event if name != "event_id")
+    if fields.location is None:
+        # raise instead of lazy loading: nothing in a trimmed response should touch it
+        return [load_only(*columns, raiseload=True), raiseload(models.Event.location)]
+
+    columns.add(models.Event.location_id)
+    location_columns = {models.Location.id} | {getattr(models.Location, name) for name in fields.location}
+    return [
+        load_only(*columns, raiseload=True),
+        joinedload(models.Event.location).load_only(*location_columns, raiseload=True),
+    ]
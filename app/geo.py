@@ -0,0 +1,62 @@
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180
+
+# The globe is cut into CELL_DEGREES x CELL_DEGREES cells numbered row-major
+# from (-90, -180), so one row of neighbouring cells is one contiguous range
+# of integers and a radius query becomes a handful of BETWEENs on an index.
+CELL_DEGREES = 0.05
+ROWS = round(180 / CELL_DEGREES)
+COLS = round(360 / CELL_DEGREES)
+
+
+def _row(lat: float) -> int:
+    return min(max(int((lat + 90) / CELL_DEGREES), 0), ROWS - 1)
+
+
+def _col(lng: float) -> int:
+    return min(int(((lng + 180) % 360) / CELL_DEGREES), COLS - 1)
+
+
+def grid_cell(lat: float, lng: float) -> int:
+    return _row(lat) * COLS + _col(lng)
+
+
+def cell_ranges(lat: float, lng: float, radius_km: float) -> list[tuple[int, int]]:
+    """Inclusive grid_cell ranges covering every point within radius_km of (lat, lng)."""
+    dlat = radius_km / KM_PER_DEGREE
+    lat_min, lat_max = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+
+    # longitude degrees shrink towards the poles; size the box for the worst row
+    widest = max(abs(lat_min), abs(lat_max))
+    cos_lat = math.cos(math.radians(widest))
+    dlng = dlat / cos_lat if cos_lat > 1e-9 else 360.0
+
+    if dlng >= 180:
+        col_spans = [(0, COLS - 1)]
+    else:
+        first, last = _col(lng - dlng), _col(lng + dlng)
+        # a box crossing the antimeridian wraps around into two spans
+        col_spans = [(first, last)] if first <= last else [(first, COLS - 1), (0, last)]
+
+    spans = sorted(
+        (row * COLS + first, row * COLS + last)
+        for row in range(_row(lat_min), _row(lat_max) + 1)
+        for first, last in col_spans
+    )
+    ranges = [spans[0]]
+    for start, end in spans[1:]:
+        if start <= ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], max(end, ranges[-1][1]))
+        else:
+            ranges.append((start, end))
+    return ranges
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
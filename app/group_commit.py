@@ -0,0 +1,124 @@
+"""Group commit for Q&A posts (opt-in with QA_GROUP_COMMIT=true).
+
+Instead of one transaction per question or answer, requests hand their post
+to QAWriteBatcher and wait. A single worker task collects posts for up to
+`qa_group_commit_window_seconds` or `qa_group_commit_max_items`, whichever
+comes first, and writes them with crud.create_qa_batch in one transaction.
+Each request gets its own committed row back (id and created_at), or its
+own validation error.
+
+If the batch transaction fails as a whole, every post in it is retried on
+its own with crud.create_qa, so one bad row cannot fail its neighbours.
+"""
+import asyncio
+import logging
+
+import app.crud as crud
+
+logger = logging.getLogger("app.main")
+
+_CLOSE = object()
+
+
+class QAWriteBatcher:
+    def __init__(self, session_factory, max_items: int, window: float):
+        self.session_factory = session_factory
+        self.max_items = max_items
+        self.window = window
+        self._loop = None
+        self._queue = None
+        self._task = None
+        self.batches = 0
+        self.items = 0
+        self.fallbacks = 0
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+
+    async def submit(self, event_id: int, qa_data):
+        """Queue one post and wait until it is committed; returns what crud.create_qa would."""
+        self._ensure_worker()
+        future = self._loop.create_future()
+        self._queue.put_nowait((event_id, qa_data, future))
+        return await future
+
+    async def close(self):
+        """Write whatever is queued and stop the worker."""
+        if self._task is not None and not self._task.done() and self._loop is asyncio.get_running_loop():
+            self._queue.put_nowait(_CLOSE)
+            await self._task
+
+    async def _run(self):
+        while True:
+            item = await self._queue.get()
+            if item is _CLOSE:
+                return
+            batch = [item]
+            closing = False
+            deadline = self._loop.time() + self.window
+            while len(batch) < self.max_items:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _CLOSE:
+                    closing = True
+                    break
+                batch.append(item)
+
+            try:
+                await self._flush(batch)
+            except Exception as e:
+                # never leave a request waiting on a dead worker
+                logger.exception("[GroupCommit] Flush failed")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            if closing:
+                return
+
+    async def _flush(self, batch):
+        # posts whose request went away are not written
+        batch = [(event_id, qa_data, future) for event_id, qa_data, future in batch if not future.done()]
+        if not batch:
+            return
+        items = [(event_id, qa_data) for event_id, qa_data, _ in batch]
+        self.batches += 1
+        self.items += len(items)
+
+        try:
+            async with self.session_factory() as db:
+                results = await crud.create_qa_batch(db, items)
+        except Exception:
+            logger.exception("[GroupCommit] Batch of %d failed, writing its posts one by one", len(items))
+            self.fallbacks += 1
+            results = []
+            for event_id, qa_data in items:
+                try:
+                    async with self.session_factory() as db:
+                        results.append(await crud.create_qa(db, event_id, qa_data))
+                except Exception as e:
+                    results.append(e)
+
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "fallbacks": self.fallbacks,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
@@ -0,0 +1,172 @@
+"""In-process hot set of upcoming events for `GET /api/v1/events/?upcoming=true`.
+
+List items of every event starting from now on, up to `upcoming_max_events`
+of them, are held sorted by (start_date_time, id). They are already dumped
+to the response shape, so a page is a bisect and a slice, with no query and
+no model validation.
+
+The set is loaded from the database (crud.load_upcoming_events) and then
+kept up to date in place: create_event adds, delete_event and the cleanup
+discard, and Q&A writes bump the counters. Events drop off the front once
+they start. If the set is truncated at `upcoming_max_events`, it only covers
+keys up to its last entry; a page reaching past that is left to the
+database. Writes made by other processes are picked up by a full reload
+every `upcoming_refresh_seconds`.
+"""
+import bisect
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+
+def utc_naive(moment: datetime) -> datetime:
+    # start_date_time is stored without a zone
+    return moment.astimezone(timezone.utc).replace(tzinfo=None) if moment.tzinfo else moment
+
+
+def now_utc() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class UpcomingEvents:
+    def __init__(self, max_events: int, refresh_seconds: float):
+        self.max_events = max_events
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._keys = []  # sorted (start_date_time, id)
+        self._items = {}  # event id -> dumped list item
+        self._covered_until = None  # last key known to be complete; None: everything upcoming is here
+        self._loaded_at = None  # monotonic; None: not loaded
+        self._reloading = False
+        # bumped by adds, discards and invalidations; a load that raced with one is discarded
+        self.generation = 0
+        # bumped by every change to what pages return; with `instance`, the ETag
+        self.version = 0
+        self.instance = uuid.uuid4().hex[:8]
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def claim_reload(self) -> bool:
+        """True if the set is due for a reload and no one else is doing it; call reload_done() after."""
+        with self._lock:
+            due = self._loaded_at is None or time.monotonic() - self._loaded_at >= self.refresh_seconds
+            if not due or self._reloading:
+                return False
+            self._reloading = True
+            return True
+
+    def reload_done(self):
+        with self._lock:
+            self._reloading = False
+
+    def install(self, entries, complete: bool, generation: int) -> bool:
+        """Replace the contents with `entries` ((key, item) pairs in key order), read at `generation`."""
+        with self._lock:
+            if generation != self.generation:
+                return False
+            self._keys = [key for key, _ in entries]
+            self._items = {key[1]: item for key, item in entries}
+            self._covered_until = None if complete or not entries else self._keys[-1]
+            self._loaded_at = time.monotonic()
+            self.generation += 1
+            self.version += 1
+            self.reloads += 1
+            return True
+
+    def add(self, key, item):
+        key = (utc_naive(key[0]), key[1])
+        # dumped from what the client sent, which may carry an offset; the
+        # database hands back naive UTC, so store what a reload would
+        event = item["event"]
+        for field in ("start_date_time", "end_date_time"):
+            if event.get(field) is not None:
+                event[field] = utc_naive(event[field])
+        with self._lock:
+            self.generation += 1
+            if self._loaded_at is None or key[0] < now_utc():
+                return
+            if self._covered_until is not None and key > self._covered_until:
+                return
+            if key[1] not in self._items:
+                bisect.insort(self._keys, key)
+            self._items[key[1]] = item
+            self.version += 1
+
+    def discard(self, *event_ids):
+        with self._lock:
+            self.generation += 1
+            for event_id in event_ids:
+                item = self._items.pop(event_id, None)
+                if item is not None:
+                    self._keys.remove(self._key_of(item))
+                    self.version += 1
+
+    def record_activity(self, event_id: int, questions: int, answers: int, latest: datetime):
+        """Mirror the counter UPDATE done by a Q&A write (see crud._activity_values).
+
+        Doesn't bump the generation: Q&A writes are too frequent during live
+        events to let them discard reloads. A write racing a reload can leave
+        that item's counters behind until the next one.
+        """
+        with self._lock:
+            item = self._items.get(event_id)
+            if item is None:
+                return
+            event = item["event"]
+            event["version"] += questions + answers
+            event["question_count"] += questions
+            event["answer_count"] += answers
+            if event["last_activity_at"] is None or event["last_activity_at"] < latest:
+                event["last_activity_at"] = latest
+            self.version += 1
+
+    def invalidate(self):
+        """Forget everything; the next read reloads."""
+        with self._lock:
+            self.generation += 1
+            self._keys, self._items = [], {}
+            self._loaded_at = None
+            self.version += 1
+
+    def page(self, after, limit: int):
+        """(items, has_more, version) for the `limit` events after key `after` (None: from the start), or None if not covered."""
+        with self._lock:
+            self._expire(now_utc())
+            start = bisect.bisect_right(self._keys, after) if after is not None else 0
+            keys = self._keys[start:start + limit + 1]
+            if self._loaded_at is None or (len(keys) <= limit and self._covered_until is not None):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return [self._items[key[1]] for key in keys[:limit]], len(keys) > limit, self.version
+
+    def snapshot(self, now: datetime):
+        """(loaded, covered_until, items in order) as of `now`, for consistency checks."""
+        with self._lock:
+            self._expire(now)
+            return self._loaded_at is not None, self._covered_until, [self._items[key[1]] for key in self._keys]
+
+    def _expire(self, now: datetime):
+        started = bisect.bisect_left(self._keys, (now,))
+        if started:
+            for _, event_id in self._keys[:started]:
+                del self._items[event_id]
+            del self._keys[:started]
+            self.version += 1
+
+    @staticmethod
+    def _key_of(item) -> tuple:
+        return utc_naive(item["event"]["start_date_time"]), item["event"]["id"]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._keys),
+                "complete": self._covered_until is None,
+                "loaded": self._loaded_at is not None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "reloads": self.reloads,
+            }
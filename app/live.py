@@ -0,0 +1,85 @@
+"""In-process fan-out of new questions and answers to live subscribers.
+
+Each subscriber gets its own bounded queue. Publishing never waits: if a
+subscriber's queue is full it is dropped (its stream is told so and closed)
+rather than letting one slow client hold back everyone else or grow memory
+without bound. Clients reconnect and re-fetch the event to catch up.
+
+Everything here runs on the server's event loop; publish() must be called
+from it (the async create_qa path does).
+"""
+import asyncio
+from collections import defaultdict
+
+import orjson
+
+from app.config import settings
+
+DROPPED = None  # sentinel put on a dropped subscriber's queue
+
+
+class Subscription:
+    def __init__(self, event_id: int, maxsize: int):
+        self.event_id = event_id
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+    async def get(self, timeout: float = None):
+        """Next encoded message, DROPPED if this subscriber was cut off, or raises TimeoutError."""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class QABroker:
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers = defaultdict(set)
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def subscribe(self, event_id: int) -> Subscription:
+        subscription = Subscription(event_id, self.queue_size)
+        self._subscribers[event_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscribers.get(subscription.event_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.event_id]
+
+    def publish(self, event_id: int, kind: str, data: dict, **extra):
+        subscribers = self._subscribers.get(event_id)
+        if not subscribers:
+            return
+        # encode once, not once per subscriber
+        message = orjson.dumps({"type": kind, "event_id": event_id, **extra, "data": data}).decode()
+        self.published += 1
+        for subscription in list(subscribers):
+            try:
+                subscription.queue.put_nowait(message)
+                self.delivered += 1
+            except asyncio.QueueFull:
+                self._drop(subscription)
+
+    def _drop(self, subscription: Subscription):
+        self.unsubscribe(subscription)
+        subscription.dropped = True
+        self.dropped += 1
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(DROPPED)
+
+    def stats(self) -> dict:
+        return {
+            "events": len(self._subscribers),
+            "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values()),
+            "queue_size": self.queue_size,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+
+broker = QABroker(queue_size=settings.live_queue_size)
@@ -1,15 +1,172 @@
+"""Logging that never blocks a request on I/O.
+
+Loggers hand records to a QueueHandler on the root logger; a QueueListener
+thread formats them as one JSON object per line and writes them to a
+size-rotated logs/app.log and to stderr. The queue is bounded: if the
+writer falls behind, new records are dropped and counted rather than
+stalling the event loop or the threadpool.
+
+Hot loggers can be sampled with LOG_SAMPLE_RATES, e.g.
+`{"sqlalchemy.engine": 0.01}` keeps 1 in 100 of their INFO/DEBUG records;
+warnings and errors always pass.
+"""
+import atexit
+import copy
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+from datetime import datetime, timezone
+
+import orjson
+
+from app.config import settings
+
+# LogRecord attributes that are not `extra=` fields
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc_info"] = record.exc_text
+        if record.stack_info:
+            data["stack_info"] = record.stack_info
+        return orjson.dumps(data, default=str).decode()
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps every Nth INFO/DEBUG record of the configured loggers (and their children)."""
+
+    def __init__(self, rates: dict):
+        super().__init__()
+        self.rates = rates
+        self._every = {}  # logger name -> N, resolved once per name
+        self._seen = {}
+        self._lock = threading.Lock()
+        self.sampled_out = 0
+
+    def _every_for(self, name: str) -> int:
+        every = self._every.get(name)
+        if every is None:
+            rate, prefix = 1.0, name
+            while prefix:
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+                prefix = prefix.rpartition(".")[0]
+            every = self._every[name] = max(1, round(1 / rate)) if rate > 0 else 0
+        return every
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        every = self._every_for(record.name)
+        if every == 1:
+            return True
+        with self._lock:
+            seen = self._seen.get(record.name, 0)
+            self._seen[record.name] = seen + 1
+            if every and seen % every == 0:
+                return True
+            self.sampled_out += 1
+        return False
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # render the message and traceback now, while the arguments are still
+        # what they were, but leave the structure for the JSON formatter
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener = None
+_queue_handler = None
+_sampling_filter = None
+
 
 def configure_logging():
-    os.makedirs("logs", exist_ok=True)
-
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-        handlers=[
-            logging.FileHandler("logs/app.log"),
-            logging.StreamHandler()
-        ],
-        force=True
+    global _listener, _queue_handler, _sampling_filter
+    if _listener is not None:
+        _listener.stop()
+
+    log_dir = os.path.dirname(settings.log_file)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+
+    formatter = JSONFormatter()
+    file_handler = logging.handlers.RotatingFileHandler(
+        settings.log_file, maxBytes=settings.log_max_bytes, backupCount=settings.log_backup_count
     )
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+
+    _queue_handler = DroppingQueueHandler(queue.Queue(maxsize=settings.log_queue_size))
+    _sampling_filter = SamplingFilter(settings.log_sample_rates)
+    _queue_handler.addFilter(_sampling_filter)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(_queue_handler)
+    root.setLevel(settings.log_level)
+
+    # SQL echo goes through the queue too, instead of the synchronous stdout
+    # handler that create_engine(echo=True) would attach
+    if settings.db_echo:
+        logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
+
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, file_handler, stream_handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging():
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def logging_stats() -> dict:
+    return {
+        "queued": _queue_handler.queue.qsize() if _queue_handler else 0,
+        "dropped": _queue_handler.dropped if _queue_handler else 0,
+        "sampled_out": _sampling_filter.sampled_out if _sampling_filter else 0,
+    }
+
+
+atexit.register(stop_logging)
@@ -1,38 +1,111 @@
-from fastapi import FastAPI, Depends, status, Body, Request, HTTPException
+from fastapi import FastAPI, Depends, status, Body, Query, Request, HTTPException, WebSocket
 from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse, RedirectResponse, StreamingResponse
 from fastapi_utils.tasks import repeat_every
-from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from contextlib import asynccontextmanager
+import asyncio
+from typing import Optional, Union
 import logging
 import traceback
-from app.logging_config import configure_logging
+from app.logging_config import configure_logging, logging_stats
 import app.crud as crud, app.models as models, app.schemas as schemas
-from app.database import SessionLocal, engine, Base
+from app import admission, archive, bulk_import, group_commit, live, metrics, replicas, serialization
+from app.config import settings
+from app.database import SessionLocal, AsyncSessionLocal, async_engine, get_pool_stats, read_router
+from app.pagination import InvalidCursor
+from app.fieldsets import InvalidFields, parse_fields
+from app.etags import etag_headers, etag_matches, make_etag, not_modified
 import traceback
 from datetime import datetime
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY
 
-models.Base.metadata.create_all(bind=engine)
+# The schema is managed by Alembic (`alembic upgrade head`, run in the release
+# phase); nothing touches the database at import time.
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
+def cleanup_old_events():
     db = SessionLocal()
     try:
-        from app.crud import delete_old_events
-        deleted = delete_old_events(db)
-        logger.info(f"[Startup] Deleted {deleted} old events.")
-    except Exception as e:
+        writer = archive.SegmentWriter() if settings.archive_expired_events else None
+        deleted = crud.delete_old_events(db, archive=writer)
+        logger.info(f"[Startup] Deleted {deleted['events']} old events ({deleted.get('archived', 0)} archived), {deleted['questions']} questions, {deleted['answers']} answers.")
+    except Exception:
         logger.exception("[Startup] Error cleaning up old events")
     finally:
         db.close()
 
+async def cleanup_after_startup():
+    # let the server take traffic first; the cleanup is batched and time-boxed
+    await asyncio.sleep(settings.cleanup_start_delay_seconds)
+    await asyncio.to_thread(cleanup_old_events)
+
+def reconcile_counters():
+    db = SessionLocal()
+    try:
+        repaired = crud.reconcile_event_counters(db)
+        logger.info(f"[Reconcile] Q&A counters checked, {repaired} events repaired.")
+    except Exception:
+        logger.exception("[Reconcile] Error reconciling Q&A counters")
+    finally:
+        db.close()
+
+async def reconcile_counters_periodically():
+    while True:
+        await asyncio.sleep(settings.counter_reconcile_interval_seconds)
+        await asyncio.to_thread(reconcile_counters)
+
+async def release_connections(connects):
+    """Let every connect attempt finish and hand back the connections that were made."""
+    await asyncio.wait(connects)
+    for connect in connects:
+        if connect.exception() is None:
+            await connect.result().close()
+
+async def warm_pool(app: FastAPI):
+    """Open pool_size connections up front so the first requests don't pay for connecting."""
+    delay = 0.5
+    while True:
+        connects = [asyncio.ensure_future(async_engine.connect()) for _ in range(settings.db_pool_size)]
+        # one failed connect, or shutdown cancelling us, must not leak the ones that succeeded
+        release = asyncio.ensure_future(release_connections(connects))
+        try:
+            await asyncio.shield(release)
+        except asyncio.CancelledError:
+            await release
+            raise
+        failures = [connect.exception() for connect in connects if connect.exception() is not None]
+        if not failures:
+            app.state.pool_warm = True
+            return
+        logger.warning("[Startup] Database not reachable yet, retrying pool warm-up", exc_info=failures[0])
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 30)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.pool_warm = False
+    tasks = [
+        asyncio.create_task(cleanup_after_startup()),
+        asyncio.create_task(warm_pool(app)),
+        asyncio.create_task(reconcile_counters_periodically()),
+    ]
+
     yield
 
-app = FastAPI(lifespan=lifespan)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await qa_batcher.close()
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+qa_batcher = group_commit.QAWriteBatcher(
+    AsyncSessionLocal, settings.qa_group_commit_max_items, settings.qa_group_commit_window_seconds
+)
 
 configure_logging()
 logger = logging.getLogger(__name__)
@@ -49,6 +122,30 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         }
     )
 
+@app.exception_handler(admission.Rejected)
+async def admission_rejected_handler(request: Request, exc: admission.Rejected):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={
+            "status": exc.status_code,
+            "error": True,
+            "message": exc.message
+        },
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+@app.exception_handler(replicas.ReplicasUnavailable)
+async def replicas_unavailable_handler(request: Request, exc: replicas.ReplicasUnavailable):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "status": 503,
+            "error": True,
+            "message": "No database replica available"
+        },
+        headers={"Retry-After": str(int(settings.replica_retry_seconds))}
+    )
+
 origins = [
     "http://localhost:5173",
     "https://fp-client-107bc916594c.herokuapp.com/",
@@ -62,6 +159,10 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+recent_writers = replicas.RecentWriters(settings.read_your_writes_seconds)
+app.add_middleware(replicas.ReadYourWritesMiddleware, router=read_router, writers=recent_writers)
+# outermost, so latency includes CORS handling and unhandled errors count as 500s
+app.add_middleware(metrics.MetricsMiddleware)
 
 def get_db():
     db = SessionLocal()
@@ -70,14 +171,115 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_read_db(request: Request, primary: AsyncSession = Depends(get_async_db)):
+    """Session for read-only routes: a replica when configured and healthy, else the primary."""
+    sticky = replicas.wants_primary(request.cookies) or admission.client_key(request) in recent_writers
+    if read_router.replicas and not sticky:
+        session = await read_router.session()
+        if session is not None:
+            async with session:
+                yield session
+            return
+        if not settings.replica_fallback_to_primary:
+            raise replicas.ReplicasUnavailable()
+
+    if read_router.replicas:
+        read_router.primary_reads += 1
+    primary.info["read_your_writes"] = sticky
+    yield primary
+
 @app.get("/test-cors")
 async def test_cors():
     return {"message": "CORS works!"}
 
-@app.get("/api/v1/events/", response_model=list[schemas.EventResponse], status_code=status.HTTP_200_OK)
-def get_events(skip:int=0,limit:int=100,db:Session=Depends(get_db)):
+@app.get("/healthz")
+async def healthz():
+    # liveness only: the process is up and serving; no dependencies checked
+    return {"status": 200, "error": False, "message": "ok"}
+
+@app.get("/readyz")
+async def readyz():
+    checks = {"database": False, "pool_warm": getattr(app.state, "pool_warm", False)}
+
+    async def ping():
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
     try:
-        events = crud.get_events(db,skip=skip,limit=limit)
+        # the checkout too: an exhausted pool or a hung connect would otherwise wait out db_pool_timeout
+        await asyncio.wait_for(ping(), settings.readiness_timeout_seconds)
+        checks["database"] = True
+    except Exception:
+        logger.warning("[Readiness] Database check failed", exc_info=True)
+
+    if not all(checks.values()):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "status": 503,
+                "error": True,
+                "message": "Not ready",
+                "checks": checks
+            }
+        )
+    return {"status": 200, "error": False, "message": "ready", "checks": checks}
+
+@app.get("/internal/stats")
+def internal_stats():
+    return {
+        "event_cache": crud.event_cache.stats(),
+        "location_cache": crud.location_cache.stats(),
+        "upcoming_events": crud.upcoming_events.stats(),
+        "db_pool": get_pool_stats(),
+        "replicas": read_router.stats(),
+        "live": live.broker.stats(),
+        "admission": admission.admission_stats(),
+        "qa_group_commit": qa_batcher.stats(),
+        "logging": logging_stats()
+    }
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/v1/events/", response_model=Union[list[schemas.EventResponse], schemas.EventPage], status_code=status.HTTP_200_OK)
+async def get_events(request:Request,skip:int=0,limit:int=100,cursor:Optional[str]=None,fields:Optional[str]=None,upcoming:bool=False,db:AsyncSession=Depends(get_read_db)):
+    # Passing `cursor` (empty for the first page) switches to keyset pagination;
+    # skip/limit offset paging is kept for existing clients.
+    # `fields` (e.g. "id,title,slug,start_date_time") trims the items, see app.fieldsets.
+    # `upcoming` pages (by cursor) through events that haven't started yet,
+    # mostly from memory, see app.hot_events.
+    try:
+        fieldset = parse_fields(fields) if fields is not None else None
+
+        if upcoming:
+            page, version = await crud.get_upcoming_events_page(db, cursor=cursor, limit=limit, fields=fieldset)
+            if version is None:
+                return ORJSONResponse(page)
+            etag = make_etag("upcoming", crud.upcoming_events.instance, version)
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return not_modified(etag)
+            return ORJSONResponse(page, headers=etag_headers(etag))
+
+        etag = make_etag("events", await crud.get_events_collection_version(db))
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return not_modified(etag)
+
+        if cursor is not None:
+            events, next_cursor = await crud.get_events_page(db, cursor=cursor, limit=limit, fields=fieldset)
+            if fieldset:
+                adapter = serialization.sparse_event_page_adapter(fieldset)
+                page = adapter.validate_python({"data": events, "next_cursor": next_cursor})
+            else:
+                adapter = serialization.event_page_adapter
+                page = schemas.EventPage(data=events, next_cursor=next_cursor)
+            return serialization.json_response(adapter, page, headers=etag_headers(etag))
+
+        events = await crud.get_events(db,skip=skip,limit=limit,fields=fieldset)
         if not events:
             return JSONResponse(
                 status_code=status.HTTP_204_NO_CONTENT,
@@ -87,11 +289,31 @@ def get_events(skip:int=0,limit:int=100,db:Session=Depends(get_db)):
                     "message": "No events found"
                 }
             )
-        return events
+        adapter = serialization.sparse_event_list_adapter(fieldset) if fieldset else serialization.event_list_adapter
+        return serialization.json_response(adapter, events, headers=etag_headers(etag))
 
-    except Exception as e:
-        #do we want to log errors?
-        print(f"Error fetching events: {e}")
+    except InvalidCursor:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "status": 400,
+                "error": True,
+                "message": "Invalid cursor"
+            }
+        )
+
+    except InvalidFields as e:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "status": 400,
+                "error": True,
+                "message": str(e)
+            }
+        )
+
+    except Exception:
+        logger.exception("Error fetching events")
         return JSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content={
@@ -101,12 +323,89 @@ def get_events(skip:int=0,limit:int=100,db:Session=Depends(get_db)):
                 }
             )
 
-@app.get("/api/v1/events/{event_id}", response_model=schemas.EventResponse, status_code=status.HTTP_200_OK, name="Get event by ID")
-@app.get("/api/v1/events/{event_id}/{event_name}", response_model=schemas.EventResponse, status_code=status.HTTP_200_OK, name="Get event by ID/slug")
-def get_event(
+@app.get("/api/v1/events/search", response_model=list[schemas.EventResponse], status_code=status.HTTP_200_OK)
+async def search_events(
+            q: str = Query(..., min_length=1, max_length=200),
+            skip: int = Query(0, ge=0),
+            limit: int = Query(20, ge=1, le=100),
+            db: AsyncSession = Depends(get_read_db)
+        ):
+    try:
+        events = await crud.search_events(db, q=q, skip=skip, limit=limit)
+        return serialization.json_response(serialization.event_list_adapter, events)
+
+    except Exception:
+        logger.exception("Error searching events")
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={
+                "status": 500,
+                "error": True,
+                "message": "An unexpected error occurred"
+            }
+        )
+
+@app.get("/api/v1/events/nearby", response_model=list[schemas.NearbyEventResponse], status_code=status.HTTP_200_OK)
+async def get_events_nearby(
+            lat: float = Query(..., ge=-90, le=90),
+            lng: float = Query(..., ge=-180, le=180),
+            radius_km: float = Query(10, gt=0, le=200),
+            limit: int = Query(50, ge=1, le=200),
+            db: AsyncSession = Depends(get_read_db)
+        ):
+    try:
+        events = await crud.get_events_nearby(db, lat=lat, lng=lng, radius_km=radius_km, limit=limit)
+        return serialization.json_response(serialization.nearby_event_list_adapter, events)
+
+    except Exception:
+        logger.exception("Error fetching nearby events")
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={
+                "status": 500,
+                "error": True,
+                "message": "An unexpected error occurred"
+            }
+        )
+
+@app.get("/api/v1/events/{event_id}/questions", response_model=schemas.QuestionPage, status_code=status.HTTP_200_OK)
+async def get_event_questions(
+            event_id: int,
+            cursor: Optional[str] = None,
+            limit: int = Query(settings.questions_page_size, ge=1, le=100),
+            db: AsyncSession = Depends(get_read_db)
+        ):
+    # declared before /{event_id}/{event_name} so "questions" isn't taken for a slug
+    try:
+        page = await crud.get_event_questions_page(db, event_id, cursor=cursor, limit=limit)
+    except InvalidCursor:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "status": 400,
+                "error": True,
+                "message": "Invalid cursor"
+            }
+        )
+
+    if page is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "status": 404,
+                "error": True,
+                "message": "Event not found"
+            }
+        )
+    return serialization.json_response(serialization.question_page_adapter, page)
+
+@app.get("/api/v1/events/{event_id}", response_model=schemas.EventDetailResponse, status_code=status.HTTP_200_OK, name="Get event by ID")
+@app.get("/api/v1/events/{event_id}/{event_name}", response_model=schemas.EventDetailResponse, status_code=status.HTTP_200_OK, name="Get event by ID/slug")
+async def get_event(
+            request: Request,
             event_id: int,
             event_name: str = None,
-            db: Session = Depends(get_db)
+            db: AsyncSession = Depends(get_read_db)
         ):
     try:
         if event_id <= 0:
@@ -119,7 +418,19 @@ def get_event(
                 }
             )
 
-        event = crud.get_event_by_id(db=db, event_id=event_id)
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            # answer revalidation from the version column alone, without touching the Q&A tree
+            version = await crud.get_event_version(db, event_id)
+            if version is not None and event_name == version[1]:
+                etag = make_etag("event", event_id, version[0])
+                if etag_matches(if_none_match, etag):
+                    return not_modified(etag)
+
+        event = await crud.get_event_by_id(db=db, event_id=event_id)
+        if event is None:
+            # expired events are moved to cold storage by the cleanup
+            event = await crud.get_archived_event(db, event_id)
         if event is None:
             return JSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -133,20 +444,15 @@ def get_event(
         if event_name is None or event_name != event.event.slug:
             return RedirectResponse(url=f"/api/v1/events/{event.event.event_id}/{event.event.slug}", status_code=307)
 
-        for question in event.questions or []:
-            if question.answers is None:
-                question.answers = []
-                
-        return event
+        etag = make_etag("archived" if event.archived else "event", event_id, event.event.version)
+        return serialization.json_response(serialization.event_detail_adapter, event, headers=etag_headers(etag))
 
-    except Exception as e:
-        from fastapi import HTTPException
-        import traceback
-        print("Error Traceback:", traceback.format_exc())  # Debugging
+    except Exception:
+        logger.exception("Error fetching event")
         raise HTTPException(status_code=500, detail="An unexpected error occurred")
 
-@app.post("/api/v1/events/", status_code=status.HTTP_201_CREATED)
-def post_event(event:schemas.EventCreate = Body(...), db: Session=Depends(get_db)):
+@app.post("/api/v1/events/", status_code=status.HTTP_201_CREATED, dependencies=[Depends(admission.admit_event_write)])
+async def post_event(event:schemas.EventCreate = Body(...), db: AsyncSession=Depends(get_async_db)):
     try:
         if not event.title or event.start_date_time is None:
             return JSONResponse(
@@ -158,21 +464,19 @@ def post_event(event:schemas.EventCreate = Body(...), db: Session=Depends(get_db
                 }
             )
 
-        created_event = crud.create_event(db=db, event=event)
-
-        event_data = schemas.EventResponse.model_validate(created_event).model_dump()
+        created_event = await crud.create_event(db=db, event=event)
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_201_CREATED,
             content={
                 "status": 201,
                 "error": False,
-                "data": jsonable_encoder(event_data)
+                "data": serialization.event_response_adapter.dump_python(created_event)
             }
         )
 
     except Exception as e:
-        print(f"Error while creating event: {e}")
+        logger.exception("Error while creating event")
         return JSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={
@@ -182,43 +486,46 @@ def post_event(event:schemas.EventCreate = Body(...), db: Session=Depends(get_db
             }
         )
 
-@app.post("/api/v1/events/{event_id}/qa/")
-def create_qa(event_id: int, qa_data: schemas.QACreate, request: Request, db: Session = Depends(get_db)):
+@app.post("/api/v1/events/import", dependencies=[Depends(admission.admit_event_write)])
+async def import_events(request: Request, db: AsyncSession = Depends(get_async_db)):
     try:
-        event = db.query(models.Event).filter(models.Event.id == event_id).first()
-        if event is None:
-            raise ValueError("Event not found.")
-
-        if qa_data.question_text and qa_data.answer_text:
-            raise ValueError("Cannot have both question_text and answer_text.")
-        if not qa_data.question_text and not qa_data.answer_text:
-            raise ValueError("Either question_text or answer_text must be provided.")
-
-        if qa_data.question_text:
-            db_post = models.Question(event_id=event_id, question_text=qa_data.question_text)
-            response_schema = schemas.QuestionResponse  # Use QuestionResponse for questions
-        elif qa_data.answer_text:
-            if not qa_data.id:
-                raise ValueError("id is required for answers.")
-            question = db.query(models.Question).filter(models.Question.id == qa_data.id).first()  # Using `id`
-            if not question:
-                raise ValueError("Question not found")
-
-            db_post = models.Answer(
-                question_id=qa_data.id,
-                answer_text=qa_data.answer_text
-            )
-            db_post.event_id = question.event_id
+        results = await bulk_import.import_events(db, request.stream(), settings.import_batch_size)
+    except bulk_import.ImportAborted as e:
+        # rows before the broken framing may already be committed; say which
+        created = sum(1 for result in e.results if result.status == "created")
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "status": 400,
+                "error": True,
+                "message": str(e),
+                "created": created,
+                "failed": len(e.results) - created,
+                "results": [result.model_dump(exclude_none=True) for result in e.results]
+            }
+        )
 
-            response_schema = schemas.AnswerResponse  # Use AnswerResponse for answers
-        else:
-            raise ValueError("Either question_text or answer_text must be provided.")
+    created = sum(1 for result in results if result.status == "created")
+    return ORJSONResponse(
+        status_code=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        content={
+            "status": 201 if created else 200,
+            "error": created < len(results),
+            "created": created,
+            "failed": len(results) - created,
+            "results": [result.model_dump(exclude_none=True) for result in results]
+        }
+    )
 
-        db.add(db_post)
-        db.commit()
-        db.refresh(db_post)
+@app.post("/api/v1/events/{event_id}/qa/", dependencies=[Depends(admission.admit_qa_write)])
+async def create_qa(event_id: int, qa_data: schemas.QACreate, request: Request, db: AsyncSession = Depends(get_async_db)):
+    try:
+        if settings.qa_group_commit:
+            post = await qa_batcher.submit(event_id, qa_data)
+        else:
+            post = await crud.create_qa(db, event_id, qa_data)
 
-        response_data = jsonable_encoder(response_schema.model_validate(db_post).model_dump(exclude_none=True))
+        response_data = jsonable_encoder(post.model_dump(exclude_none=True))
 
         return response_data  # Keeping direct return to avoid JSONResponse issues
 
@@ -243,12 +550,83 @@ def create_qa(event_id: int, qa_data: schemas.QACreate, request: Request, db: Se
         }
         return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=error_response)
 
-@app.delete("/api/v1/events/{event_id}", status_code=status.HTTP_200_OK)
-def delete_event(event_id: int, db: Session = Depends(get_db)):
+@app.get("/api/v1/events/{event_id}/qa/stream")
+async def stream_qa(event_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Server-sent events: one `qa` event per new question/answer on this event."""
+    exists = await db.get(models.Event, event_id)
+    # don't hold a pooled connection for the lifetime of the stream
+    await db.close()
+    if exists is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "status": 404,
+                "error": True,
+                "message": "Event not found"
+            }
+        )
+
+    subscription = live.broker.subscribe(event_id)
+
+    async def event_stream():
+        try:
+            while True:
+                try:
+                    message = await subscription.get(timeout=settings.live_keepalive_seconds)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if message is live.DROPPED:
+                    yield 'event: dropped\ndata: {"message": "Too slow, reconnect and re-fetch the event"}\n\n'
+                    return
+                yield f"event: qa\ndata: {message}\n\n"
+        finally:
+            live.broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.websocket("/api/v1/events/{event_id}/qa/ws")
+async def websocket_qa(websocket: WebSocket, event_id: int, db: AsyncSession = Depends(get_async_db)):
+    exists = await db.get(models.Event, event_id)
+    await db.close()
+    if exists is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Event not found")
+        return
+
+    await websocket.accept()
+    subscription = live.broker.subscribe(event_id)
+
+    async def push():
+        while True:
+            message = await subscription.get()
+            if message is live.DROPPED:
+                await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Too slow, reconnect")
+                return
+            await websocket.send_text(message)
+
+    async def listen():
+        # the stream is one-way; reading only tells us when the client goes away
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = {asyncio.create_task(push()), asyncio.create_task(listen())}
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        live.broker.unsubscribe(subscription)
+
+@app.delete("/api/v1/events/{event_id}", status_code=status.HTTP_200_OK, dependencies=[Depends(admission.admit_event_write)])
+async def delete_event(event_id: int, db: AsyncSession = Depends(get_async_db)):
     logger.warning(f"DELETE route triggered for event {event_id}")
 
     try:
-        deleted_event = crud.delete_event(db, event_id)
+        deleted_event = await crud.delete_event(db, event_id)
         if deleted_event is None:
             return JSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -266,9 +644,8 @@ def delete_event(event_id: int, db: Session = Depends(get_db)):
             "message": f"Event {event_id} deleted successfully"
         }
     
-    except Exception as e:
+    except Exception:
         logger.exception("Error deleting event")
-        print(f"Error deleting event: {e}")
         return JSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={
@@ -0,0 +1,185 @@
+"""Per-route request metrics, rendered in the Prometheus text format.
+
+MetricsMiddleware is plain ASGI (no BaseHTTPMiddleware task/stream
+wrapping) and labels every request by its route template, e.g.
+`/api/v1/events/{event_id}/{event_name}`, never by the raw path, so the
+number of series stays bounded. Requests that match no route share the
+"<unmatched>" label.
+
+SQL statements and their time are attributed to the request that issued
+them through a ContextVar; it holds a mutable counter, so statements run in
+the threadpool or in SQLAlchemy's async greenlets are still counted.
+"""
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+# upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED = "<unmatched>"
+
+
+class _QueryCounter:
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+
+_current_queries: ContextVar = ContextVar("current_queries", default=None)
+
+
+class _Series:
+    __slots__ = ("buckets", "count", "total", "statuses", "db_statements", "db_seconds")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.statuses = {}
+        self.db_statements = 0
+        self.db_seconds = 0.0
+
+
+class RequestMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+        self.in_flight = 0
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, method: str, route: str, status: int, seconds: float, queries: _QueryCounter):
+        with self._lock:
+            self.in_flight -= 1
+            series = self._series.get((method, route))
+            if series is None:
+                series = self._series[(method, route)] = _Series()
+            series.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            series.count += 1
+            series.total += seconds
+            series.statuses[status] = series.statuses.get(status, 0) + 1
+            series.db_statements += queries.statements
+            series.db_seconds += queries.seconds
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> str:
+        with self._lock:
+            series = sorted(self._series.items())
+            in_flight = self.in_flight
+
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {in_flight}",
+            "# HELP http_request_duration_seconds Request latency by route template.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), s in series:
+            labels = f'method="{_escape(method)}",route="{_escape(route)}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, s.buckets):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {s.count}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {s.total:.6f}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {s.count}")
+
+        lines += [
+            "# HELP http_responses_total Responses by route template and status code.",
+            "# TYPE http_responses_total counter",
+        ]
+        for (method, route), s in series:
+            labels = f'method="{_escape(method)}",route="{_escape(route)}"'
+            for status, count in sorted(s.statuses.items()):
+                lines.append(f'http_responses_total{{{labels},status="{status}"}} {count}')
+
+        lines += [
+            "# HELP http_request_db_statements_total SQL statements executed while serving requests.",
+            "# TYPE http_request_db_statements_total counter",
+        ]
+        for (method, route), s in series:
+            lines.append(f'http_request_db_statements_total{{method="{_escape(method)}",route="{_escape(route)}"}} {s.db_statements}')
+
+        lines += [
+            "# HELP http_request_db_seconds_total Time spent in SQL statements while serving requests.",
+            "# TYPE http_request_db_seconds_total counter",
+        ]
+        for (method, route), s in series:
+            lines.append(f'http_request_db_seconds_total{{method="{_escape(method)}",route="{_escape(route)}"}} {s.db_seconds:.6f}')
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsMiddleware:
+    def __init__(self, app, metrics: RequestMetrics = None):
+        self.app = app
+        self.metrics = metrics if metrics is not None else registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500  # if the app raises before starting a response
+        queries = _QueryCounter()
+        token = _current_queries.set(queries)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.metrics.started()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current_queries.reset(token)
+            # the router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            self.metrics.finished(scope["method"], getattr(route, "path", UNMATCHED), status, elapsed, queries)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_queries.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    queries = _current_queries.get()
+    if queries is not None and conn.info.get("query_start"):
+        queries.statements += 1
+        queries.seconds += time.perf_counter() - conn.info["query_start"].pop()
+
+
+def _handle_error(context):
+    # a failed statement never reaches after_cursor_execute
+    starts = context.connection.info.get("query_start") if context.connection is not None else None
+    if starts:
+        starts.pop()
+
+
+def track_queries(engine):
+    """Attribute statements on a sync Engine (use `.sync_engine` for async ones) to the current request."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+registry = RequestMetrics()
@@ -0,0 +1,52 @@
+"""Bring the database schema up to date: `python -m app.migrate` (the release command in the Procfile).
+
+The Alembic history starts from a database that already had its tables (the
+initial revision is empty), so replaying it cannot build a fresh one. An
+empty database instead gets the current schema from the models and is
+stamped at head; any other database is upgraded with Alembic as before.
+"""
+import logging
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect
+
+from app import models
+from app.config import settings
+
+logger = logging.getLogger("app.main")
+
+SCRIPT_LOCATION = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic")
+
+
+def alembic_config(url: str) -> Config:
+    # no ini file, so alembic/env.py leaves logging alone
+    config = Config()
+    config.set_main_option("script_location", SCRIPT_LOCATION)
+    config.attributes["database_url"] = url
+    return config
+
+
+def migrate(url: str = None) -> str:
+    """Create or upgrade the schema at `url` (default DATABASE_URL); returns "created" or "upgraded"."""
+    url = url or settings.database_url
+    engine = create_engine(url)
+    try:
+        # a failed `alembic upgrade` on an empty database may have left just its version table
+        tables = set(inspect(engine).get_table_names()) - {"alembic_version"}
+        if not tables:
+            logger.info("[Migrate] Empty database, creating tables from the models and stamping head")
+            models.Base.metadata.create_all(bind=engine)
+            command.stamp(alembic_config(url), "head", purge=True)
+            return "created"
+    finally:
+        engine.dispose()
+
+    command.upgrade(alembic_config(url), "head")
+    return "upgraded"
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s %(message)s")
+    migrate()
@@ -1,4 +1,6 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime
+import hashlib
+
+from sqlalchemy import BigInteger, Boolean, Column, DDL, Float, ForeignKey, Index, Integer, String, DateTime, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -9,32 +11,97 @@ class Event(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), index=True)
     host = Column(String(255))
-    description = Column(String(500), index=True)
+    description = Column(String(500))
     start_date_time = Column(DateTime)
     end_date_time = Column(DateTime)
     location_id = Column(Integer, ForeignKey("locations.id"), nullable=True)
     location = relationship("Location", back_populates="events")
     image_url = Column(String(255))
     allow_qa = Column(Boolean, default=True)
-    slug = Column(String(255), index=True)
+    slug = Column(String(255), index=True, unique=True, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    version = Column(Integer, nullable=False, default=1, server_default="1") # bumped by every Q&A write; drives the ETag
+    # denormalized Q&A stats for list views, kept in step by every Q&A write;
+    # crud.reconcile_event_counters repairs drift
+    question_count = Column(Integer, nullable=False, default=0, server_default="0")
+    answer_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_activity_at = Column(DateTime(timezone=True), nullable=True)
 
     questions = relationship(
         "Question", 
         back_populates="event",
         cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_events_start_date_time_id", "start_date_time", "id"),
+    )
+
+# Full-text search over title/description: a FULLTEXT index on MySQL, an
+# external-content FTS5 table on SQLite kept in sync by triggers, so every
+# insert/delete path (crud, bulk cleanup) updates it in the same transaction.
+EVENTS_FULLTEXT_MYSQL = [
+    "ALTER TABLE events ADD FULLTEXT INDEX ft_events_title_description (title, description)",
+]
+
+EVENTS_FTS_SQLITE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5("
+    "title, description, content='events', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN "
+    "INSERT INTO events_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN "
+    "INSERT INTO events_fts(events_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS events_fts_au AFTER UPDATE OF title, description ON events BEGIN "
+    "INSERT INTO events_fts(events_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO events_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+]
+
+for statement in EVENTS_FULLTEXT_MYSQL:
+    event.listen(Event.__table__, "after_create", DDL(statement).execute_if(dialect="mysql"))
+for statement in EVENTS_FTS_SQLITE:
+    event.listen(Event.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(Event.__table__, "after_drop", DDL("DROP TABLE IF EXISTS events_fts").execute_if(dialect="sqlite"))
+
+class CollectionVersion(Base):
+    """Counters bumped in the same transaction as every add, delete or repair in a collection.
+
+    The list ETag (crud.get_events_collection_version) reads the "events" row
+    instead of aggregating the whole table; Q&A writes don't touch it (the
+    newest question/answer ids cover them), so it never becomes a hot row.
+    """
+    __tablename__ = "collection_versions"
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
+event.listen(
+    CollectionVersion.__table__, "after_create",
+    DDL("INSERT INTO collection_versions (name, version) VALUES ('events', 0)")
+)
+
+def normalize_address(address_1: str, city: str = None, state: str = None, zip: str = None) -> str:
+    """A venue's address_key: street, city, state and zip, with case and spacing folded."""
+    key = "|".join(" ".join((part or "").split()).lower() for part in (address_1, city, state, zip))
+    # hash the rare key too long for the column rather than truncate it into a collision
+    return key if len(key) <= 255 else hashlib.sha256(key.encode()).hexdigest()
+
+def _address_key_default(context):
+    params = context.get_current_parameters()
+    return normalize_address(params.get("address_1"), params.get("city"), params.get("state"), params.get("zip"))
+
 class Location(Base):
     __tablename__ = "locations"
     id = Column(Integer, primary_key=True, index=True)
-    place_id = Column(String(255), nullable=True) #foreign key
+    place_id = Column(String(255), nullable=True, unique=True, index=True) #foreign key
     name = Column(String(255), nullable=True, index=True)
     full_address = Column(String(500), nullable=True)
     address_1 = Column(String(255), nullable=False)
     address_2 = Column(String(255), nullable=True)
+    address_key = Column(String(255), nullable=False, unique=True, index=True, default=_address_key_default)
     city = Column(String(100), nullable=False)
     state = Column(String(100), nullable=False)
     zip = Column(String(20), nullable=False)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    grid_cell = Column(Integer, nullable=True, index=True) # app.geo.grid_cell(latitude, longitude)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     events = relationship("Event", back_populates="location")
@@ -50,7 +117,12 @@ class Question(Base):
     answers = relationship(
         "Answer", 
         back_populates="question",
-        cascade="all, delete-orphan")
+        cascade="all, delete-orphan",
+        order_by=lambda: (Answer.created_at.desc(), Answer.id.desc()))
+
+    __table_args__ = (
+        Index("ix_questions_event_id_created_at_id", "event_id", "created_at", "id"),
+    )
 
 class Answer(Base):
     __tablename__ = "answers"
@@ -59,4 +131,19 @@ class Answer(Base):
     answer_text = Column(String(500), nullable=False)
     created_at = Column(DateTime, server_default=func.now())
 
-    question = relationship("Question", back_populates="answers")
\ No newline at end of file
+    question = relationship("Question", back_populates="answers")
+
+    __table_args__ = (
+        Index("ix_answers_question_id_created_at_id", "question_id", "created_at", "id"),
+    )
+
+
+class ArchivedEvent(Base):
+    """Where an expired event went: its line is in the gzip member at `segment_offset` (see app.archive)."""
+    __tablename__ = "archived_events"
+    event_id = Column(Integer, primary_key=True, autoincrement=False)
+    slug = Column(String(255), nullable=False)
+    segment = Column(String(255), nullable=False)
+    segment_offset = Column(BigInteger, nullable=False)
+    segment_length = Column(Integer, nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,43 @@
+import base64
+import json
+from datetime import datetime
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(*values) -> str:
+    """Pack the sort key of the last row on a page into an opaque, URL-safe token."""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+    if not isinstance(values, list):
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def decode_datetime_id_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor(some_datetime, some_id)."""
+    values = decode_cursor(cursor)
+    try:
+        moment, row_id = values
+        return datetime.fromisoformat(moment), int(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+
+
+def decode_id_cursor(cursor: str) -> int:
+    """Decode a cursor produced by encode_cursor(some_id)."""
+    values = decode_cursor(cursor)
+    if len(values) != 1 or not isinstance(values[0], int) or isinstance(values[0], bool):
+        raise InvalidCursor("Invalid cursor")
+    return values[0]
@@ -0,0 +1,141 @@
+"""Routing reads to replicas, with read-your-writes stickiness.
+
+Read-only routes take a session from ReplicaRouter, which picks the
+replicas in turn and skips one for `replica_retry_seconds` after it fails
+to connect. With every replica down, reads go to the primary or, if
+`replica_fallback_to_primary` is off, fail with 503.
+
+Replicas lag. After a client's successful write, ReadYourWritesMiddleware
+remembers it for `read_your_writes_seconds`, in two ways: a cookie, and the
+client's key (admission.client_key) in this process's RecentWriters. While
+either says so, that client's reads use the primary, so the client always
+sees what it just posted. The cookie is SameSite=None, since the frontend is
+on another site; browsers only send it on credentialed requests, and the
+in-process record covers clients that don't make those.
+"""
+import itertools
+import logging
+import math
+import time
+from collections import OrderedDict
+
+from starlette.requests import Request
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.admission import client_key
+
+logger = logging.getLogger("app.main")
+
+STICKY_COOKIE = "fp_read_primary_until"
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+class ReplicasUnavailable(Exception):
+    pass
+
+
+class Replica:
+    def __init__(self, engine):
+        self.engine = engine
+        # what stats and logs call it: never the URL, which carries the user (and maybe the password)
+        self.name = engine.url.host or engine.url.database
+        # same session options as AsyncSessionLocal
+        self.sessionmaker = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+        self.down_until = 0.0
+        self.served = 0
+        self.failures = 0
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "up": self.down_until <= time.monotonic(),
+            "served": self.served,
+            "failures": self.failures,
+        }
+
+
+class ReplicaRouter:
+    def __init__(self, engines, retry_seconds: float):
+        self.replicas = [Replica(engine) for engine in engines]
+        self.retry_seconds = retry_seconds
+        self._turn = itertools.count()
+        self.primary_reads = 0
+
+    async def session(self):
+        """A session already connected to a healthy replica, or None."""
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._turn) % len(self.replicas)]
+            if replica.down_until > time.monotonic():
+                continue
+            session = replica.sessionmaker()
+            try:
+                # connect now, so a dead replica is skipped before the route runs
+                await session.connection()
+            except (DBAPIError, OSError):
+                await session.close()
+                replica.failures += 1
+                replica.down_until = time.monotonic() + self.retry_seconds
+                logger.warning("[Replicas] %s unreachable, skipping for %ss", replica.name, self.retry_seconds, exc_info=True)
+                continue
+            replica.served += 1
+            return session
+        return None
+
+    def stats(self) -> dict:
+        return {"replicas": [replica.stats() for replica in self.replicas], "primary_reads": self.primary_reads}
+
+
+def wants_primary(cookies) -> bool:
+    try:
+        return float(cookies.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class RecentWriters:
+    """Client keys that wrote in the last `seconds`; the least recent are forgotten past `max_keys`."""
+
+    def __init__(self, seconds: float, max_keys: int = 10000, clock=time.monotonic):
+        self.seconds = seconds
+        self.max_keys = max_keys
+        self.clock = clock
+        self._until = OrderedDict()
+
+    def mark(self, key: str):
+        self._until.pop(key, None)
+        self._until[key] = self.clock() + self.seconds
+        if len(self._until) > self.max_keys:
+            self._until.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        return self._until.get(key, 0) > self.clock()
+
+    def clear(self):
+        self._until.clear()
+
+
+class ReadYourWritesMiddleware:
+    """Marks clients that just wrote, so their reads skip the (possibly lagging) replicas."""
+
+    def __init__(self, app, router: ReplicaRouter, writers: RecentWriters):
+        self.app = app
+        self.router = router
+        self.writers = writers
+        self.seconds = writers.seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS or not self.router.replicas:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                self.writers.mark(client_key(Request(scope)))
+                until = time.time() + self.seconds
+                cookie = f"{STICKY_COOKIE}={until:.0f}; Max-Age={math.ceil(self.seconds)}; Path=/; HttpOnly; Secure; SameSite=None"
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,6 +1,6 @@
 from typing import List, Optional
 from datetime import datetime as dt
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 from datetime import datetime
 
 class LocationBase(BaseModel):
@@ -12,6 +12,8 @@ class LocationBase(BaseModel):
     state: Optional[str]
     zip: Optional[str]
     place_id: Optional[str]
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 class LocationCreate(LocationBase):
     pass
@@ -48,6 +50,36 @@ class EventBase(BaseModel):
 class EventCreate(EventBase):
     location: Optional[LocationBase] = None
 
+class EventImport(EventCreate):
+    """One row of a bulk import; also accepts the partner feed shape of events.json."""
+
+    @model_validator(mode="before")
+    @classmethod
+    def from_partner_feed(cls, data):
+        if not isinstance(data, dict) or "starttime" not in data:
+            return data
+        host = " ".join(part for part in (data.get("first_name"), data.get("last_name")) if part)
+        mapped = {
+            "title": data.get("title"),
+            "description": data.get("description"),
+            "start_date_time": data.get("starttime"),
+            "end_date_time": data.get("endtime"),
+            "image_url": data.get("image_url"),
+            "host": host or None,
+        }
+        if data.get("location_name"):
+            # the feed only carries a venue name, which doubles as its address line
+            mapped["location"] = {
+                "name": data["location_name"],
+                "address_1": data["location_name"],
+                "full_address": None,
+                "city": None,
+                "state": None,
+                "zip": None,
+                "place_id": None,
+            }
+        return mapped
+
 class EventData(BaseModel):
     event_id: int = Field(..., alias="id")
     title: str
@@ -57,6 +89,10 @@ class EventData(BaseModel):
     end_date_time: Optional[dt] = None
     allow_qa: bool
     slug: str
+    version: int = 1
+    question_count: int = 0
+    answer_count: int = 0
+    last_activity_at: Optional[dt] = None
 
     model_config = ConfigDict(from_attributes=True, populate_by_name=True, extra="ignore")
 
@@ -85,4 +121,29 @@ class EventResponse(BaseModel):
     location: Optional[Location] = None
     questions: Optional[List[QuestionResponse]] = []
 
-    model_config = ConfigDict(from_attributes = True, extra = "ignore")
\ No newline at end of file
+    model_config = ConfigDict(from_attributes = True, extra = "ignore")
+
+class EventDetailResponse(EventResponse):
+    # `questions` holds the newest page only; follow up with /questions?cursor=
+    questions_next_cursor: Optional[str] = None
+    # served from cold storage (crud.get_archived_event): read-only, and `questions` is complete
+    archived: bool = False
+
+class NearbyEventResponse(EventResponse):
+    distance_km: float
+
+class EventPage(BaseModel):
+    data: List[EventResponse]
+    next_cursor: Optional[str] = None
+
+class QuestionPage(BaseModel):
+    data: List[QuestionResponse]
+    next_cursor: Optional[str] = None
+
+
+class ImportRowResult(BaseModel):
+    index: int
+    status: str  # "created" or "error"
+    event_id: Optional[int] = None
+    slug: Optional[str] = None
+    message: Optional[str] = None
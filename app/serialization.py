@@ -0,0 +1,102 @@
+"""Build event response payloads once and write them straight to JSON bytes.
+
+ORM rows are validated into response models with a single precompiled
+TypeAdapter call, and routes hand the dumped data to ORJSONResponse instead
+of letting FastAPI re-validate it against `response_model` and run
+jsonable_encoder on top.
+"""
+from functools import lru_cache
+from typing import List, Optional
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter, create_model
+
+import app.schemas as schemas
+from app.fieldsets import FieldSet
+
+event_response_adapter = TypeAdapter(schemas.EventResponse)
+event_detail_adapter = TypeAdapter(schemas.EventDetailResponse)
+event_list_adapter = TypeAdapter(List[schemas.EventResponse])
+nearby_event_list_adapter = TypeAdapter(List[schemas.NearbyEventResponse])
+event_page_adapter = TypeAdapter(schemas.EventPage)
+question_page_adapter = TypeAdapter(schemas.QuestionPage)
+
+
+def event_list_from_orm(events) -> List[schemas.EventResponse]:
+    return event_list_adapter.validate_python(
+        [{"event": event, "location": event.location} for event in events],
+        from_attributes=True,
+    )
+
+
+def _subset_model(name: str, model, fields: frozenset):
+    return create_model(
+        name,
+        __config__=model.model_config,
+        **{field: (info.annotation, info) for field, info in model.model_fields.items() if field in fields},
+    )
+
+
+@lru_cache(maxsize=128)
+def sparse_event_models(fields: FieldSet):
+    """(item model, page model) for a `?fields=` selection: EventResponse/EventPage cut down to those fields."""
+    item_fields = {"event": (_subset_model("SparseEventData", schemas.EventData, fields.event), ...)}
+    if fields.location is not None:
+        location = _subset_model("SparseLocation", schemas.Location, fields.location)
+        item_fields["location"] = (Optional[location], None)
+    item = create_model("SparseEventResponse", __config__=schemas.EventResponse.model_config, **item_fields)
+    page = create_model("SparseEventPage", __base__=BaseModel, data=(List[item], ...), next_cursor=(Optional[str], None))
+    return item, page
+
+
+@lru_cache(maxsize=128)
+def sparse_event_list_adapter(fields: FieldSet) -> TypeAdapter:
+    return TypeAdapter(List[sparse_event_models(fields)[0]])
+
+
+@lru_cache(maxsize=128)
+def sparse_event_page_adapter(fields: FieldSet) -> TypeAdapter:
+    return TypeAdapter(sparse_event_models(fields)[1])
+
+
+def sparse_event_list_from_orm(events, fields: FieldSet) -> list:
+    """Like event_list_from_orm, reading only the attributes in `fields` (the rest were never loaded)."""
+    if fields.location is None:
+        rows = [{"event": event} for event in events]
+    else:
+        rows = [{"event": event, "location": event.location} for event in events]
+    return sparse_event_list_adapter(fields).validate_python(rows, from_attributes=True)
+
+
+def trim_list_item(item: dict, fields: FieldSet) -> dict:
+    """A dumped EventResponse cut down to `fields`, as the sparse models would dump it."""
+    keys = ("id" if name == "event_id" else name for name in fields.event)
+    trimmed = {"event": {key: item["event"][key] for key in keys}}
+    if fields.location is not None:
+        location = item.get("location")
+        trimmed["location"] = {name: location[name] for name in fields.location} if location else None
+    return trimmed
+
+
+def nearby_event_list_from_orm(matches) -> List[schemas.NearbyEventResponse]:
+    """`matches` is a list of (distance_km, event) pairs."""
+    return nearby_event_list_adapter.validate_python(
+        [{"event": event, "location": event.location, "distance_km": round(distance, 3)} for distance, event in matches],
+        from_attributes=True,
+    )
+
+
+def event_from_orm(event, questions=None, questions_next_cursor=None) -> schemas.EventDetailResponse:
+    return event_detail_adapter.validate_python(
+        {"event": event, "location": event.location, "questions": questions, "questions_next_cursor": questions_next_cursor},
+        from_attributes=True,
+    )
+
+
+def question_page_from_orm(questions, next_cursor=None) -> schemas.QuestionPage:
+    return question_page_adapter.validate_python({"data": questions, "next_cursor": next_cursor}, from_attributes=True)
+
+
+def json_response(adapter: TypeAdapter, value, status_code: int = 200, by_alias: bool = True, **kwargs) -> ORJSONResponse:
+    # by_alias=True matches what FastAPI's response_model serialization emitted (e.g. "id" for event_id)
+    return ORJSONResponse(adapter.dump_python(value, by_alias=by_alias), status_code=status_code, **kwargs)
@@ -0,0 +1,113 @@
+"""Benchmark: latency of creating one event with a location.
+
+Compares the previous write path (location SELECTs + INSERT + commit, then
+event INSERT + commit + refresh, then slug UPDATE + commit) with
+crud.create_event (one transaction: cached location, slug allocated up
+front, event INSERT flushed, one commit), on a throwaway SQLite file.
+
+    python -m benchmarks.create_event [--events 500] [--venues 20]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from slugify import slugify
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.crud as crud
+import app.models as models
+import app.schemas as schemas
+
+
+async def legacy_get_or_create_location(db, location_data):
+    if location_data.place_id:
+        existing_id = await db.scalar(
+            select(models.Location.id).where(models.Location.place_id == location_data.place_id).limit(1)
+        )
+        if existing_id:
+            return existing_id
+    existing_id = await db.scalar(
+        select(models.Location.id).where(models.Location.address_1 == location_data.address_1).limit(1)
+    )
+    if existing_id:
+        return existing_id
+    new_location = models.Location(**crud._new_location_row(location_data))
+    db.add(new_location)
+    await db.commit()
+    await db.refresh(new_location)
+    return new_location.id
+
+
+async def legacy_create_event(db, event):
+    location_id = await legacy_get_or_create_location(db, event.location) if event.location else event.location_id
+    db_event = models.Event(**event.model_dump(exclude={"location", "location_id"}), location_id=location_id, slug=None)
+    db.add(db_event)
+    # slug is NOT NULL and unique now, so stand in for the old NULL / shared values
+    db_event.slug = f"pending-{id(db_event)}"
+    await db.commit()
+    await db.refresh(db_event)
+    db_event.slug = slugify(event.title) + f"-{db_event.id}"
+    await db.commit()
+    return await db.get(models.Location, location_id) if location_id else None
+
+
+def make_events(count: int, venues: int):
+    return [
+        schemas.EventCreate(
+            title=f"Benchmark event {i % 50}",
+            start_date_time="2025-01-01T10:00:00",
+            location=schemas.LocationBase(
+                name=f"Venue {i % venues}", full_address=None, address_1=f"{i % venues} Main St",
+                city="Portland", state="OR", zip="97201", place_id=f"place-{i % venues}",
+            ),
+        )
+        for i in range(count)
+    ]
+
+
+async def timed(create, events) -> list:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+        crud.location_cache.clear()
+
+        latencies = []
+        for event in events:
+            async with session_factory() as db:
+                start = time.perf_counter()
+                await create(db, event)
+                latencies.append(time.perf_counter() - start)
+        await engine.dispose()
+    return latencies
+
+
+def summary(latencies) -> str:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    return f"mean {statistics.mean(ordered) * 1000:7.3f} ms  p50 {statistics.median(ordered) * 1000:7.3f} ms  p95 {p95 * 1000:7.3f} ms"
+
+
+async def main(count: int, venues: int):
+    events = make_events(count, venues)
+    legacy = await timed(legacy_create_event, events)
+    current = await timed(crud.create_event, events)
+    print(f"{count} creates across {venues} venues")
+    print(f"  legacy (3 commits):      {summary(legacy)}")
+    print(f"  single transaction:      {summary(current)}")
+    print(f"  speedup (mean): {statistics.mean(legacy) / statistics.mean(current):.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--venues", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.events, args.venues))
@@ -0,0 +1,276 @@
+"""Load benchmark: latency percentiles and throughput for every API endpoint.
+
+Seeds a throwaway SQLite file with a configurable dataset, then drives the
+real ASGI app in-process (httpx + ASGITransport, no sockets) with
+`--concurrency` clients per endpoint and reports p50/p95/p99 latency and
+requests/sec as JSON. Save a run as a baseline and compare later runs
+against it; the comparison exits non-zero when an endpoint regressed by
+more than `--threshold`.
+
+    python -m benchmarks.load --output baseline.json
+    python -m benchmarks.load --compare baseline.json [--threshold 0.2]
+
+Numbers are only comparable between runs on the same machine with the same
+dataset options; both are recorded in the report's "meta" block.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ENDPOINTS = (
+    "list_events",
+    "list_events_cursor",
+    "list_events_sparse",
+    "list_events_upcoming",
+    "get_event",
+    "get_event_questions",
+    "search_events",
+    "nearby_events",
+    "post_event",
+    "create_qa",
+)
+
+
+def seed(database_url: str, events: int, locations: int, questions: int, answers: int, rng: random.Random):
+    from sqlalchemy import create_engine, insert
+
+    import app.models as models
+    from app import geo
+
+    engine = create_engine(database_url)
+    models.Base.metadata.create_all(engine)
+    start = datetime(2099, 1, 1, 18, 0)
+    created = datetime(2025, 1, 1, 12, 0)
+    words = ["picnic", "games", "music", "market", "poetry", "cleanup", "workshop", "film", "dance", "garden"]
+
+    location_rows = []
+    for i in range(1, locations + 1):
+        lat, lng = 45.5 + rng.uniform(-0.2, 0.2), -122.6 + rng.uniform(-0.2, 0.2)
+        location_rows.append({
+            "id": i, "place_id": f"place-{i}", "name": f"Venue {i}", "full_address": f"{i} Main St, Portland, OR",
+            "address_1": f"{i} Main St", "address_key": f"{i} main st", "city": "Portland", "state": "OR",
+            "zip": "97201", "latitude": lat, "longitude": lng, "grid_cell": geo.grid_cell(lat, lng),
+        })
+
+    event_rows, question_rows, answer_rows = [], [], []
+    question_id = answer_id = 0
+    for i in range(1, events + 1):
+        title = f"{rng.choice(words).title()} {rng.choice(words)} {i}"
+        event_rows.append({
+            "id": i, "title": title, "host": "Bench host", "description": " ".join(rng.choices(words, k=12)),
+            "start_date_time": start + timedelta(hours=i), "end_date_time": start + timedelta(hours=i + 2),
+            "location_id": rng.randint(1, locations) if locations else None, "allow_qa": True,
+            "slug": f"bench-event-{i}", "created_at": created, "version": 1,
+            "question_count": questions, "answer_count": questions * answers,
+            "last_activity_at": created + timedelta(minutes=questions - 1, seconds=answers) if questions else None,
+        })
+        for q in range(questions):
+            question_id += 1
+            question_rows.append({
+                "id": question_id, "event_id": i, "question_text": f"Question {q} for event {i}?",
+                "created_at": created + timedelta(minutes=q),
+            })
+            for a in range(answers):
+                answer_id += 1
+                answer_rows.append({
+                    "id": answer_id, "question_id": question_id, "answer_text": f"Answer {a}",
+                    "created_at": created + timedelta(minutes=q, seconds=a + 1),
+                })
+
+    with engine.begin() as conn:
+        for model, rows in (
+            (models.Location, location_rows), (models.Event, event_rows),
+            (models.Question, question_rows), (models.Answer, answer_rows),
+        ):
+            if rows:
+                conn.execute(insert(model), rows)
+    engine.dispose()
+    return question_id
+
+
+def request_factory(endpoint: str, events: int, question_count: int, rng: random.Random):
+    """A function returning the next (method, url, json body) for `endpoint`."""
+    counter = iter(range(10**9))
+
+    def event_id():
+        return rng.randint(1, events)
+
+    factories = {
+        "list_events": lambda: ("GET", "/api/v1/events/?limit=50", None),
+        "list_events_cursor": lambda: ("GET", "/api/v1/events/?cursor=&limit=50", None),
+        "list_events_sparse": lambda: ("GET", "/api/v1/events/?limit=50&fields=id,title,slug,start_date_time", None),
+        "list_events_upcoming": lambda: ("GET", "/api/v1/events/?upcoming=true&limit=50", None),
+        "get_event": lambda: ("GET", f"/api/v1/events/{(i := event_id())}/bench-event-{i}", None),
+        "get_event_questions": lambda: ("GET", f"/api/v1/events/{event_id()}/questions?limit=20", None),
+        "search_events": lambda: ("GET", f"/api/v1/events/search?q={rng.choice(['games', 'music', 'gard', 'film'])}", None),
+        "nearby_events": lambda: (
+            "GET", f"/api/v1/events/nearby?lat={45.5 + rng.uniform(-0.1, 0.1):.4f}&lng={-122.6 + rng.uniform(-0.1, 0.1):.4f}&radius_km=5", None
+        ),
+        "post_event": lambda: ("POST", "/api/v1/events/", {
+            "title": f"Load test event {next(counter)}",
+            "start_date_time": "2099-06-01T10:00:00",
+            "location": {
+                "name": "Load venue", "full_address": None, "address_1": f"{rng.randint(1, 50)} Load St",
+                "city": None, "state": None, "zip": None, "place_id": None,
+            },
+        }),
+        "create_qa": lambda: (
+            ("POST", f"/api/v1/events/{event_id()}/qa/", {"question_text": "Is there parking?"})
+            if not question_count or rng.random() < 0.5
+            else ("POST", f"/api/v1/events/{event_id()}/qa/", {"id": rng.randint(1, question_count), "answer_text": "Yes."})
+        ),
+    }
+    return factories[endpoint]
+
+
+async def drive(client, next_request, total: int, concurrency: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        method, url, body = next_request()
+        await client.request(method, url, json=body)
+
+    latencies, errors = [], 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            method, url, body = next_request()
+            start = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "rps": round(len(ordered) / elapsed, 1),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 3),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+    }
+
+
+def percentile(ordered, pct: float) -> float:
+    # nearest-rank
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+async def run(args) -> dict:
+    import httpx
+
+    from app import crud
+    from app.main import app
+
+    # the app logs at INFO; httpx's per-request lines would dominate the run
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    rng = random.Random(args.seed)
+    question_count = seed(
+        os.environ["DATABASE_URL"], args.events, args.locations, args.questions, args.answers, rng
+    )
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for endpoint in args.endpoints:
+            crud.event_cache.clear()
+            next_request = request_factory(endpoint, args.events, question_count, rng)
+            results[endpoint] = await drive(client, next_request, args.requests, args.concurrency, args.warmup)
+            print(f"{endpoint:22} {json.dumps(results[endpoint])}", file=sys.stderr)
+
+    return {
+        "meta": {
+            "events": args.events,
+            "locations": args.locations,
+            "questions_per_event": args.questions,
+            "answers_per_question": args.answers,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list:
+    """Regressions as human-readable strings: p95 up or rps down by more than `threshold`."""
+    regressions = []
+    for endpoint, current in report["results"].items():
+        before = baseline.get("results", {}).get(endpoint)
+        if before is None:
+            continue
+        if current["p95_ms"] > before["p95_ms"] * (1 + threshold):
+            regressions.append(f"{endpoint}: p95 {before['p95_ms']} ms -> {current['p95_ms']} ms")
+        if current["rps"] < before["rps"] * (1 - threshold):
+            regressions.append(f"{endpoint}: rps {before['rps']} -> {current['rps']}")
+        if current["errors"] > before["errors"]:
+            regressions.append(f"{endpoint}: errors {before['errors']} -> {current['errors']}")
+    if baseline.get("meta", {}) | {"python": None, "machine": None} != report["meta"] | {"python": None, "machine": None}:
+        print("warning: dataset/load options differ from the baseline's", file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--locations", type=int, default=100)
+    parser.add_argument("--questions", type=int, default=10, help="questions per event")
+    parser.add_argument("--answers", type=int, default=2, help="answers per question")
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument("--output", help="write the JSON report here (e.g. to store a baseline)")
+    parser.add_argument("--compare", help="baseline JSON to check this run against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown, default 20%%")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # app.config reads DATABASE_URL at import, so point it at the scratch
+        # database before anything from app/ is imported
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/load.db"
+        os.environ.pop("ASYNC_DATABASE_URL", None)
+        # every request comes from one client address; measure the endpoints,
+        # not the per-client rate limits (concurrency limits stay in effect)
+        for name in ("QA_CLIENT_RATE", "QA_EVENT_RATE", "EVENT_WRITE_CLIENT_RATE"):
+            os.environ.setdefault(name, "1000000")
+        for name in ("QA_CLIENT_BURST", "QA_EVENT_BURST", "EVENT_WRITE_CLIENT_BURST"):
+            os.environ.setdefault(name, "1000000")
+        report = asyncio.run(run(args))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Microbenchmark: serializing a 100-event list page.
+
+Compares the previous path (per-item model_validate, then FastAPI's
+response_model dump/re-validate/serialize and JSONResponse) with
+app.serialization (one TypeAdapter validation, orjson straight to bytes).
+
+    python -m benchmarks.serialization [--events 100] [--repeat 200]
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+import app.models as models
+import app.schemas as schemas
+from app import serialization
+
+
+def make_events(count: int):
+    start = datetime(2025, 1, 1, 18, 0)
+    location = models.Location(
+        id=1, place_id="place-1", name="Community Hall", full_address="1 Main St, Portland, OR 97201",
+        address_1="1 Main St", city="Portland", state="OR", zip="97201", created_at=start,
+    )
+    return [
+        models.Event(
+            id=i, title=f"Event {i}", host="Host", description="A local picnic with games and food. " * 5,
+            start_date_time=start + timedelta(hours=i), end_date_time=start + timedelta(hours=i + 2),
+            allow_qa=True, image_url="https://example.com/image.png", slug=f"event-{i}",
+            created_at=start, version=1, question_count=0, answer_count=0, location=location,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def legacy_build(events):
+    return [
+        schemas.EventResponse(
+            event=schemas.EventData.model_validate(event, from_attributes=True),
+            location=schemas.Location.model_validate(event.location, from_attributes=True) if event.location else None,
+        )
+        for event in events
+    ]
+
+
+legacy_field = create_response_field(name="response", type_=List[schemas.EventResponse])
+
+
+async def legacy_render(events) -> bytes:
+    content = await serialize_response(field=legacy_field, response_content=legacy_build(events))
+    return JSONResponse(content).body
+
+
+async def current_render(events) -> bytes:
+    items = serialization.event_list_from_orm(events)
+    return serialization.json_response(serialization.event_list_adapter, items).body
+
+
+async def timed(render, events, repeat: int) -> float:
+    await render(events)  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await render(events)
+    return (time.perf_counter() - start) / repeat
+
+
+async def main(count: int, repeat: int):
+    events = make_events(count)
+    legacy = await timed(legacy_render, events, repeat)
+    current = await timed(current_render, events, repeat)
+    print(f"{count}-event page, mean of {repeat} runs")
+    print(f"  legacy (validate x2 + jsonable/json.dumps): {legacy * 1000:8.3f} ms")
+    print(f"  single pass (TypeAdapter + orjson):         {current * 1000:8.3f} ms")
+    print(f"  speedup: {legacy / current:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.events, args.repeat))
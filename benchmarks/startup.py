@@ -0,0 +1,78 @@
+"""Startup benchmark: import-to-first-request and time-to-ready, against a budget.
+
+Each run starts a fresh interpreter (nothing cached), imports app.main, runs
+the lifespan startup and serves GET /healthz, then polls /readyz until the
+pool is warm. The median of `--runs` is checked against `--budget-ms`; the
+exit status is 1 when import-to-first-request is over budget.
+
+    python -m benchmarks.startup [--runs 5] [--budget-ms 2000]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+CHILD = """
+import json, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+from fastapi.testclient import TestClient  # test harness only, not counted
+harness = time.perf_counter() - imported
+
+with TestClient(app) as client:
+    client.get("/healthz")
+    first = time.perf_counter() - harness
+    while client.get("/readyz").status_code != 200:
+        time.sleep(0.005)
+    ready = time.perf_counter() - harness
+
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_request_ms": (first - start) * 1000,
+    "ready_ms": (ready - start) * 1000,
+}))
+"""
+
+
+def measure(env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD], env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=2000.0, help="import-to-first-request budget")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp}/startup.db", LOG_FILE=f"{tmp}/app.log")
+        env.pop("ASYNC_DATABASE_URL", None)
+        # the schema comes from migrations in deployments; build it once up front
+        subprocess.run(
+            [sys.executable, "-c", "from sqlalchemy import create_engine; import app.models as m, app.config as c; "
+                                   "m.Base.metadata.create_all(create_engine(c.settings.database_url))"],
+            env=env, check=True,
+        )
+        runs = [measure(env) for _ in range(args.runs)]
+
+    report = {
+        key: round(statistics.median(run[key] for run in runs), 1)
+        for key in ("import_ms", "first_request_ms", "ready_ms")
+    }
+    report["runs"] = args.runs
+    report["budget_ms"] = args.budget_ms
+    report["within_budget"] = report["first_request_ms"] <= args.budget_ms
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report["within_budget"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,83 @@
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
-from app.database import Base, SessionLocal
-from app.main import app, get_db
+from sqlalchemy.pool import NullPool
+from app.database import Base
+from app.main import app, get_db, get_async_db, recent_writers
+from app.metrics import track_queries
+from app import admission, crud, main
 from fastapi.testclient import TestClient
 
 
-TEST_DATABASE_URL = "sqlite:///:memory:"
-engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+@pytest.fixture(scope="session", autouse=True)
+def app_database(tmp_path_factory):
+    """A throwaway SQLite database behind the app, for tests using a module-level TestClient.
+
+    Never the DATABASE_URL engine: a developer's .env may name a real database.
+    Besides the DB dependencies this covers what runs outside them: the
+    lifespan's pool warm-up and cleanup, /readyz and the Q&A write batcher.
+    Returns the overrides, which the `client` fixture puts back when it is done.
+    """
+    path = tmp_path_factory.mktemp("app") / "app.db"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    track_queries(engine)
+    track_queries(async_engine.sync_engine)
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
+    overrides = {get_db: override_get_db, get_async_db: override_get_async_db}
+    app.dependency_overrides.update(overrides)
+    with pytest.MonkeyPatch.context() as patch:
+        _use_databases(patch, TestingSessionLocal, TestingAsyncSessionLocal)
+        yield overrides
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+def _use_databases(patch, session_factory, async_session_factory):
+    """Point the app's own sessions and engine (used outside the DB dependencies) at test databases."""
+    patch.setattr(main, "SessionLocal", session_factory)
+    patch.setattr(main, "AsyncSessionLocal", async_session_factory)
+    patch.setattr(main, "async_engine", async_session_factory.kw["bind"])
+    patch.setattr(main.qa_batcher, "session_factory", async_session_factory)
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """Every test starts with full token buckets for the TestClient's address."""
+    admission.clear_rate_limits()
+
+@pytest.fixture(autouse=True)
+def reset_recent_writers():
+    """Writes in one test don't pin the next test's reads to the primary."""
+    recent_writers.clear()
+
+@pytest.fixture(scope="function")
+def db_path(tmp_path):
+    """A throwaway SQLite file shared by the sync and async engines of one test."""
+    return tmp_path / "test.db"
 
 @pytest.fixture(scope="function")
-def db():
+def db(db_path):
     """Creates a new database session for each test."""
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     Base.metadata.create_all(bind=engine)
+    crud.event_cache.clear()
+    crud.location_cache.clear()
+    crud.upcoming_events.invalidate()
     session = TestingSessionLocal()
     try:
         yield session
@@ -21,11 +85,34 @@ def db():
         session.rollback()
         session.close()
         Base.metadata.drop_all(bind=engine)
+        engine.dispose()
 
 @pytest.fixture(scope="function")
-def client(db):
+def async_session_factory(db, db_path):
+    """AsyncSession factory over the same database as `db`.
+
+    NullPool keeps aiosqlite connections from being shared between the
+    pytest event loop and the TestClient's own loop.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+@pytest.fixture(scope="function")
+async def async_db(async_session_factory):
+    async with async_session_factory() as session:
+        yield session
+
+@pytest.fixture(scope="function")
+def client(db, async_session_factory, app_database, monkeypatch):
     """Provides a FastAPI test client with a fresh DB session"""
+    _use_databases(monkeypatch, sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind()), async_session_factory)
+
+    async def override_get_async_db():
+        async with async_session_factory() as session:
+            yield session
+
     app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as c:
         yield c
-    app.dependency_overrides.clear()
\ No newline at end of file
+    app.dependency_overrides.update(app_database)
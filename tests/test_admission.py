@@ -0,0 +1,96 @@
+import pytest
+
+from app import admission
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_buckets_allow_burst_then_refill():
+    """A key may spend its burst at once, then gets tokens back at `rate`"""
+    clock = FakeClock()
+    buckets = admission.TokenBuckets(rate=2.0, burst=3, clock=clock)
+
+    assert [buckets.take("a") for _ in range(3)] == [0, 0, 0]
+    assert buckets.take("a") == pytest.approx(0.5)
+    assert buckets.take("b") == 0  # keys are independent
+
+    clock.now = 0.5
+    assert buckets.take("a") == 0
+    assert buckets.limited == 1
+
+def test_token_buckets_forget_least_recently_used_keys():
+    """The number of tracked keys stays bounded"""
+    clock = FakeClock()
+    buckets = admission.TokenBuckets(rate=1.0, burst=1, max_keys=2, clock=clock)
+    buckets.take("a")
+    buckets.take("b")
+    buckets.take("c")
+
+    assert buckets.take("a") == 0  # evicted, so it starts over with a full bucket
+    assert buckets.take("c") > 0
+
+async def test_concurrency_limiter_sheds_after_wait_deadline():
+    """A request waiting past max_wait for a slot is rejected with 503"""
+    limiter = admission.ConcurrencyLimiter(1, max_wait=0.01, max_queue=10)
+    async with limiter.slot():
+        with pytest.raises(admission.Rejected) as exc:
+            async with limiter.slot():
+                pass
+    assert exc.value.status_code == 503
+    assert exc.value.retry_after == 1
+    assert limiter.stats() == {"limit": 1, "active": 0, "waiting": 0, "shed": 1}
+
+    async with limiter.slot():  # the slot was released
+        pass
+
+async def test_concurrency_limiter_sheds_immediately_when_queue_is_full():
+    limiter = admission.ConcurrencyLimiter(1, max_wait=10.0, max_queue=0)
+    async with limiter.slot():
+        with pytest.raises(admission.Rejected):
+            async with limiter.slot():
+                pass
+    assert limiter.shed == 1
+
+def test_qa_writes_rate_limited_per_client_while_reads_still_served(client, monkeypatch):
+    """Posts over the client's budget get 429 with Retry-After; the event page keeps working"""
+    monkeypatch.setitem(admission.client_buckets, "qa_write", admission.TokenBuckets(rate=0.01, burst=2))
+    event = client.post("/api/v1/events/", json={
+        "title": "Viral Event",
+        "start_date_time": "2099-01-01T10:00:00",
+        "allow_qa": True
+    }).json()["data"]["event"]
+    url = f"/api/v1/events/{event['event_id']}/qa/"
+
+    assert client.post(url, json={"question_text": "First?"}).status_code == 200
+    assert client.post(url, json={"question_text": "Second?"}).status_code == 200
+    response = client.post(url, json={"question_text": "Third?"})
+    assert response.status_code == 429
+    assert response.json()["error"] is True
+    assert int(response.headers["Retry-After"]) >= 1
+
+    # a spoofed first hop doesn't buy a fresh budget; the router-appended last hop decides
+    spoofed = client.post(url, json={"question_text": "Fourth?"}, headers={"X-Forwarded-For": "198.51.100.1, testclient"})
+    assert spoofed.status_code == 429
+
+    # another client has its own budget
+    other = client.post(url, json={"question_text": "From elsewhere?"}, headers={"X-Forwarded-For": "198.51.100.1, 203.0.113.9"})
+    assert other.status_code == 200
+
+    detail = client.get(f"/api/v1/events/{event['event_id']}")
+    assert detail.status_code == 200
+    assert len(detail.json()["questions"]) == 3
+
+def test_qa_writes_shed_with_503_when_no_slot(client, monkeypatch):
+    monkeypatch.setitem(admission.limiters, "qa_write", admission.ConcurrencyLimiter(0, max_wait=0.01, max_queue=10))
+    event = client.post("/api/v1/events/", json={"title": "Busy Event", "start_date_time": "2099-01-01T10:00:00"}).json()
+    response = client.post(f"/api/v1/events/{event['data']['event']['event_id']}/qa/", json={"question_text": "Anyone?"})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert client.get("/internal/stats").json()["admission"]["qa_write"]["shed"] == 1
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+from app import bulk_import, models
+
+
+def _split(splitter, data, size):
+    rows = []
+    for i in range(0, len(data), size):
+        rows += list(splitter.feed(data[i:i + size]))
+    return rows + list(splitter.close())
+
+
+@pytest.mark.parametrize("size", [1, 3, 64])
+def test_json_array_splitter_handles_any_chunking(size):
+    items = [{"title": 'comma, bracket ] brace } "quoted"', "tags": [1, {"x": "\\"}]}, {"title": "two"}]
+    rows = _split(bulk_import.JSONArraySplitter(), json.dumps(items, indent=2).encode(), size)
+    assert [json.loads(row) for row in rows] == items
+
+
+def test_json_array_splitter_rejects_unterminated_array():
+    with pytest.raises(ValueError):
+        _split(bulk_import.JSONArraySplitter(), b'[{"title": "a"}', 4)
+
+
+def test_ndjson_splitter_keeps_partial_lines_until_complete():
+    rows = _split(bulk_import.NDJSONSplitter(), b'{"a": 1}\n\n{"b": 2}\n{"c": 3}', 5)
+    assert [json.loads(row) for row in rows] == [{"a": 1}, {"b": 2}, {"c": 3}]
+
+
+async def _chunks(data: bytes, size: int = 7):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+HALL = {"name": "Hall", "full_address": None, "address_1": "1 Main St", "city": None, "state": None, "zip": None, "place_id": None}
+
+
+async def test_import_events_batches_and_reports_per_row(async_db):
+    """Test that valid rows are inserted across batches and bad rows are reported, in order"""
+    lines = [
+        {"title": "One", "start_date_time": "2025-01-01T10:00:00", "location": HALL},
+        {"title": "Two", "start_date_time": "2025-01-02T10:00:00", "location": HALL},
+        {"description": "no title"},
+        "not json",
+        {"title": "Three", "start_date_time": "2025-01-03T10:00:00"},
+    ]
+    body = b"\n".join(line.encode() if isinstance(line, str) else json.dumps(line).encode() for line in lines)
+
+    results = await bulk_import.import_events(async_db, _chunks(body), batch_size=2)
+
+    assert [r.index for r in results] == [0, 1, 2, 3, 4]
+    assert [r.status for r in results] == ["created", "created", "error", "error", "created"]
+    assert results[3].message == "Invalid JSON"
+    assert results[0].slug == "one"
+    # both rows in the first batch share one location row
+    assert await async_db.scalar(select(func.count()).select_from(models.Location)) == 1
+
+
+async def test_truncated_array_reports_rows_already_written(async_db):
+    """Test that a framing error after committed batches still says which rows were created"""
+    rows = [{"title": f"Row {i}", "start_date_time": "2025-01-01T10:00:00"} for i in range(5)]
+    body = json.dumps(rows).encode()[:-1]  # drop the closing bracket
+
+    with pytest.raises(bulk_import.ImportAborted) as aborted:
+        await bulk_import.import_events(async_db, _chunks(body, 16), batch_size=2)
+
+    assert str(aborted.value) == "Unterminated JSON array"
+    assert [(r.index, r.status) for r in aborted.value.results] == [(i, "created") for i in range(4)]
+    assert await async_db.scalar(select(func.count()).select_from(models.Event)) == 4
+
+
+async def test_import_events_accepts_partner_feed_array(async_db):
+    """Test importing the events.json partner feed shape as a JSON array"""
+    with open("events.json", "rb") as f:
+        feed = f.read()
+
+    results = await bulk_import.import_events(async_db, _chunks(feed, 100), batch_size=500)
+
+    assert [r.status for r in results] == ["created"] * 3
+    event = await async_db.get(models.Event, results[0].event_id)
+    assert event.host == "Calico Seders"
+    assert event.title == "the first event"
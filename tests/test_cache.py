@@ -0,0 +1,59 @@
+from app.cache import TTLCache
+
+def test_lru_eviction_and_counters():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set(1, "one")
+    cache.set(2, "two")
+    assert cache.get(1) == "one"  # 1 is now most recently used
+    cache.set(3, "three")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "one"
+    assert cache.get(3) == "three"
+
+    stats = cache.stats()
+    assert stats["size"] == 2
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.cache.time.monotonic", lambda: now[0])
+
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("k", "v")
+    now[0] += 4
+    assert cache.get("k") == "v"
+    now[0] += 2
+    assert cache.get("k") is None
+    assert cache.stats()["expirations"] == 1
+
+def test_invalidate_only_touches_given_keys():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set(1, "one")
+    cache.set(2, "two")
+    cache.invalidate(1, 99)
+
+    assert cache.get(1) is None
+    assert cache.get(2) == "two"
+    assert cache.stats()["invalidations"] == 1
+
+def test_set_skips_values_read_before_an_invalidation():
+    cache = TTLCache(maxsize=2, ttl=60)
+    generation = cache.generation()
+    cache.invalidate(1)
+    cache.set(1, "stale", generation)
+    cache.set(2, "fresh", generation)
+
+    assert cache.get(1) is None
+    assert cache.get(2) == "fresh"
+    assert cache.stats()["stale_sets"] == 1
+
+    # keys no longer tracked individually are treated as just invalidated
+    generation = cache.generation()
+    cache.invalidate(3, 4, 5)
+    cache.set(3, "stale", generation)
+    assert cache.get(3) is None
+    cache.set(3, "fresh", cache.generation())
+    assert cache.get(3) == "fresh"
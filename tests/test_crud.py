@@ -1,23 +1,29 @@
-from app import crud, models, schemas
+import pytest
+from types import SimpleNamespace
+from sqlalchemy.dialects import mysql
+from sqlalchemy import event, func, select, update
+from app import archive, crud, models, schemas
+from app.fieldsets import parse_fields
+from app.pagination import InvalidCursor
 from datetime import datetime
 
-def test_create_event(db):
+async def test_create_event(async_db):
     """Test creating an event in the database, minimum required data"""
     event_data = schemas.EventCreate(
         title="Test Event",
         start_date_time="2025-01-01T10:00:00"
     )
 
-    event = crud.create_event(db, event_data)
+    event = await crud.create_event(async_db, event_data)
 
     assert event.event.event_id is not None
     assert event.event.title == "Test Event"
     assert event.event.start_date_time == datetime.fromisoformat("2025-01-01T10:00:00")
     assert event.location is None
 
-def test_create_event_with_existing_location(db):
+async def test_create_event_with_existing_location(async_db):
     """Test creating an event using an existing location"""
-    location_id = crud.get_or_create_location(db, schemas.LocationBase(
+    location_id = await crud.get_or_create_location(async_db, schemas.LocationBase(
         place_id="existing-place-123",
         full_address="789 Old St, Existing City, TS 56789",
         address_1="789 Old St",
@@ -32,14 +38,14 @@ def test_create_event_with_existing_location(db):
         location_id=location_id
     )
 
-    event = crud.create_event(db, event_data)
+    event = await crud.create_event(async_db, event_data)
 
     assert event.event.event_id is not None
     assert event.event.title == "Event with existing location"
     assert event.location.id == location_id
     assert event.location is not None
 
-def test_create_event_with_new_location(db):
+async def test_create_event_with_new_location(async_db):
     """Test creating an event and a new location together"""
     event_data = schemas.EventCreate(
         title="Event with new location",
@@ -54,7 +60,7 @@ def test_create_event_with_new_location(db):
         )
     )
 
-    event = crud.create_event(db, event_data)
+    event = await crud.create_event(async_db, event_data)
 
     assert event.event.event_id is not None
     assert event.event.title == "Event with new location"
@@ -63,7 +69,7 @@ def test_create_event_with_new_location(db):
     assert event.location.full_address == "456 New St, New City, TS 67890"
     assert event.location.place_id == "new-place-456"
 
-def test_get_event_by_id(db):
+async def test_get_event_by_id(async_db):
     """Test retrieving an event by its ID"""
     event_data = schemas.EventCreate(
         title="Test Event",
@@ -78,9 +84,9 @@ def test_get_event_by_id(db):
         )
     )
 
-    created_event = crud.create_event(db, event_data)
+    created_event = await crud.create_event(async_db, event_data)
 
-    fetched_event = crud.get_event_by_id(db, created_event.event.event_id)
+    fetched_event = await crud.get_event_by_id(async_db, created_event.event.event_id)
 
     assert fetched_event is not None
     assert fetched_event.event.event_id == created_event.event.event_id
@@ -90,15 +96,15 @@ def test_get_event_by_id(db):
     assert fetched_event.location is not None
     assert fetched_event.location.full_address == "789 Test Ave, Sample City, TS 67890"
 
-def test_get_non_existent_event_by_id(db):
+async def test_get_non_existent_event_by_id(async_db):
     """Test retrieving an event that does not exist"""
     non_existent_event_id = 9999  # Assuming this doesn't exist
 
-    fetched_event = crud.get_event_by_id(db, non_existent_event_id)
+    fetched_event = await crud.get_event_by_id(async_db, non_existent_event_id)
 
     assert fetched_event is None
 
-def test_get_or_create_location_creates_new_location(db):
+async def test_get_or_create_location_creates_new_location(async_db):
     """Test that get_or_create_location creates a new location when it doesn't exist"""
     location_data = schemas.LocationBase(
         place_id="new-place-123",
@@ -109,14 +115,14 @@ def test_get_or_create_location_creates_new_location(db):
         zip="12345"
     )
 
-    location_id = crud.get_or_create_location(db, location_data)
+    location_id = await crud.get_or_create_location(async_db, location_data)
 
     assert location_id is not None
-    location = db.query(models.Location).filter(models.Location.id == location_id).first()
+    location = await async_db.get(models.Location, location_id)
     assert location is not None
     assert location.full_address == "123 Test St, Testville, TS 12345"
 
-def test_get_or_create_location_retrieves_existing_location(db):
+async def test_get_or_create_location_retrieves_existing_location(async_db):
     """Test that get_or_create_location retrieves an existing location instead of creating a new one"""
     existing_location = models.Location(
         place_id="existing-place-789",
@@ -127,9 +133,8 @@ def test_get_or_create_location_retrieves_existing_location(db):
         state="TS",
         zip="67890"
     )
-    db.add(existing_location)
-    db.commit()
-    db.refresh(existing_location)
+    async_db.add(existing_location)
+    await async_db.commit()
 
     location_data = schemas.LocationBase(
         place_id="existing-place-789",
@@ -140,6 +145,393 @@ def test_get_or_create_location_retrieves_existing_location(db):
         zip="67890"
     )
 
-    location_id = crud.get_or_create_location(db, location_data)
+    location_id = await crud.get_or_create_location(async_db, location_data)
 
     assert location_id == existing_location.id
+
+async def test_get_or_create_location_dedupes_by_normalized_address_and_caches(async_db):
+    """Test that address variants resolve to one row and a warm lookup skips the database"""
+    location_data = schemas.LocationBase(
+        full_address=None, address_1="12  Harbor Rd", city=None, state=None, zip=None, place_id=None
+    )
+    location_id = await crud.get_or_create_location(async_db, location_data)
+    await async_db.commit()
+
+    statements = []
+    listen_on = async_db.get_bind()
+    record = lambda *args: statements.append(args[2])
+    event.listen(listen_on, "before_cursor_execute", record)
+    try:
+        assert await crud.get_or_create_location(async_db, location_data) == location_id
+    finally:
+        event.remove(listen_on, "before_cursor_execute", record)
+    assert statements == []
+
+    variant = location_data.model_copy(update={"address_1": "12 harbor rd "})
+    assert await crud.get_or_create_location(async_db, variant) == location_id
+
+async def test_get_or_create_location_keeps_the_same_street_in_other_cities_apart(async_db):
+    """Test that one street address in two cities makes two venues"""
+    portland = schemas.LocationBase(
+        full_address=None, address_1="1 Main St", city="Portland", state="OR", zip="97201", place_id=None
+    )
+    springfield = portland.model_copy(update={"city": "Springfield", "state": "IL", "zip": "62701"})
+    first = await crud.get_or_create_location(async_db, portland)
+    second = await crud.get_or_create_location(async_db, springfield)
+    await async_db.commit()
+
+    assert first != second
+    assert await crud.get_or_create_location(async_db, portland.model_copy(update={"city": " portland"})) == first
+
+async def test_upsert_location_returns_existing_row_on_conflict(async_db):
+    """Test that losing an insert race resolves to the row already there"""
+    location_data = schemas.LocationBase(
+        full_address=None, address_1="9 Pier St", city=None, state=None, zip=None, place_id="pier-9"
+    )
+    first = await crud._upsert_location(async_db, location_data)
+    await async_db.commit()
+
+    assert await crud._upsert_location(async_db, location_data) == first
+    assert await async_db.scalar(select(func.count()).select_from(models.Location)) == 1
+
+async def test_create_event_allocates_unique_slugs(async_db):
+    """Test that repeated titles get -2, -3 suffixes and unrelated prefixes don't interfere"""
+    await crud.create_event(async_db, schemas.EventCreate(title="Jam night extra", start_date_time="2025-01-01T10:00:00"))
+    slugs = [
+        (await crud.create_event(async_db, schemas.EventCreate(title="Jam Night", start_date_time="2025-01-01T10:00:00"))).event.slug
+        for _ in range(3)
+    ]
+    assert slugs == ["jam-night", "jam-night-2", "jam-night-3"]
+
+    created = await crud.bulk_create_events(async_db, [
+        schemas.EventCreate(title="Jam night", start_date_time="2025-01-01T10:00:00"),
+        schemas.EventCreate(title="Jam night", start_date_time="2025-01-01T10:00:00"),
+    ])
+    assert [slug for _, slug in created] == ["jam-night-4", "jam-night-5"]
+
+async def test_rolled_back_location_is_not_cached(async_db):
+    location_data = schemas.LocationBase(
+        full_address=None, address_1="3 Gone Ave", city=None, state=None, zip=None, place_id=None
+    )
+    await crud.get_or_create_location(async_db, location_data)
+    await async_db.rollback()
+
+    assert crud.location_cache.get(crud._location_key(location_data)) is None
+
+async def test_get_events_page_walks_keyset_cursor(async_db):
+    """Test that cursor pagination returns every event once, ordered by start time then id"""
+    for title, start in [
+        ("Third", "2025-03-01T10:00:00"),
+        ("First", "2025-01-01T10:00:00"),
+        ("Second A", "2025-02-01T10:00:00"),
+        ("Second B", "2025-02-01T10:00:00"),
+    ]:
+        await crud.create_event(async_db, schemas.EventCreate(title=title, start_date_time=start))
+
+    titles = []
+    cursor = None
+    while True:
+        events, cursor = await crud.get_events_page(async_db, cursor=cursor, limit=3)
+        titles.extend(e.event.title for e in events)
+        if cursor is None:
+            break
+
+    assert titles == ["First", "Second A", "Second B", "Third"]
+
+async def test_get_events_page_rejects_garbage_cursor(async_db):
+    """Test that a tampered cursor raises InvalidCursor"""
+    with pytest.raises(InvalidCursor):
+        await crud.get_events_page(async_db, cursor="not-a-cursor", limit=10)
+
+async def test_event_read_racing_an_invalidation_is_not_cached(async_db, monkeypatch):
+    """Test that a detail built while a Q&A write invalidated the event isn't stored"""
+    created = await crud.create_event(async_db, schemas.EventCreate(title="Racy", start_date_time="2099-01-01T10:00:00"))
+    event_id = created.event.event_id
+    questions_page = crud._questions_page
+
+    async def committed_meanwhile(db, *args):
+        page = await questions_page(db, *args)
+        crud.event_cache.invalidate(event_id)  # what create_qa does after its commit
+        return page
+    monkeypatch.setattr(crud, "_questions_page", committed_meanwhile)
+
+    assert (await crud.get_event_by_id(async_db, event_id)).event.title == "Racy"
+    assert crud.event_cache.get(event_id) is None
+
+async def test_events_collection_version_moves_with_adds_qa_and_deletes(async_db):
+    """Test that the list ETag stamp changes on every kind of write that changes list items"""
+    seen = [await crud.get_events_collection_version(async_db)]
+    keep = await crud.create_event(async_db, schemas.EventCreate(title="Stays", start_date_time="2099-01-01T10:00:00"))
+    seen.append(await crud.get_events_collection_version(async_db))
+    doomed = await crud.create_event(async_db, schemas.EventCreate(title="Goes", start_date_time="2099-01-01T10:00:00"))
+    seen.append(await crud.get_events_collection_version(async_db))
+    question = await crud.create_qa(async_db, keep.event.event_id, schemas.QACreate(question_text="Same second?"))
+    seen.append(await crud.get_events_collection_version(async_db))
+    await crud.create_qa(async_db, keep.event.event_id, schemas.QACreate(id=question.id, answer_text="Yes"))
+    seen.append(await crud.get_events_collection_version(async_db))
+    await crud.delete_event(async_db, doomed.event.event_id)
+    seen.append(await crud.get_events_collection_version(async_db))
+
+    assert len(set(seen)) == len(seen)
+    assert await crud.get_events_collection_version(async_db) == seen[-1]
+
+async def test_get_event_by_id_is_cached_until_qa_or_delete(async_db):
+    """Test that event detail is served from the cache and invalidated by writes"""
+    created = await crud.create_event(async_db, schemas.EventCreate(title="Cached", start_date_time="2025-01-01T10:00:00"))
+    event_id = created.event.event_id
+
+    first = await crud.get_event_by_id(async_db, event_id)
+    assert await crud.get_event_by_id(async_db, event_id) is first
+    assert crud.event_cache.stats()["hits"] >= 1
+
+    await crud.delete_event(async_db, event_id)
+    assert await crud.get_event_by_id(async_db, event_id) is None
+
+async def test_create_qa_question_and_answer(async_db):
+    """Test posting a question and an answer through the async crud path"""
+    created = await crud.create_event(async_db, schemas.EventCreate(title="QA", start_date_time="2025-01-01T10:00:00"))
+    event_id = created.event.event_id
+
+    question = await crud.create_qa(async_db, event_id, schemas.QACreate(question_text="Parking?"))
+    answer = await crud.create_qa(async_db, event_id, schemas.QACreate(id=question.id, answer_text="Street only."))
+
+    fetched = await crud.get_event_by_id(async_db, event_id)
+    assert fetched.questions[0].id == question.id
+    assert fetched.questions[0].answers[0].id == answer.id
+    assert (fetched.event.question_count, fetched.event.answer_count) == (1, 1)
+    assert fetched.event.last_activity_at == answer.created_at
+
+    with pytest.raises(ValueError):
+        await crud.create_qa(async_db, 9999, schemas.QACreate(question_text="Anyone?"))
+
+async def test_questions_page_walks_newest_first_with_answers(async_db):
+    """Test that questions page newest first by cursor and detail embeds only the first page"""
+    created = await crud.create_event(async_db, schemas.EventCreate(title="Busy AMA", start_date_time="2025-01-01T10:00:00"))
+    event_id = created.event.event_id
+    question_ids = []
+    for i in range(5):
+        question = await crud.create_qa(async_db, event_id, schemas.QACreate(question_text=f"Q{i}"))
+        question_ids.append(question.id)
+    first = await crud.create_qa(async_db, event_id, schemas.QACreate(id=question_ids[-1], answer_text="first"))
+    second = await crud.create_qa(async_db, event_id, schemas.QACreate(id=question_ids[-1], answer_text="second"))
+
+    seen, cursor = [], None
+    while True:
+        page = await crud.get_event_questions_page(async_db, event_id, cursor=cursor, limit=2)
+        seen += [q.id for q in page.data]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == question_ids[::-1]
+
+    page = await crud.get_event_questions_page(async_db, event_id, limit=1)
+    assert [a.id for a in page.data[0].answers] == [second.id, first.id]
+    assert await crud.get_event_questions_page(async_db, 9999) is None
+
+    crud.settings.questions_page_size, size = 2, crud.settings.questions_page_size
+    try:
+        crud.event_cache.clear()
+        detail = await crud.get_event_by_id(async_db, event_id)
+    finally:
+        crud.settings.questions_page_size = size
+    assert [q.id for q in detail.questions] == question_ids[:2:-1]
+    assert detail.questions_next_cursor is not None
+
+async def test_get_events_with_fields_loads_only_those_columns(async_db):
+    """Test that a sparse fieldset trims both the SELECT and the items"""
+    await crud.create_event(async_db, schemas.EventCreate(
+        title="Sparse Event", description="Long text", start_date_time="2025-01-01T10:00:00",
+        location=schemas.LocationBase(full_address=None, address_1="1 Main St", city="Portland", state=None, zip=None, place_id=None)
+    ))
+    async_db.expunge_all()
+
+    statements = []
+    listen_on = async_db.get_bind()
+    record = lambda *args: statements.append(args[2])
+    event.listen(listen_on, "before_cursor_execute", record)
+    try:
+        events = await crud.get_events(async_db, fields=parse_fields("id,title,slug,start_date_time"))
+        with_city = await crud.get_events(async_db, fields=parse_fields("title,location.city"))
+    finally:
+        event.remove(listen_on, "before_cursor_execute", record)
+
+    assert events[0].model_dump() == {"event": {
+        "event_id": events[0].event.event_id, "title": "Sparse Event", "slug": "sparse-event",
+        "start_date_time": datetime(2025, 1, 1, 10, 0),
+    }}
+    assert "locations" not in statements[0] and "description" not in statements[0]
+    assert with_city[0].location.model_dump() == {"city": "Portland"}
+    assert "JOIN locations" in statements[1] and "address_1" not in statements[1]
+
+async def test_search_events_ranks_and_paginates(async_db):
+    """Test full-text search matches title/description words and prefixes"""
+    for title, description in [
+        ("Community picnic", "Games and food in the park"),
+        ("Board games night", "Bring your favourite games"),
+        ("Poetry reading", "Quiet evening of verse"),
+    ]:
+        await crud.create_event(async_db, schemas.EventCreate(
+            title=title, description=description, start_date_time="2025-01-01T10:00:00"
+        ))
+
+    results = await crud.search_events(async_db, "games")
+    assert {r.event.title for r in results} == {"Community picnic", "Board games night"}
+    # title + description hits outrank a description-only hit
+    assert results[0].event.title == "Board games night"
+
+    assert [r.event.title for r in await crud.search_events(async_db, "poe")] == ["Poetry reading"]
+    assert len(await crud.search_events(async_db, "games", skip=1, limit=1)) == 1
+    assert await crud.search_events(async_db, '" OR *') == []
+
+async def test_search_index_follows_deletes(async_db):
+    created = await crud.create_event(async_db, schemas.EventCreate(title="Vanishing act", start_date_time="2025-01-01T10:00:00"))
+    await crud.delete_event(async_db, created.event.event_id)
+
+    assert await crud.search_events(async_db, "vanishing") == []
+
+async def test_get_events_nearby_filters_by_exact_distance(async_db):
+    """Test that nearby search returns only events within the radius, nearest first"""
+    places = {
+        "Downtown": (45.5190, -122.6780),
+        "Across the river": (45.5300, -122.6500),
+        "Seattle": (47.6062, -122.3321),
+    }
+    for name, (lat, lng) in places.items():
+        await crud.create_event(async_db, schemas.EventCreate(
+            title=name,
+            start_date_time="2025-01-01T10:00:00",
+            location=schemas.LocationBase(
+                name=name, full_address=None, address_1=f"{name} St", city=None, state=None, zip=None,
+                place_id=None, latitude=lat, longitude=lng
+            )
+        ))
+
+    results = await crud.get_events_nearby(async_db, lat=45.5152, lng=-122.6784, radius_km=5)
+
+    assert [r.event.title for r in results] == ["Downtown", "Across the river"]
+    assert results[0].distance_km < results[1].distance_km < 5
+
+def _seed_event(db, title, start, end, questions=0, answers_per_question=0):
+    event = models.Event(title=title, start_date_time=start, end_date_time=end, slug=title.lower())
+    for q in range(questions):
+        question = models.Question(question_text=f"{title} Q{q}")
+        question.answers = [models.Answer(answer_text=f"A{a}") for a in range(answers_per_question)]
+        event.questions.append(question)
+    db.add(event)
+    db.commit()
+    return event.id
+
+async def test_questions_page_is_empty_when_qa_is_off(db, async_db):
+    """Test that the questions endpoint hides questions the detail view hides"""
+    event_id = _seed_event(db, "Closed", datetime(2099, 1, 1, 10, 0), None, questions=2)
+    db.execute(update(models.Event).where(models.Event.id == event_id).values(allow_qa=False))
+    db.commit()
+
+    page = await crud.get_event_questions_page(async_db, event_id)
+    assert page.data == [] and page.next_cursor is None
+    assert (await crud.get_event_by_id(async_db, event_id)).questions is None
+    assert await crud.get_event_questions_page(async_db, 999999) is None
+
+def test_delete_old_events_in_batches_with_counts(db):
+    """Test that cleanup removes expired events and their Q&A batch by batch"""
+    past = datetime(2020, 1, 1, 10, 0)
+    future = datetime(2099, 1, 1, 10, 0)
+    for i in range(5):
+        _seed_event(db, f"Old {i}", past, past, questions=2, answers_per_question=1)
+    keep_id = _seed_event(db, "Upcoming", future, future, questions=1, answers_per_question=1)
+
+    counts = crud.delete_old_events(db, batch_size=2)
+
+    assert counts == {"events": 5, "questions": 10, "answers": 10}
+    assert db.query(models.Event.id).all() == [(keep_id,)]
+    assert db.query(models.Question).count() == 1
+    assert db.query(models.Answer).count() == 1
+
+def test_delete_old_events_respects_time_budget(db):
+    past = datetime(2020, 1, 1, 10, 0)
+    for i in range(3):
+        _seed_event(db, f"Old {i}", past, past)
+
+    counts = crud.delete_old_events(db, batch_size=1, time_budget=0)
+
+    assert counts["events"] == 1
+    assert db.query(models.Event).count() == 2
+
+async def test_archive_old_events_to_segments(db, async_db, tmp_path, monkeypatch):
+    """Test that cleanup with an archive moves expired events out of the hot tables and can read them back"""
+    monkeypatch.setattr(crud.settings, "archive_dir", str(tmp_path))
+    past = datetime(2020, 1, 1, 10, 0)
+    old_ids = [_seed_event(db, f"Old {i}", past, past, questions=2, answers_per_question=1) for i in range(3)]
+    future = datetime(2099, 1, 1, 10, 0)
+    keep_id = _seed_event(db, "Upcoming", future, future)
+
+    counts = crud.delete_old_events(db, batch_size=2, archive=archive.SegmentWriter(max_bytes=1))
+
+    assert counts == {"events": 3, "questions": 6, "answers": 6, "archived": 3}
+    assert db.query(models.Event.id).all() == [(keep_id,)]
+    assert len({row.segment for row in db.query(models.ArchivedEvent)}) == 2  # rolled over after the first batch
+
+    archived = await crud.get_archived_event(async_db, old_ids[1])
+    assert archived.archived
+    assert archived.event.slug == "old 1"
+    assert archived.event.start_date_time.replace(tzinfo=None) == past
+    assert [q.question_text for q in archived.questions] == ["Old 1 Q1", "Old 1 Q0"]
+    assert [a.answer_text for a in archived.questions[0].answers] == ["A0"]
+    assert await crud.get_archived_event(async_db, keep_id) is None
+
+@pytest.mark.parametrize("model, key", [(models.Location, "id"), (models.ArchivedEvent, "event_id")])
+def test_insert_ignoring_duplicates_compiles_for_mysql(model, key):
+    mysql_session = SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=mysql.dialect()))
+    statement = crud._insert_ignoring_duplicates(mysql_session, model)
+    sql = str(statement.compile(dialect=mysql.dialect()))
+    assert sql.endswith(f"ON DUPLICATE KEY UPDATE {key} = {model.__tablename__}.{key}")
+
+def test_get_event_route_falls_back_to_archive(client, db, tmp_path, monkeypatch):
+    monkeypatch.setattr(crud.settings, "archive_dir", str(tmp_path))
+    past = datetime(2020, 1, 1, 10, 0)
+    event_id = _seed_event(db, "Archived", past, past, questions=1, answers_per_question=2)
+    crud.delete_old_events(db, archive=archive.SegmentWriter())
+
+    response = client.get(f"/api/v1/events/{event_id}")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["archived"] is True
+    assert body["event"]["id"] == event_id
+    assert [a["answer_text"] for a in body["questions"][0]["answers"]] == ["A1", "A0"]
+    assert client.get("/api/v1/events/999999").status_code == 404
+
+def test_reconcile_event_counters_repairs_drift(db):
+    """Test that counters written around create_qa are recounted, and only drifted events are touched"""
+    drifted_id = _seed_event(db, "Drifted", None, None, questions=2, answers_per_question=3)
+    empty_id = _seed_event(db, "Quiet", None, None)
+
+    assert crud.reconcile_event_counters(db, batch_size=1) == 1
+
+    drifted = db.get(models.Event, drifted_id)
+    db.refresh(drifted)
+    assert (drifted.question_count, drifted.answer_count, drifted.version) == (2, 6, 2)
+    assert drifted.last_activity_at == db.query(func.max(models.Answer.created_at)).scalar()
+    assert db.get(models.Event, empty_id).version == 1
+    assert crud.reconcile_event_counters(db) == 0
+
+def test_reconcile_event_counters_keeps_concurrent_qa_writes(db):
+    """Test that a Q&A post committed between the recount and the repair is not overwritten"""
+    event_id = _seed_event(db, "Live", None, None, questions=1)
+    bind = db.get_bind()
+    posted = []
+
+    def post_question_first(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE events") and not posted:
+            posted.append(True)
+            with bind.connect() as other:  # what create_qa commits
+                other.execute(models.Question.__table__.insert().values(event_id=event_id, question_text="Late?"))
+                other.execute(update(models.Event).where(models.Event.id == event_id).values(question_count=models.Event.question_count + 1))
+                other.commit()
+    event.listen(bind, "before_cursor_execute", post_question_first)
+    try:
+        assert crud.reconcile_event_counters(db) == 0
+    finally:
+        event.remove(bind, "before_cursor_execute", post_question_first)
+    assert db.query(models.Event.question_count).filter(models.Event.id == event_id).scalar() == 1
+    assert crud.reconcile_event_counters(db) == 1
+    assert db.query(models.Event.question_count).filter(models.Event.id == event_id).scalar() == 2
@@ -0,0 +1,11 @@
+from app.etags import etag_matches, make_etag
+
+def test_make_etag_is_quoted():
+    assert make_etag("event", 7, 3) == '"event-7-3"'
+
+def test_etag_matches_lists_weak_tags_and_wildcard():
+    etag = make_etag("event", 7, 3)
+    assert etag_matches('"other", W/"event-7-3"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"event-7-2"', etag)
+    assert not etag_matches(None, etag)
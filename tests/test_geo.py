@@ -0,0 +1,18 @@
+from app import geo
+
+def test_haversine_known_distance():
+    # Portland, OR to Seattle, WA is roughly 233 km
+    assert 225 < geo.haversine_km(45.5152, -122.6784, 47.6062, -122.3321) < 240
+
+def test_cell_ranges_cover_points_inside_radius():
+    lat, lng = 45.5152, -122.6784
+    ranges = geo.cell_ranges(lat, lng, 20)
+    for point in [(45.60, -122.60), (45.40, -122.85), (45.5152, -122.6784)]:
+        cell = geo.grid_cell(*point)
+        assert any(first <= cell <= last for first, last in ranges)
+
+def test_cell_ranges_wrap_the_antimeridian():
+    ranges = geo.cell_ranges(0, 179.99, 10)
+    for lng in (179.95, -179.95):
+        cell = geo.grid_cell(0, lng)
+        assert any(first <= cell <= last for first, last in ranges)
@@ -0,0 +1,76 @@
+import asyncio
+
+from sqlalchemy import select
+
+from app import crud, group_commit, models, schemas
+
+
+async def make_event(async_db, title="Group Commit Event"):
+    created = await crud.create_event(async_db, schemas.EventCreate(title=title, start_date_time="2099-01-01T10:00:00"))
+    return created.event.event_id
+
+async def test_concurrent_posts_share_one_commit(async_db, async_session_factory):
+    """Test that posts arriving together are committed in one transaction, each getting its own row back"""
+    event_id = await make_event(async_db)
+    batcher = group_commit.QAWriteBatcher(async_session_factory, max_items=50, window=0.05)
+
+    posts = await asyncio.gather(*(
+        batcher.submit(event_id, schemas.QACreate(question_text=f"Question {i}?")) for i in range(5)
+    ))
+    await batcher.close()
+
+    assert len({post.id for post in posts}) == 5
+    assert all(post.created_at is not None for post in posts)
+    assert batcher.stats()["batches"] == 1
+    version, question_count = (await async_db.execute(
+        select(models.Event.version, models.Event.question_count).where(models.Event.id == event_id)
+    )).one()
+    assert (version, question_count) == (6, 5)
+
+async def test_batch_reports_errors_per_post(async_db, async_session_factory):
+    """Test that an invalid post fails on its own without holding back the others"""
+    event_id = await make_event(async_db)
+    question = await crud.create_qa(async_db, event_id, schemas.QACreate(question_text="Parking?"))
+    batcher = group_commit.QAWriteBatcher(async_session_factory, max_items=50, window=0.05)
+
+    results = await asyncio.gather(
+        batcher.submit(event_id, schemas.QACreate(id=question.id, answer_text="Yes.")),
+        batcher.submit(999999, schemas.QACreate(question_text="Lost?")),
+        batcher.submit(event_id, schemas.QACreate(id=424242, answer_text="To nothing")),
+        return_exceptions=True,
+    )
+    await batcher.close()
+
+    assert results[0].answer_text == "Yes."
+    assert str(results[1]) == "Event not found."
+    assert str(results[2]) == "Question not found"
+
+async def test_failed_batch_falls_back_to_single_commits(async_db, async_session_factory, monkeypatch):
+    event_id = await make_event(async_db)
+
+    async def broken_batch(db, items):
+        raise RuntimeError("deadlock")
+    monkeypatch.setattr(crud, "create_qa_batch", broken_batch)
+    batcher = group_commit.QAWriteBatcher(async_session_factory, max_items=50, window=0.05)
+
+    posts = await asyncio.gather(*(
+        batcher.submit(event_id, schemas.QACreate(question_text=f"Retry {i}?")) for i in range(3)
+    ))
+    await batcher.close()
+
+    assert len({post.id for post in posts}) == 3
+    assert batcher.fallbacks == 1
+
+def test_create_qa_route_with_group_commit(client, async_session_factory, monkeypatch):
+    from app import main
+    monkeypatch.setattr(main.settings, "qa_group_commit", True)
+    monkeypatch.setattr(main, "qa_batcher", group_commit.QAWriteBatcher(async_session_factory, max_items=10, window=0.001))
+    event_id = client.post("/api/v1/events/", json={
+        "title": "Batched QA", "start_date_time": "2099-01-01T10:00:00"
+    }).json()["data"]["event"]["event_id"]
+
+    response = client.post(f"/api/v1/events/{event_id}/qa/", json={"question_text": "Batched?"})
+    assert response.status_code == 200
+    assert response.json()["question_text"] == "Batched?"
+    assert client.post("/api/v1/events/999999/qa/", json={"question_text": "Nope?"}).status_code == 400
+    assert client.get("/internal/stats").json()["qa_group_commit"]["batches"] == 2
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+from app import crud, hot_events, pagination, schemas
+
+
+async def make_event(async_db, title, start):
+    created = await crud.create_event(async_db, schemas.EventCreate(title=title, start_date_time=start))
+    return created.event.event_id
+
+async def test_upcoming_pages_come_from_memory(async_db):
+    """Test that once loaded, pages of upcoming events are served without a query"""
+    await make_event(async_db, "Long gone", "2020-01-01T10:00:00")
+    later = await make_event(async_db, "Later", "2099-03-01T10:00:00")
+    sooner = await make_event(async_db, "Sooner", "2099-02-01T10:00:00")
+
+    first, version = await crud.get_upcoming_events_page(async_db, limit=1)
+    assert version is not None
+    assert [item["event"]["id"] for item in first["data"]] == [sooner]
+
+    statements = []
+    listen_on = async_db.get_bind()
+    record = lambda *args: statements.append(args[2])
+    event.listen(listen_on, "before_cursor_execute", record)
+    try:
+        second, _ = await crud.get_upcoming_events_page(async_db, cursor=first["next_cursor"], limit=1)
+    finally:
+        event.remove(listen_on, "before_cursor_execute", record)
+    assert statements == []
+    assert [item["event"]["id"] for item in second["data"]] == [later]
+    assert second["next_cursor"] is None
+    assert await crud.verify_upcoming_events(async_db) == []
+
+async def test_hot_set_follows_writes_without_reloading(async_db):
+    """Test that creates, Q&A posts and deletes update the hot set in place"""
+    keep = await make_event(async_db, "Keeper", "2099-01-01T10:00:00")
+    await crud.get_upcoming_events_page(async_db)
+    reloads = crud.upcoming_events.reloads
+
+    added = await make_event(async_db, "Added", "2099-01-02T10:00:00")
+    await crud.create_qa(async_db, keep, schemas.QACreate(question_text="Room for one more?"))
+    doomed = await make_event(async_db, "Doomed", "2099-01-03T10:00:00")
+    await crud.delete_event(async_db, doomed)
+
+    page, _ = await crud.get_upcoming_events_page(async_db)
+    assert [item["event"]["id"] for item in page["data"]] == [keep, added]
+    assert page["data"][0]["event"]["question_count"] == 1
+    assert crud.upcoming_events.reloads == reloads
+    assert await crud.verify_upcoming_events(async_db) == []
+
+async def test_truncated_hot_set_leaves_the_tail_to_the_database(async_db, monkeypatch):
+    monkeypatch.setattr(crud.upcoming_events, "max_events", 2)
+    ids = [await make_event(async_db, f"Day {day}", f"2099-01-0{day}T10:00:00") for day in (1, 2, 3)]
+
+    first, version = await crud.get_upcoming_events_page(async_db, limit=1)
+    assert version is not None
+    rest, version = await crud.get_upcoming_events_page(async_db, cursor=first["next_cursor"], limit=5)
+    assert version is None  # reaches past the loaded range
+    assert [item["event"]["id"] for item in first["data"] + rest["data"]] == ids
+    assert await crud.verify_upcoming_events(async_db) == []
+
+async def test_events_expire_from_the_hot_set(async_db, monkeypatch):
+    await make_event(async_db, "Morning", "2099-01-01T09:00:00")
+    second = await make_event(async_db, "Evening", "2099-01-01T19:00:00")
+    await crud.get_upcoming_events_page(async_db)
+
+    monkeypatch.setattr(hot_events, "now_utc", lambda: datetime(2099, 1, 1, 12, 0))
+    items, _, _ = crud.upcoming_events.page(None, 10)
+    assert [item["event"]["id"] for item in items] == [second]
+
+def test_upcoming_route_with_fields_and_etag(client):
+    event_id = client.post("/api/v1/events/", json={
+        "title": "Widget Event", "start_date_time": "2099-05-01T10:00:00"
+    }).json()["data"]["event"]["event_id"]
+
+    response = client.get("/api/v1/events/", params={"upcoming": "true", "fields": "title,slug"})
+    assert response.status_code == 200
+    assert response.json()["data"] == [{"event": {"id": event_id, "title": "Widget Event", "slug": "widget-event"}}]
+
+    etag = response.headers["etag"]
+    assert client.get("/api/v1/events/", params={"upcoming": "true", "fields": "title,slug"}, headers={"If-None-Match": etag}).status_code == 304
+    client.post(f"/api/v1/events/{event_id}/qa/", json={"question_text": "Changed?"})
+    assert client.get("/api/v1/events/", params={"upcoming": "true", "fields": "title,slug"}, headers={"If-None-Match": etag}).status_code == 200
+
+def test_paging_past_an_event_created_with_an_offset(client):
+    """Test that an event posted with a "Z" start pages like one loaded from the database"""
+    client.get("/api/v1/events/", params={"upcoming": "true"})  # load the hot set first
+    ids = [client.post("/api/v1/events/", json={
+        "title": f"Zulu {day}", "start_date_time": f"2099-06-0{day}T10:00:00Z"
+    }).json()["data"]["event"]["event_id"] for day in (1, 2)]
+
+    first = client.get("/api/v1/events/", params={"upcoming": "true", "limit": 1}).json()
+    assert [item["event"]["id"] for item in first["data"]] == ids[:1]
+    rest = client.get("/api/v1/events/", params={"upcoming": "true", "cursor": first["next_cursor"]})
+    assert rest.status_code == 200
+    assert [item["event"]["id"] for item in rest.json()["data"]] == ids[1:]
+
+    crafted = pagination.encode_cursor(datetime(2099, 6, 1, 12, 0, tzinfo=timezone(timedelta(hours=2))), ids[0])
+    response = client.get("/api/v1/events/", params={"upcoming": "true", "cursor": crafted})
+    assert [item["event"]["id"] for item in response.json()["data"]] == ids[1:]
+    assert client.get("/api/v1/events/", params={"upcoming": "true", "cursor": "garbage"}).status_code == 400
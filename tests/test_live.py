@@ -0,0 +1,55 @@
+import json
+from app.live import DROPPED, QABroker
+
+async def test_publish_fans_out_to_every_subscriber_of_the_event():
+    broker = QABroker(queue_size=4)
+    first, second = broker.subscribe(1), broker.subscribe(1)
+    other = broker.subscribe(2)
+
+    broker.publish(1, "question", {"id": 10, "question_text": "Hi?"})
+
+    for subscription in (first, second):
+        message = json.loads(await subscription.get(timeout=1))
+        assert message == {"type": "question", "event_id": 1, "data": {"id": 10, "question_text": "Hi?"}}
+    assert other.queue.empty()
+
+async def test_slow_subscriber_is_dropped_without_blocking_others():
+    broker = QABroker(queue_size=2)
+    slow, fast = broker.subscribe(1), broker.subscribe(1)
+
+    for n in range(3):
+        broker.publish(1, "question", {"id": n})
+        await fast.get(timeout=1)
+
+    assert slow.dropped
+    assert await slow.get(timeout=1) is DROPPED
+    assert broker.stats() == {
+        "events": 1, "subscribers": 1, "queue_size": 2, "published": 3, "delivered": 5, "dropped": 1
+    }
+
+async def test_unsubscribe_forgets_empty_events():
+    broker = QABroker(queue_size=2)
+    broker.unsubscribe(broker.subscribe(5))
+    assert broker.stats()["events"] == 0
+
+def test_websocket_receives_new_questions_and_answers(client):
+    event_id = client.post("/api/v1/events/", json={
+        "title": "Live Event",
+        "start_date_time": "2025-01-01T10:00:00"
+    }).json()["data"]["event"]["event_id"]
+
+    with client.websocket_connect(f"/api/v1/events/{event_id}/qa/ws") as websocket:
+        question = client.post(f"/api/v1/events/{event_id}/qa/", json={"question_text": "Live?"}).json()
+        client.post(f"/api/v1/events/{event_id}/qa/", json={"id": question["id"], "answer_text": "Yes"})
+
+        pushed_question = websocket.receive_json()
+        pushed_answer = websocket.receive_json()
+
+    assert pushed_question["type"] == "question"
+    assert pushed_question["data"]["question_text"] == "Live?"
+    assert pushed_answer["type"] == "answer"
+    assert pushed_answer["question_id"] == question["id"]
+    assert pushed_answer["data"]["answer_text"] == "Yes"
+
+def test_stream_for_unknown_event_is_404(client):
+    assert client.get("/api/v1/events/9999/qa/stream").status_code == 404
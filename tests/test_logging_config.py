@@ -0,0 +1,47 @@
+import json
+import logging
+import queue
+import sys
+
+from app import logging_config
+
+
+def _record(name="app.main", level=logging.INFO, msg="hello %s", args=("world",), **kwargs):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None, **kwargs)
+
+
+def test_json_formatter_includes_extras_and_traceback():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord("app.crud", logging.ERROR, __file__, 1, "failed %d", (3,), sys.exc_info())
+    record.event_id = 42
+
+    data = json.loads(logging_config.JSONFormatter().format(record))
+
+    assert data["message"] == "failed 3"
+    assert data["level"] == "ERROR" and data["logger"] == "app.crud"
+    assert data["event_id"] == 42
+    assert "ValueError: boom" in data["exc_info"]
+
+
+def test_sampling_filter_keeps_every_nth_info_record_of_hot_loggers():
+    """Test that child loggers inherit the rate and warnings are never sampled"""
+    sampler = logging_config.SamplingFilter({"sqlalchemy.engine": 0.25})
+
+    kept = [sampler.filter(_record("sqlalchemy.engine.Engine")) for _ in range(8)]
+    assert kept.count(True) == 2
+    assert sampler.sampled_out == 6
+
+    assert sampler.filter(_record("sqlalchemy.engine.Engine", level=logging.WARNING))
+    assert all(sampler.filter(_record("app.main")) for _ in range(3))
+
+
+def test_queue_handler_drops_instead_of_blocking_when_full():
+    handler = logging_config.DroppingQueueHandler(queue.Queue(maxsize=1))
+    handler.handle(_record())
+    handler.handle(_record())
+
+    assert handler.dropped == 1
+    queued = handler.queue.get_nowait()
+    assert queued.msg == "hello world" and queued.args is None
@@ -1,6 +1,10 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
 from fastapi.testclient import TestClient
 from app.main import app
-from app import schemas, crud, models
+from app import schemas, crud, main, models
 
 client = TestClient(app)
 
@@ -133,3 +137,247 @@ def test_post_both_question_and_answer_invalid():
     assert response.status_code == 400
     data = response.json()
     assert data["error"] is True
+
+def test_get_events_cursor_pagination():
+    """Test paging through events with next_cursor"""
+    created_ids = set()
+    for day in (3, 1, 2):
+        resp = client.post("/api/v1/events/", json={
+            "title": f"Cursor Event {day}",
+            "start_date_time": f"2099-01-0{day}T10:00:00"
+        })
+        created_ids.add(resp.json()["data"]["event"]["event_id"])
+
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get("/api/v1/events/", params={"cursor": cursor, "limit": 2})
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(item["event"] for item in page["data"])
+        cursor = page["next_cursor"]
+
+    ids = [e["id"] for e in seen]
+    assert len(ids) == len(set(ids))
+    assert created_ids <= set(ids)
+    keys = [(e["start_date_time"], e["id"]) for e in seen]
+    assert keys == sorted(keys)
+
+def test_get_events_invalid_cursor():
+    response = client.get("/api/v1/events/", params={"cursor": "!!bogus!!"})
+    assert response.status_code == 400
+    assert response.json()["error"] is True
+
+def test_posting_question_invalidates_cached_event():
+    """Test that a new question shows up on an event that was already cached"""
+    event_resp = client.post("/api/v1/events/", json={
+        "title": "Cache QA Event",
+        "start_date_time": "2025-01-01T10:00:00",
+        "allow_qa": True
+    })
+    event = event_resp.json()["data"]["event"]
+    url = f"/api/v1/events/{event['event_id']}/{event['slug']}"
+
+    assert client.get(url).json()["questions"] == []
+
+    client.post(f"/api/v1/events/{event['event_id']}/qa/", json={"question_text": "Is it cached?"})
+
+    questions = client.get(url).json()["questions"]
+    assert [q["question_text"] for q in questions] == ["Is it cached?"]
+
+    stats = client.get("/internal/stats").json()["event_cache"]
+    assert stats["invalidations"] >= 1
+
+def test_internal_stats_reports_pool():
+    # tests never touch the app's own engines; tests/test_pool_stats.py covers the counting
+    pools = client.get("/internal/stats").json()["db_pool"]
+    assert "checkouts" in pools["async"]
+    assert "checkout_wait" in pools["sync"]
+
+def test_search_events_route():
+    client.post("/api/v1/events/", json={
+        "title": "Xylophone workshop",
+        "start_date_time": "2025-01-01T10:00:00"
+    })
+
+    response = client.get("/api/v1/events/search", params={"q": "xylophone"})
+    assert response.status_code == 200
+    assert "Xylophone workshop" in [item["event"]["title"] for item in response.json()]
+
+    assert client.get("/api/v1/events/search").status_code == 422
+
+def test_get_events_nearby_route():
+    client.post("/api/v1/events/", json={
+        "title": "Pole picnic",
+        "start_date_time": "2025-01-01T10:00:00",
+        "location": {
+            "address_1": "1 Ice Shelf", "full_address": None, "city": None, "state": None, "zip": None,
+            "place_id": None, "latitude": -77.85, "longitude": 166.67
+        }
+    })
+
+    response = client.get("/api/v1/events/nearby", params={"lat": -77.85, "lng": 166.6, "radius_km": 5})
+    assert response.status_code == 200
+    assert "Pole picnic" in [item["event"]["title"] for item in response.json()]
+
+    assert client.get("/api/v1/events/nearby", params={"lat": 100, "lng": 0}).status_code == 422
+
+def test_event_detail_etag_and_not_modified(monkeypatch):
+    """Test conditional GET on event detail, and that a new question changes the ETag"""
+    event = client.post("/api/v1/events/", json={
+        "title": "ETag Event",
+        "start_date_time": "2025-01-01T10:00:00"
+    }).json()["data"]["event"]
+    url = f"/api/v1/events/{event['event_id']}/{event['slug']}"
+
+    first = client.get(url)
+    etag = first.headers["etag"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("304 path must not load the event tree")
+    with monkeypatch.context() as m:
+        m.setattr(crud, "get_event_by_id", fail)
+        not_modified = client.get(url, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    assert not_modified.content == b""
+
+    client.post(f"/api/v1/events/{event['event_id']}/qa/", json={"question_text": "Still on?"})
+
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+def test_event_list_etag_changes_when_events_are_added():
+    # the test database starts empty, and an empty list is a 204 without an ETag
+    client.post("/api/v1/events/", json={"title": "Listed Event", "start_date_time": "2025-01-01T10:00:00"})
+    etag = client.get("/api/v1/events/").headers["etag"]
+    assert client.get("/api/v1/events/", headers={"If-None-Match": etag}).status_code == 304
+
+    event = client.post("/api/v1/events/", json={"title": "List ETag Event", "start_date_time": "2025-01-01T10:00:00"}).json()
+
+    response = client.get("/api/v1/events/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+    # list items carry the Q&A counters, so a new question changes the list too
+    client.post(f"/api/v1/events/{event['data']['event']['event_id']}/qa/", json={"question_text": "Counted?"})
+    response = client.get("/api/v1/events/", params={"fields": "question_count"}, headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 200
+    counts = {item["event"]["id"]: item["event"]["question_count"] for item in response.json()}
+    assert counts[event["data"]["event"]["event_id"]] == 1
+
+def test_get_events_sparse_fields():
+    """Test ?fields= trims list items, also on cursor pages, and rejects unknown names"""
+    client.post("/api/v1/events/", json={"title": "Calendar Event", "start_date_time": "2099-02-01T10:00:00"})
+
+    items = client.get("/api/v1/events/", params={"fields": "event_id,title,slug,start_date_time", "limit": 1000}).json()
+    assert all(set(item) == {"event"} for item in items)
+    assert all(set(item["event"]) == {"id", "title", "slug", "start_date_time"} for item in items)
+
+    page = client.get("/api/v1/events/", params={"cursor": "", "fields": "title,location"}).json()
+    assert set(page["data"][0]) == {"event", "location"}
+    assert set(page["data"][0]["event"]) == {"id", "title"}
+
+    response = client.get("/api/v1/events/", params={"fields": "title,secret"})
+    assert response.status_code == 400
+    assert response.json()["message"] == "Unknown field(s): secret"
+
+def test_import_events_route():
+    body = "\n".join([
+        '{"title": "Imported one", "start_date_time": "2025-01-01T10:00:00"}',
+        '{"title": ""}',
+    ])
+    response = client.post("/api/v1/events/import", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 201
+    data = response.json()
+    assert data["created"] == 1 and data["failed"] == 1
+    assert data["results"][0]["status"] == "created"
+    assert data["results"][1]["status"] == "error"
+
+    response = client.post("/api/v1/events/import", content=b'[{"title": "x"}')
+    assert response.status_code == 400
+
+    response = client.post("/api/v1/events/import", content=b'[{"title": "Kept", "start_date_time": "2025-01-01T10:00:00"}, {"tit')
+    assert response.status_code == 400
+    data = response.json()
+    assert data["message"] == "Unterminated JSON array"
+    assert data["created"] == 1 and data["results"][0]["slug"] == "kept"
+
+def test_get_event_questions_route():
+    response = client.post("/api/v1/events/", json={"title": "Question time", "start_date_time": "2025-01-01T10:00:00"})
+    event_id = response.json()["data"]["event"]["event_id"]
+    for text in ("First?", "Second?"):
+        client.post(f"/api/v1/events/{event_id}/qa/", json={"question_text": text})
+
+    response = client.get(f"/api/v1/events/{event_id}/questions", params={"limit": 1})
+    assert response.status_code == 200
+    page = response.json()
+    assert [q["question_text"] for q in page["data"]] == ["Second?"]
+
+    response = client.get(f"/api/v1/events/{event_id}/questions", params={"cursor": page["next_cursor"]})
+    assert [q["question_text"] for q in response.json()["data"]] == ["First?"]
+    assert response.json()["next_cursor"] is None
+
+    assert client.get(f"/api/v1/events/{event_id}/questions", params={"cursor": "nope"}).status_code == 400
+    assert client.get("/api/v1/events/999999/questions").status_code == 404
+
+def test_health_and_readiness_probes():
+    assert client.get("/healthz").json()["message"] == "ok"
+
+    with TestClient(app) as started:
+        for _ in range(50):
+            response = started.get("/readyz")
+            if response.status_code == 200:
+                break
+            time.sleep(0.05)
+        assert response.status_code == 200
+        assert response.json()["checks"] == {"database": True, "pool_warm": True}
+
+async def test_warm_pool_closes_the_connections_made_when_one_connect_fails(monkeypatch):
+    """Test that a failed warm-up round hands back its good connections before retrying"""
+    class FakeConnection:
+        closed = False
+
+        async def close(self):
+            self.closed = True
+
+    class FlakyEngine:
+        def __init__(self):
+            self.attempts, self.made = 0, []
+
+        def connect(self):
+            self.attempts += 1
+            return self._connect(fail=self.attempts == 2)
+
+        async def _connect(self, fail):
+            await asyncio.sleep(0)
+            if fail:
+                raise OSError("connection refused")
+            self.made.append(FakeConnection())
+            return self.made[-1]
+
+    engine = FlakyEngine()
+    monkeypatch.setattr(main, "async_engine", engine)
+    monkeypatch.setattr(main.settings, "db_pool_size", 3)
+    app_stub = SimpleNamespace(state=SimpleNamespace(pool_warm=False))
+
+    await main.warm_pool(app_stub)
+    assert app_stub.state.pool_warm
+    assert engine.attempts == 6 and len(engine.made) == 5
+    assert all(connection.closed for connection in engine.made)
+
+def test_readiness_times_out_on_a_hung_checkout(monkeypatch):
+    """Test that waiting for a pooled connection counts against the readiness timeout"""
+    class HungEngine:
+        @asynccontextmanager
+        async def connect(self):
+            await asyncio.sleep(30)  # pool exhausted / host not answering
+            yield
+
+    monkeypatch.setattr(main, "async_engine", HungEngine())
+    monkeypatch.setattr(main.settings, "readiness_timeout_seconds", 0.05)
+    started = time.monotonic()
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["checks"]["database"] is False
+    assert time.monotonic() - started < 5
@@ -0,0 +1,47 @@
+from fastapi.testclient import TestClient
+
+from app import metrics
+from app.main import app
+
+client = TestClient(app)
+
+
+def _sample(text, name, **labels):
+    prefix = name + "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "} "
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            return float(line[len(prefix):])
+    return None
+
+
+def test_metrics_are_keyed_by_route_template():
+    """Test that requests are labelled by route template and count their SQL statements"""
+    metrics.registry.clear()
+    response = client.post("/api/v1/events/", json={"title": "Metrics", "start_date_time": "2025-01-01T10:00:00"})
+    event = response.json()["data"]["event"]
+    client.get(f"/api/v1/events/{event['event_id']}/{event['slug']}")
+    client.get("/api/v1/events/999999/nope")
+    client.get("/no/such/path")
+
+    text = client.get("/metrics").text
+    route = "/api/v1/events/{event_id}/{event_name}"
+    assert _sample(text, "http_request_duration_seconds_count", method="GET", route=route) == 2
+    assert _sample(text, "http_responses_total", method="GET", route=route, status=200) == 1
+    assert _sample(text, "http_responses_total", method="GET", route=route, status=404) == 1
+    assert _sample(text, "http_responses_total", method="GET", route="<unmatched>", status=404) == 1
+    assert _sample(text, "http_request_db_statements_total", method="POST", route="/api/v1/events/") >= 2
+    assert "/api/v1/events/999999" not in text
+
+
+def test_render_histogram_is_cumulative():
+    registry = metrics.RequestMetrics()
+    for seconds in (0.001, 0.02, 30):
+        registry.started()
+        registry.finished("GET", "/x", 200, seconds, metrics._QueryCounter())
+
+    text = registry.render()
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/x",le="0.005"} 1' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/x",le="0.025"} 2' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/x",le="10.0"} 2' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/x",le="+Inf"} 3' in text
+    assert "http_requests_in_flight 0" in text
@@ -0,0 +1,70 @@
+from alembic import command
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect, text
+
+from app import migrate, models
+
+
+def test_fresh_database_is_created_and_stamped(tmp_path):
+    """Test that an empty database gets every table and is stamped at the Alembic head"""
+    url = f"sqlite:///{tmp_path / 'fresh.db'}"
+    assert migrate.migrate(url) == "created"
+
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        tables = set(inspect(connection).get_table_names())
+        answer_indexes = {index["name"] for index in inspect(connection).get_indexes("answers")}
+        version = connection.execute(text("SELECT version_num FROM alembic_version")).scalar_one()
+    engine.dispose()
+    assert set(models.Base.metadata.tables) <= tables
+    assert "ix_answers_question_id_created_at_id" in answer_indexes  # the paging index upgrades get too
+    assert version == ScriptDirectory.from_config(migrate.alembic_config(url)).get_current_head()
+
+    # nothing left to apply the second time round
+    assert migrate.migrate(url) == "upgraded"
+
+def test_counters_backfill_takes_the_latest_question_or_answer(tmp_path):
+    url = f"sqlite:///{tmp_path / 'backfill.db'}"
+    migrate.migrate(url)
+    command.downgrade(migrate.alembic_config(url), "e3aee5df2216")
+
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO events (id, title, slug, created_at) VALUES (1, 'Busy', 'busy', '2026-01-01 00:00:00')"))
+        connection.execute(text(
+            "INSERT INTO questions (id, event_id, question_text, created_at) VALUES "
+            "(1, 1, 'First?', '2026-01-01 10:00:00'), (2, 1, 'Later?', '2026-01-01 12:00:00')"
+        ))
+        connection.execute(text("INSERT INTO answers (question_id, answer_text, created_at) VALUES (1, 'Yes.', '2026-01-01 11:00:00')"))
+    command.upgrade(migrate.alembic_config(url), "head")
+
+    with engine.connect() as connection:
+        row = connection.execute(text("SELECT question_count, answer_count, last_activity_at FROM events")).one()
+    engine.dispose()
+    assert tuple(row) == (2, 1, "2026-01-01 12:00:00")
+
+def test_slug_and_venue_migrations_round_trip_on_sqlite(tmp_path):
+    """Test that the NOT NULL migrations for slugs and address keys downgrade and upgrade on SQLite"""
+    url = f"sqlite:///{tmp_path / 'roundtrip.db'}"
+    migrate.migrate(url)
+    command.downgrade(migrate.alembic_config(url), "aa1216fdffc6")
+
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO locations (id, address_1, city, state, zip) VALUES "
+            "(1, '1 Main St', 'Springfield', 'IL', '62701'), (2, ' 1 main  st', 'Springfield', 'IL', '62701'), "
+            "(3, '1 Main St', 'Portland', 'OR', '97201')"
+        ))
+        connection.execute(text(
+            "INSERT INTO events (id, title, location_id) VALUES (1, 'Launch', 1), (2, 'Launch', 2), (3, 'Tour', 3)"
+        ))
+    command.upgrade(migrate.alembic_config(url), "head")
+
+    with engine.connect() as connection:
+        events = connection.execute(text("SELECT slug, location_id FROM events ORDER BY id")).all()
+        locations = connection.execute(text("SELECT id, address_key FROM locations ORDER BY id")).all()
+    engine.dispose()
+    assert [tuple(row) for row in events] == [("launch", 1), ("launch-2", 1), ("tour", 3)]
+    # the same street in another city is another venue
+    assert [tuple(row) for row in locations] == [(1, "1 main st|springfield|il|62701"), (3, "1 main st|portland|or|97201")]
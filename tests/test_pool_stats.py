@@ -0,0 +1,21 @@
+from sqlalchemy import create_engine, text
+from app.pool_stats import TimedQueuePool, instrument
+
+def test_pool_stats_track_checkout_wait_and_in_use(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool, pool_size=1, max_overflow=1)
+    stats = instrument(engine)
+
+    with engine.connect() as first, engine.connect() as second:
+        first.execute(text("select 1"))
+        second.execute(text("select 1"))
+        during = stats.snapshot(engine.pool)
+
+    after = stats.snapshot(engine.pool)
+    engine.dispose()
+
+    assert during["in_use"] == 2
+    assert during["overflow"] == 1
+    assert after["in_use"] == 0
+    assert after["max_in_use"] == 2
+    assert after["checkout_wait"]["count"] == 2
+    assert sum(after["checkout_wait"]["buckets_ms"].values()) == 2